@@ -54,6 +54,10 @@ BEGIN EXECUTE IMMEDIATE 'DROP MATERIALIZED VIEW mv_dashboard_stats'; EXCEPTION W
 /
 BEGIN EXECUTE IMMEDIATE 'DROP MATERIALIZED VIEW mv_zuzycie_mediow'; EXCEPTION WHEN OTHERS THEN NULL; END;
 /
+BEGIN EXECUTE IMMEDIATE 'DROP MATERIALIZED VIEW mv_oplata_status_agg'; EXCEPTION WHEN OTHERS THEN NULL; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP MATERIALIZED VIEW mv_naprawa_status_agg'; EXCEPTION WHEN OTHERS THEN NULL; END;
+/
 BEGIN EXECUTE IMMEDIATE 'DROP PACKAGE coop_pkg'; EXCEPTION WHEN OTHERS THEN NULL; END;
 /
 BEGIN EXECUTE IMMEDIATE 'DROP PACKAGE coop_crud_pkg'; EXCEPTION WHEN OTHERS THEN NULL; END;
@@ -207,6 +211,30 @@ ALTER TABLE naprawa ADD (uwagi VARCHAR2(500));
 ALTER TABLE naprawa ADD (priorytet VARCHAR2(20) DEFAULT 'sredni');
 ALTER TABLE budynek ADD (typ_budynku VARCHAR2(50) DEFAULT 'blok');
 
+-- LAB 7: CREATE INDEX - indeksy na kluczach obcych i kolumnach filtrow
+-- Oracle nie indeksuje kluczy obcych automatycznie: bez tych indeksow zapytania
+-- portalu mieszkanca (WHERE id_mieszkania = :1) skanuja cale tabele, a usuniecie
+-- mieszkania/budynku (ON DELETE CASCADE) skanuje tabele podrzedne.
+-- Interfejs: Portal Mieszkanca, Pulpit Glowny, Historia zmian
+CREATE INDEX idx_mieszkanie_budynek ON mieszkanie (id_budynku);
+CREATE INDEX idx_czlonek_mieszkanie ON czlonek (id_mieszkania);
+-- Indeks funkcyjny dla logowania mieszkanca: WHERE LOWER(c.email) = LOWER(:1)
+CREATE INDEX idx_czlonek_email_lower ON czlonek (LOWER(email));
+CREATE INDEX idx_naprawa_mieszkanie ON naprawa (id_mieszkania, data_zgloszenia);
+CREATE INDEX idx_naprawa_pracownik ON naprawa (id_pracownika);
+-- Oplaty mieszkanca sortowane po dacie naliczenia - indeks zlozony obsluguje
+-- filtr i ORDER BY bez sortowania (oraz klucz obcy fk_oplata_mieszkanie)
+CREATE INDEX idx_oplata_mieszkanie_data ON oplata (id_mieszkania, data_naliczenia);
+CREATE INDEX idx_oplata_uslugi ON oplata (id_uslugi);
+CREATE INDEX idx_oplata_status ON oplata (status_oplaty);
+CREATE INDEX idx_umowa_mieszkanie ON umowa (id_mieszkania);
+CREATE INDEX idx_umowa_czlonek ON umowa (id_czlonka);
+CREATE INDEX idx_konto_usluga ON konto_spoldzielni (id_uslugi);
+CREATE INDEX idx_spotkanie_data ON spotkanie_mieszkancow (data_spotkania);
+CREATE INDEX idx_log_zmian_data ON log_zmian_czlonka (data_zmiany);
+-- Historia zmian jednego czlonka od najnowszych (ORDER BY id_logu DESC) bez sortowania
+CREATE INDEX idx_log_zmian_czlonek ON log_zmian_czlonka (id_czlonka, id_logu);
+
 
 -- ==============================================================================
 -- LAB 9: VIEW - widoki proste laczace dane z kilku tabel
@@ -265,40 +293,90 @@ SELECT
 FROM oplata o
 JOIN uslugi u ON o.id_uslugi = u.id_uslugi;
 
+-- LAB 9: Logi widokow zmaterializowanych - rejestruja zmiany tabel bazowych,
+-- dzieki czemu agregaty ponizej odswiezane sa przyrostowo (REFRESH FAST), a nie
+-- przeliczane od zera. Kolumny logu = kolumny uzywane w definicjach widokow,
+-- lacznie z kolumnami zlaczen (WITH ROWID nie dodaje klucza glownego; brak
+-- kolumny w logu konczy CREATE ... REFRESH FAST bledem ORA-12033).
+CREATE MATERIALIZED VIEW LOG ON oplata
+WITH ROWID, SEQUENCE (id_mieszkania, id_uslugi, kwota, zuzycie, status_oplaty)
+INCLUDING NEW VALUES;
+
+CREATE MATERIALIZED VIEW LOG ON naprawa
+WITH ROWID, SEQUENCE (status)
+INCLUDING NEW VALUES;
+
+CREATE MATERIALIZED VIEW LOG ON mieszkanie
+WITH ROWID, SEQUENCE (id_mieszkania, id_budynku)
+INCLUDING NEW VALUES;
+
+CREATE MATERIALIZED VIEW LOG ON uslugi
+WITH ROWID, SEQUENCE (id_uslugi, nazwa_uslugi)
+INCLUDING NEW VALUES;
+
+-- LAB 9: Agregaty odswiezane przyrostowo - sumy oplat i liczba napraw wg statusu
+-- COUNT(*) i COUNT(kolumna) przy kazdym SUM sa wymagane przez REFRESH FAST
+CREATE MATERIALIZED VIEW mv_oplata_status_agg
+BUILD IMMEDIATE
+REFRESH FAST ON DEMAND
+AS
+SELECT
+    status_oplaty,
+    COUNT(*) AS liczba,
+    COUNT(kwota) AS liczba_kwot,
+    SUM(kwota) AS suma_kwot
+FROM oplata
+GROUP BY status_oplaty;
+
+CREATE MATERIALIZED VIEW mv_naprawa_status_agg
+BUILD IMMEDIATE
+REFRESH FAST ON DEMAND
+AS
+SELECT
+    status,
+    COUNT(*) AS liczba
+FROM naprawa
+GROUP BY status;
+
 -- LAB 9: Widok zmaterializowany - statystyki dla pulpitu (keszowane dane)
 -- Interfejs: Pulpit Glowny -> karty ze statystykami
+-- Sumy oplat i napraw czytane z agregatow powyzej (kilka wierszy), wiec pelne
+-- odswiezenie tego widoku nie skanuje tabel oplata/naprawa.
 CREATE MATERIALIZED VIEW mv_dashboard_stats
 BUILD IMMEDIATE
-REFRESH FORCE ON DEMAND
+REFRESH COMPLETE ON DEMAND
 AS
 SELECT 
     (SELECT COUNT(*) FROM budynek) AS liczba_budynkow,
     (SELECT COUNT(*) FROM mieszkanie) AS liczba_mieszkan,
     (SELECT COUNT(*) FROM czlonek) AS liczba_czlonkow,
     (SELECT COUNT(*) FROM pracownik) AS liczba_pracownikow,
-    (SELECT COUNT(*) FROM naprawa WHERE status = 'zgloszona') AS naprawy_oczekujace,
-    (SELECT COUNT(*) FROM naprawa WHERE status = 'wykonana') AS naprawy_wykonane,
-    (SELECT NVL(SUM(kwota), 0) FROM oplata WHERE status_oplaty = 'oplacone') AS suma_oplaconych,
-    (SELECT NVL(SUM(kwota), 0) FROM oplata WHERE status_oplaty = 'nieoplacone') AS suma_zaleglosci
+    (SELECT NVL(SUM(liczba), 0) FROM mv_naprawa_status_agg WHERE status = 'zgloszona') AS naprawy_oczekujace,
+    (SELECT NVL(SUM(liczba), 0) FROM mv_naprawa_status_agg WHERE status = 'wykonana') AS naprawy_wykonane,
+    (SELECT NVL(SUM(suma_kwot), 0) FROM mv_oplata_status_agg WHERE status_oplaty = 'oplacone') AS suma_oplaconych,
+    (SELECT NVL(SUM(suma_kwot), 0) FROM mv_oplata_status_agg WHERE status_oplaty = 'nieoplacone') AS suma_zaleglosci
 FROM DUAL;
 
 -- LAB 9: Widok zmaterializowany - zuzycie mediow per budynek
 -- Interfejs: Panel Administratora -> Raporty -> Statystyki mediow
+-- Agregat ze zlaczeniem wewnetrznym (warunek REFRESH FAST - bez OUTER JOIN i NVL);
+-- adres i budynki bez oplat dolacza zapytanie w /views/zuzycie-per-budynek.
 CREATE MATERIALIZED VIEW mv_zuzycie_mediow
 BUILD IMMEDIATE
-REFRESH FORCE ON DEMAND
+REFRESH FAST ON DEMAND
 AS
 SELECT 
-    b.id_budynku,
-    b.adres,
+    m.id_budynku,
     u.nazwa_uslugi,
-    NVL(SUM(o.zuzycie), 0) AS suma_zuzycia,
-    NVL(SUM(o.kwota), 0) AS suma_kwot
-FROM budynek b
-LEFT JOIN mieszkanie m ON b.id_budynku = m.id_budynku
-LEFT JOIN oplata o ON m.id_mieszkania = o.id_mieszkania
-LEFT JOIN uslugi u ON o.id_uslugi = u.id_uslugi
-GROUP BY b.id_budynku, b.adres, u.nazwa_uslugi;
+    COUNT(*) AS liczba_oplat,
+    COUNT(o.zuzycie) AS liczba_odczytow,
+    SUM(o.zuzycie) AS suma_zuzycia,
+    COUNT(o.kwota) AS liczba_kwot,
+    SUM(o.kwota) AS suma_kwot
+FROM oplata o, mieszkanie m, uslugi u
+WHERE o.id_mieszkania = m.id_mieszkania
+  AND o.id_uslugi = u.id_uslugi
+GROUP BY m.id_budynku, u.nazwa_uslugi;
 
 -- LAB 9: Widok z kolumnami INVISIBLE - ukrywa PESEL i telefon przy SELECT *
 -- Interfejs: Portal Mieszkanca -> bezpieczny widok profilu
@@ -836,3 +914,11 @@ INSERT INTO konto_spoldzielni (nazwa_konta, numer_konta, id_uslugi, saldo) VALUE
 INSERT INTO konto_spoldzielni (nazwa_konta, numer_konta, id_uslugi, saldo) VALUES ('Konto czynszowe', 'PL27114020040000300201355387', 5, 125000.00);
 
 COMMIT;
+
+-- LAB 9: Odswiezenie widokow zmaterializowanych po wczytaniu danych
+-- (najpierw agregaty, potem zbudowany na nich mv_dashboard_stats)
+BEGIN
+    DBMS_MVIEW.REFRESH('mv_oplata_status_agg,mv_naprawa_status_agg,mv_zuzycie_mediow', '???');
+    DBMS_MVIEW.REFRESH('mv_dashboard_stats', 'C');
+END;
+/
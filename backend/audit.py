@@ -0,0 +1,354 @@
+# Logi audytu (log_zmian_czlonka, trigger trg_audit_czlonek): filtry zakresu
+# czasu (since <= data_zmiany < until) i czlonka, stronicowanie keyset po
+# id_logu malejaco - identity nadawane w kolejnosci wpisow triggera, wiec to
+# kolejnosc data_zmiany bez sortowania calej historii (PK NOT NULL; indeks
+# idx_log_zmian_data na kolumnie dopuszczajacej NULL nie obsluzy samego ORDER BY).
+# Retencja: wpisy starsze niz AUDIT_RETENTION_DAYS przenoszone sa partiami do
+# plikow gzip JSON lines w AUDIT_ARCHIVE_DIR (nazwa pliku: zakres id_logu i dat,
+# zeby zapytanie czytalo tylko pasujace pliki) i usuwane z tabeli. Archiwum jest
+# czytane przez ten sam endpoint, scalone z tabela wg id_logu.
+import asyncio
+import gzip
+import json
+import os
+import re
+import time
+from datetime import datetime, timedelta
+from threading import Lock
+
+import metrics
+from db import run_db
+from logconfig import get_logger
+from pagination import PaginationError, decode_cursor, encode_cursor
+from schema import TableInfo, NUMBER, TIMESTAMP, VARCHAR2
+from serialization import fetch_dicts, format_date
+
+log = get_logger("audit")
+
+
+class AuditConfig:
+    RETENTION_DAYS = int(os.getenv("AUDIT_RETENTION_DAYS", "365"))          # wpisy starsze ida do archiwum
+    ARCHIVE_DIR = os.getenv("AUDIT_ARCHIVE_DIR", "audit_archive")
+    ARCHIVE_INTERVAL = float(os.getenv("AUDIT_ARCHIVE_INTERVAL", "86400"))  # s; 0 wylacza harmonogram
+    ARCHIVE_BATCH = int(os.getenv("AUDIT_ARCHIVE_BATCH", "50000"))          # wierszy na plik archiwum
+
+
+TABLE = TableInfo("log_zmian_czlonka", "id_logu", {
+    "id_logu": NUMBER, "id_czlonka": NUMBER, "operacja": VARCHAR2, "stare_dane": VARCHAR2,
+    "nowe_dane": VARCHAR2, "data_zmiany": TIMESTAMP,
+})
+COLUMNS = tuple(TABLE.columns)
+SOURCES = ("all", "db", "archive")
+LEGACY_LIMIT = 100
+
+# Filtr po czlonku: indeks idx_log_zmian_czlonek (id_czlonka, id_logu) -
+# zakres indeksu czytany malejaco az do FETCH FIRST
+PAGE_SQL = f"""
+    SELECT {", ".join(COLUMNS)}
+    FROM log_zmian_czlonka
+    {{where}}
+    ORDER BY id_logu DESC
+    FETCH FIRST :limit_rows ROWS ONLY
+"""
+ARCHIVE_SELECT_SQL = f"""
+    SELECT {", ".join(COLUMNS)}
+    FROM log_zmian_czlonka
+    WHERE data_zmiany < :cutoff
+    ORDER BY id_logu
+    FETCH FIRST :batch_rows ROWS ONLY
+"""
+# Wszystkie wpisy z zakresu partii sprzed granicy - nowe id_logu sa wieksze
+ARCHIVE_DELETE_SQL = """
+    DELETE FROM log_zmian_czlonka
+    WHERE id_logu BETWEEN :first_id AND :last_id AND data_zmiany < :cutoff
+"""
+
+ARCHIVE_NAME = re.compile(r"^log_zmian_czlonka-(\d+)-(\d+)-(\d{14})-(\d{14})\.jsonl\.gz$")
+NAME_DATE_FORMAT = "%Y%m%d%H%M%S"
+
+archived_rows = metrics.registry.counter("audit_archived_rows_total", "Wpisy audytu przeniesione do archiwum")
+
+
+class AuditError(ValueError):
+    pass
+
+
+class Query:
+    def __init__(self, since=None, until=None, member_id=None, after=None, limit: int = LEGACY_LIMIT):
+        self.since = since
+        self.until = until
+        self.member_id = member_id
+        self.after = after          # id_logu ostatniego wiersza poprzedniej strony
+        self.limit = limit
+
+    def matches(self, row: dict) -> bool:
+        changed = row["data_zmiany"]
+        if self.after is not None and row["id_logu"] >= self.after:
+            return False
+        if self.member_id is not None and row["id_czlonka"] != self.member_id:
+            return False
+        if self.since is not None and (changed is None or changed < self.since):
+            return False
+        if self.until is not None and (changed is None or changed >= self.until):
+            return False
+        return True
+
+
+def parse_date(value, name: str):
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.strip()).replace(tzinfo=None)
+    except ValueError:
+        raise AuditError(f"Parametr {name} musi byc data (RRRR-MM-DD lub RRRR-MM-DD GG:MM:SS)")
+
+
+def parse_source(value) -> str:
+    source = value or "all"
+    if source not in SOURCES:
+        raise AuditError(f"Parametr source musi byc jednym z: {', '.join(SOURCES)}")
+    return source
+
+
+def decode_after(token):
+    if not token:
+        return None
+    try:
+        return int(decode_cursor(TABLE, "id_logu", token)[1])
+    except (PaginationError, TypeError, ValueError) as e:
+        raise AuditError("Nieprawidlowy kursor strony") from e
+
+
+# ------------------------------------------------------------------ tabela
+
+def fetch_db(cursor, query: Query, limit: int) -> list:
+    conditions, params = [], {"limit_rows": limit}
+    if query.member_id is not None:
+        conditions.append("id_czlonka = :id_czlonka")
+        params["id_czlonka"] = query.member_id
+    if query.since is not None:
+        conditions.append("data_zmiany >= :since")
+        params["since"] = query.since
+    if query.until is not None:
+        conditions.append("data_zmiany < :until")
+        params["until"] = query.until
+    if query.after is not None:
+        conditions.append("id_logu < :after_id")
+        params["after_id"] = query.after
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return fetch_dicts(cursor, PAGE_SQL.format(where=where), params)
+
+
+# ------------------------------------------------------------------ archiwum
+
+class ArchiveFile:
+    def __init__(self, path: str, first_id: int, last_id: int, first_date: datetime, last_date: datetime):
+        self.path = path
+        self.first_id = first_id
+        self.last_id = last_id
+        self.first_date = first_date
+        self.last_date = last_date
+
+    def relevant(self, query: Query, min_id) -> bool:
+        # min_id: najmniejsze id_logu pelnej strony z tabeli - starsze pliki nic nie wnosza
+        if query.after is not None and self.first_id >= query.after:
+            return False
+        if min_id is not None and self.last_id < min_id:
+            return False
+        if query.since is not None and self.last_date < query.since.replace(microsecond=0):
+            return False
+        if query.until is not None and self.first_date >= query.until:
+            return False
+        return True
+
+    def rows(self) -> list:
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f]
+        for row in rows:
+            if row["data_zmiany"] is not None:
+                row["data_zmiany"] = datetime.fromisoformat(row["data_zmiany"])
+        return rows
+
+    def info(self) -> dict:
+        return {"file": os.path.basename(self.path), "first_id": self.first_id, "last_id": self.last_id,
+                "first_date": format_date(self.first_date), "last_date": format_date(self.last_date),
+                "bytes": os.path.getsize(self.path)}
+
+
+def archive_files() -> list:
+    # Od najnowszych (najwyzsze id_logu)
+    try:
+        names = os.listdir(AuditConfig.ARCHIVE_DIR)
+    except FileNotFoundError:
+        return []
+    files = []
+    for name in names:
+        match = ARCHIVE_NAME.match(name)
+        if match:
+            first_id, last_id, first_date, last_date = match.groups()
+            files.append(ArchiveFile(os.path.join(AuditConfig.ARCHIVE_DIR, name), int(first_id), int(last_id),
+                                     datetime.strptime(first_date, NAME_DATE_FORMAT),
+                                     datetime.strptime(last_date, NAME_DATE_FORMAT)))
+    return sorted(files, key=lambda f: f.last_id, reverse=True)
+
+
+def fetch_archive(query: Query, limit: int, min_id=None) -> list:
+    found = {}
+    for archive in archive_files():
+        if not archive.relevant(query, min_id):
+            continue
+        # Pliki od najnowszych: komplet wierszy starszy niz caly kolejny plik konczy odczyt
+        if len(found) >= limit and archive.last_id < sorted(found, reverse=True)[limit - 1]:
+            break
+        for row in archive.rows():
+            if query.matches(row):
+                found[row["id_logu"]] = row
+    rows = [found[key] for key in sorted(found, reverse=True)[:limit]]
+    for row in rows:
+        if row["data_zmiany"] is not None:
+            row["data_zmiany"] = format_date(row["data_zmiany"])
+    return rows
+
+
+def page(cursor, conn, query: Query, source: str) -> dict:
+    # limit + 1 wierszy z kazdego zrodla, scalone malejaco po id_logu (wiersz w obu
+    # zrodlach - np. przerwane archiwizowanie - liczy sie raz)
+    limit = query.limit + 1
+    rows = fetch_db(cursor, query, limit) if source != "archive" else []
+    if source != "db":
+        min_id = rows[-1]["id_logu"] if len(rows) >= limit else None
+        merged = {row["id_logu"]: row for row in fetch_archive(query, limit, min_id)}
+        merged.update((row["id_logu"], row) for row in rows)
+        rows = [merged[key] for key in sorted(merged, reverse=True)[:limit]]
+    next_cursor = None
+    if len(rows) > query.limit:
+        rows = rows[:query.limit]
+        next_cursor = encode_cursor(None, rows[-1]["id_logu"])
+    return {"items": rows, "next_cursor": next_cursor, "limit": query.limit}
+
+
+# ------------------------------------------------------------------ retencja
+
+class ArchiveState:
+    def __init__(self):
+        self.lock = Lock()          # jedno archiwizowanie naraz (harmonogram i POST)
+        self.runs = 0
+        self.failures = 0
+        self.last_run = None
+
+    def snapshot(self) -> dict:
+        files = archive_files()
+        return {
+            "retention_days": AuditConfig.RETENTION_DAYS,
+            "interval_seconds": AuditConfig.ARCHIVE_INTERVAL,
+            "archive_dir": AuditConfig.ARCHIVE_DIR,
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_run": self.last_run,
+            "files": [archive.info() for archive in files],
+        }
+
+
+state = ArchiveState()
+
+
+def _write_archive(rows: list) -> str:
+    # data_zmiany jako datetime takze wtedy, gdy sterownik zwraca tekst
+    convert = TABLE.converters["data_zmiany"]
+    records = [{**dict(zip(COLUMNS, row)), "data_zmiany": convert(row[-1])} for row in rows]
+    dates = [record["data_zmiany"] for record in records]
+    name = (f"log_zmian_czlonka-{rows[0][0]}-{rows[-1][0]}-"
+            f"{min(dates).strftime(NAME_DATE_FORMAT)}-{max(dates).strftime(NAME_DATE_FORMAT)}.jsonl.gz")
+    path = os.path.join(AuditConfig.ARCHIVE_DIR, name)
+    # Zapis do pliku tymczasowego i rename - czytelnicy nie widza niepelnego pliku
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "wb") as raw:
+            with gzip.GzipFile(fileobj=raw, mode="wb") as f:
+                for record in records:
+                    record["data_zmiany"] = record["data_zmiany"].isoformat(" ")
+                    f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode() + b"\n")
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
+
+
+def archive(cursor, conn, trigger: str = "manual", cutoff=None) -> dict:
+    # Partie od najstarszych id_logu: plik zapisany na dysk przed usunieciem wierszy,
+    # a przy bledzie usuniecia/commitu plik jest kasowany (wiersze zostaja w tabeli)
+    if cutoff is None:
+        cutoff = datetime.now() - timedelta(days=AuditConfig.RETENTION_DAYS)
+    with state.lock:
+        start = time.perf_counter()
+        run = {"trigger": trigger, "started_at": format_date(datetime.now()), "cutoff": format_date(cutoff),
+               "rows": 0, "files": [], "elapsed_ms": None, "error": None}
+        try:
+            os.makedirs(AuditConfig.ARCHIVE_DIR, exist_ok=True)
+            while True:
+                cursor.execute(ARCHIVE_SELECT_SQL, {"cutoff": cutoff, "batch_rows": AuditConfig.ARCHIVE_BATCH})
+                rows = cursor.fetchall()
+                if not rows:
+                    break
+                path = _write_archive(rows)
+                try:
+                    cursor.execute(ARCHIVE_DELETE_SQL, {"first_id": rows[0][0], "last_id": rows[-1][0],
+                                                        "cutoff": cutoff})
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    os.remove(path)
+                    raise
+                run["rows"] += len(rows)
+                run["files"].append(os.path.basename(path))
+                archived_rows.inc(value=len(rows))
+                if len(rows) < AuditConfig.ARCHIVE_BATCH:
+                    break
+        except Exception as e:
+            run["error"] = str(e)
+            state.failures += 1
+            raise
+        finally:
+            run["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            state.last_run = run
+            state.runs += 1
+        return dict(run)
+
+
+async def scheduler(interval: float):
+    while True:
+        try:
+            result = await run_db(archive, "scheduler")
+            if result["rows"]:
+                log.info("Audit log archived", extra={"fields": {
+                    "rows": result["rows"], "files": len(result["files"]), "elapsed_ms": result["elapsed_ms"]}})
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log.error("Audit log archiving failed", extra={"fields": {"error": str(e)}})
+        await asyncio.sleep(interval)
+
+
+_task = None
+
+
+def start_scheduler():
+    global _task
+    if AuditConfig.ARCHIVE_INTERVAL > 0 and AuditConfig.RETENTION_DAYS > 0 and _task is None:
+        _task = asyncio.get_running_loop().create_task(scheduler(AuditConfig.ARCHIVE_INTERVAL))
+    return _task
+
+
+async def stop_scheduler():
+    global _task
+    task, _task = _task, None
+    if task is not None:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
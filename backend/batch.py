@@ -0,0 +1,105 @@
+# Operacje wsadowe dla /data/{table}/batch: rekordy sa grupowane wg zestawu kolumn
+# (jeden tekst SQL na grupe), kazda grupa idzie jednym executemany() z
+# batcherrors=True, a calosc konczy jeden commit. Bledy sa raportowane per wiersz
+# z indeksem rekordu w zadaniu; wiersze poprawne zostaja zapisane (chyba ze
+# atomic=True - wtedy dowolny blad wycofuje cala partie).
+from schema import SchemaError, TableInfo
+
+MAX_BATCH_SIZE = 10000
+NOT_FOUND = "Nie znaleziono rekordu"
+
+
+class BatchError(ValueError):
+    pass
+
+
+def check_size(count: int):
+    if count == 0:
+        raise BatchError("Pusta lista rekordow")
+    if count > MAX_BATCH_SIZE:
+        raise BatchError(f"Maksymalny rozmiar partii to {MAX_BATCH_SIZE} rekordow")
+
+
+def _group(groups: dict, sql: str, index: int, binds: dict):
+    groups.setdefault(sql, []).append((index, binds))
+
+
+def prepare_insert(info: TableInfo, records: list) -> tuple[dict, list]:
+    groups, errors = {}, []
+    for index, record in enumerate(records):
+        try:
+            data = info.convert_record(record)
+            if not data:
+                raise SchemaError("Brak danych do zapisania")
+        except SchemaError as e:
+            errors.append((index, str(e)))
+            continue
+        _group(groups, info.insert_sql(data, returning=False), index, info.binds(data))
+    return groups, errors
+
+
+def prepare_update(info: TableInfo, records: list) -> tuple[dict, list]:
+    groups, errors = {}, []
+    for index, record in enumerate(records):
+        try:
+            key = info.convert_key(record.get(info.pk))
+            data = info.convert_record(record, exclude=(info.pk,))
+            if not data:
+                raise SchemaError("Brak danych do zapisania")
+        except SchemaError as e:
+            errors.append((index, str(e)))
+            continue
+        _group(groups, info.update_sql(data), index, {**info.binds(data), "id_value": key})
+    return groups, errors
+
+
+def prepare_delete(info: TableInfo, ids: list) -> tuple[dict, list]:
+    groups, errors = {}, []
+    for index, id_value in enumerate(ids):
+        try:
+            key = info.convert_key(id_value)
+        except SchemaError as e:
+            errors.append((index, str(e)))
+            continue
+        _group(groups, info.delete_sql(), index, {"id_value": key})
+    return groups, errors
+
+
+def execute(cursor, conn, groups: dict, errors: list, count_rows: bool = False, atomic: bool = False,
+            translate=str) -> dict:
+    # errors: bledy walidacji z prepare_*; uzupelniane o bledy bazy przetlumaczone przez
+    # translate. count_rows - UPDATE/DELETE raportuja klucze, ktorych nie znaleziono.
+    errors = list(errors)
+    affected = 0
+    if atomic and errors:
+        return {"affected": 0, "errors": errors, "committed": False}
+    for sql, rows in groups.items():
+        indexes = [index for index, _ in rows]
+        cursor.executemany(sql, [binds for _, binds in rows], batcherrors=True, arraydmlrowcounts=count_rows)
+        failed = set()
+        for error in cursor.getbatcherrors():
+            failed.add(error.offset)
+            errors.append((indexes[error.offset], translate(error.message)))
+        if count_rows:
+            counts = cursor.getarraydmlrowcounts()
+            affected += sum(counts)
+            if len(counts) == len(rows):
+                errors.extend((indexes[i], NOT_FOUND) for i, count in enumerate(counts) if count == 0 and i not in failed)
+        else:
+            affected += len(rows) - len(failed)
+    if atomic and errors:
+        conn.rollback()
+        affected = 0
+    else:
+        conn.commit()
+    errors.sort(key=lambda error: error[0])
+    return {"affected": affected, "errors": errors, "committed": not (atomic and errors)}
+
+
+def applied_keys(groups: dict, result: dict) -> list:
+    # Klucze (id_value) rekordow zapisanych przez zatwierdzona partie - bez bledow
+    if not result["committed"]:
+        return []
+    failed = {index for index, _ in result["errors"]}
+    return [binds["id_value"] for rows in groups.values() for index, binds in rows
+            if index not in failed and "id_value" in binds]
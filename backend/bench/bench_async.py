@@ -0,0 +1,70 @@
+# Benchmark przepustowosci przy wspolbieznych zapytaniach (zastepczy sterownik).
+# Porownuje: polaczenie na zadanie w petli zdarzen (stan wyjsciowy), pule sesji
+# wywolywana blokujaco w petli zdarzen oraz warstwe run_db (pula watkow + pula sesji).
+# Uruchomienie z katalogu backend: python -m bench.bench_async [--requests 200]
+import argparse
+import asyncio
+import sys
+import time
+
+from bench import fake_oracledb
+
+sys.modules["oracledb"] = fake_oracledb
+
+import db  # noqa: E402
+import main  # noqa: E402
+
+SQL = "SELECT * FROM v_oplaty_summary"
+
+
+async def blocking_handler():
+    with db.get_cursor() as (cursor, conn):
+        return main.fetch_all(cursor, conn, SQL)
+
+
+async def async_handler():
+    return await main.get_oplaty_summary()
+
+
+async def measure(handler, requests):
+    start = time.perf_counter()
+    await asyncio.gather(*(handler() for _ in range(requests)))
+    return time.perf_counter() - start
+
+
+def run_scenario(name, handler, requests, pooled):
+    if pooled:
+        db.create_pool()
+    fake_oracledb.reset_stats()
+    elapsed = asyncio.run(measure(handler, requests))
+    db.close_pool()
+    return {
+        "scenario": name,
+        "requests": requests,
+        "seconds": round(elapsed, 3),
+        "req_per_s": round(requests / elapsed, 1),
+        "connects": fake_oracledb.stats["connects"],
+    }
+
+
+def main_cli():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--connect-ms", type=float, default=50)
+    parser.add_argument("--rows", type=int, default=50)
+    args = parser.parse_args()
+
+    fake_oracledb.configure(latency=args.latency_ms / 1000, connect_latency=args.connect_ms / 1000, rows=args.rows)
+    results = [
+        run_scenario("connect-per-request, blocking", blocking_handler, args.requests, pooled=False),
+        run_scenario("session pool, blocking", blocking_handler, args.requests, pooled=True),
+        run_scenario("session pool + run_db executor", async_handler, args.requests, pooled=True),
+    ]
+    print(f"{'scenario':<34}{'seconds':>10}{'req/s':>10}{'connects':>10}")
+    for r in results:
+        print(f"{r['scenario']:<34}{r['seconds']:>10}{r['req_per_s']:>10}{r['connects']:>10}")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,68 @@
+# Benchmark zapisu wielu rekordow: N zadan POST /data/{table} (execute + commit na
+# rekord) wobec jednego POST /data/{table}/batch (executemany + jeden commit).
+# Zastepczy sterownik symuluje opoznienie round-tripu; executemany to jeden round-trip.
+# Uruchomienie z katalogu backend: python -m bench.bench_batch [--rows 10000] [--latency-ms 1]
+import argparse
+import contextlib
+import io
+import sys
+import time
+
+from bench import fake_oracledb
+
+sys.modules["oracledb"] = fake_oracledb
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import main  # noqa: E402
+import readiness  # noqa: E402
+
+
+def make_records(count):
+    return [{"id_mieszkania": i % 50 + 1, "imie": f"Imie{i}", "nazwisko": f"Nazwisko{i}", "email": f"czlonek{i}@example.com"}
+            for i in range(count)]
+
+
+def looped(client, records):
+    for record in records:
+        response = client.post("/data/czlonek", json={"data": record})
+        response.raise_for_status()
+
+
+def batched(client, records):
+    response = client.post("/data/czlonek/batch", json={"records": records})
+    response.raise_for_status()
+    assert response.json()["affected"] == len(records)
+
+
+def measure(name, func, client, records):
+    fake_oracledb.reset_stats()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        func(client, records)
+    elapsed = time.perf_counter() - start
+    return name, elapsed, fake_oracledb.stats["round_trips"]
+
+
+def main_cli():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--latency-ms", type=float, default=1.0)
+    args = parser.parse_args()
+
+    fake_oracledb.configure(latency=args.latency_ms / 1000, connect_latency=0)
+    records = make_records(args.rows)
+    with TestClient(main.app) as client:
+        readiness.wait_ready()
+        results = [
+            measure("looped POST /data/czlonek", looped, client, records),
+            measure("POST /data/czlonek/batch", batched, client, records),
+        ]
+    print(f"rows: {args.rows}, latency: {args.latency_ms} ms/round-trip")
+    print(f"{'scenario':<30}{'seconds':>10}{'rows/s':>12}{'round-trips':>13}")
+    for name, elapsed, round_trips in results:
+        print(f"{name:<30}{elapsed:>10.2f}{args.rows / elapsed:>12.0f}{round_trips:>13}")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,84 @@
+# Benchmark miesiecznego naliczania: N wywolan POST /procedures/add-fee
+# (dodaj_oplate_fn, commit na oplate) wobec jednego POST /billing/run.
+# Uruchomienie z katalogu backend:
+#   python -m bench.bench_billing [--apartments 1000] [--services 4] [--latency-ms 1]
+import argparse
+import contextlib
+import io
+import sys
+import time
+
+from bench import fake_oracledb
+
+sys.modules["oracledb"] = fake_oracledb
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import main  # noqa: E402
+import readiness  # noqa: E402
+
+
+def make_readings(apartments, services):
+    return [{"id_mieszkania": apt + 1, "id_uslugi": svc + 1, "zuzycie": round((apt * 7 + svc * 13) % 200 + 0.5, 3)}
+            for apt in range(apartments) for svc in range(services)]
+
+
+def looped(client, readings):
+    for reading in readings:
+        response = client.post("/procedures/add-fee", json=reading)
+        response.raise_for_status()
+
+
+def billing_run(client, readings):
+    response = client.post("/billing/run", json={"readings": readings})
+    response.raise_for_status()
+    assert response.json()["inserted"] == len(readings)
+
+
+def billing_run_csv(client, readings):
+    body = "id_mieszkania,id_uslugi,zuzycie\n" + "".join(
+        f"{r['id_mieszkania']},{r['id_uslugi']},{r['zuzycie']}\n" for r in readings)
+    response = client.post("/billing/run", content=body, headers={"content-type": "text/csv"})
+    response.raise_for_status()
+    assert response.json()["inserted"] == len(readings)
+
+
+def measure(name, func, client, readings):
+    fake_oracledb.reset_stats()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        func(client, readings)
+    elapsed = time.perf_counter() - start
+    return name, elapsed, fake_oracledb.stats["round_trips"]
+
+
+def main_cli():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--apartments", type=int, default=1000)
+    parser.add_argument("--services", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=1.0)
+    args = parser.parse_args()
+
+    fake_oracledb.configure(latency=args.latency_ms / 1000, connect_latency=0)
+    fake_oracledb.register_result(
+        r"FROM uslugi FOR UPDATE",
+        [("ID_USLUGI", fake_oracledb.DB_TYPE_NUMBER), ("NAZWA_USLUGI", fake_oracledb.DB_TYPE_VARCHAR),
+         ("CENA_ZA_JEDNOSTKE", fake_oracledb.DB_TYPE_NUMBER)],
+        lambda: [(i + 1, f"usluga {i + 1}", 1.5 + i) for i in range(args.services)],
+    )
+    readings = make_readings(args.apartments, args.services)
+    with TestClient(main.app) as client:
+        readiness.wait_ready()
+        results = [
+            measure("looped /procedures/add-fee", looped, client, readings),
+            measure("/billing/run (JSON)", billing_run, client, readings),
+            measure("/billing/run (CSV)", billing_run_csv, client, readings),
+        ]
+    print(f"readings: {len(readings)}, latency: {args.latency_ms} ms/round-trip")
+    print(f"{'scenario':<30}{'seconds':>10}{'readings/s':>12}{'round-trips':>13}")
+    for name, elapsed, round_trips in results:
+        print(f"{name:<30}{elapsed:>10.2f}{len(readings) / elapsed:>12.0f}{round_trips:>13}")
+
+
+if __name__ == "__main__":
+    main_cli()
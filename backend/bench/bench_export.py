@@ -0,0 +1,66 @@
+# Benchmark pamieci eksportu duzych wynikow (zastepczy sterownik, kursor syntetyczny).
+# Porownuje sciezke z materializacja (fetchall + lista slownikow + jsonable_encoder
+# + json.dumps, jak w zwyklym endpoincie) ze strumieniowaniem export.stream_rows.
+# Uruchomienie z katalogu backend: python -m bench.bench_export [--rows 1000000]
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+
+from bench import fake_oracledb
+
+sys.modules["oracledb"] = fake_oracledb
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+
+import db  # noqa: E402
+import export  # noqa: E402
+import main  # noqa: E402
+
+SQL = "SELECT * FROM v_oplaty_uslugi_full"
+
+
+def materialized():
+    with db.get_cursor() as (cursor, conn):
+        data = main.fetch_all(cursor, conn, SQL)
+    return len(json.dumps(jsonable_encoder(data)).encode())
+
+
+def streamed(export_format):
+    size = 0
+    for chunk in export.stream_rows(SQL, None, export_format):
+        size += len(chunk.encode())
+    return size
+
+
+def measure(name, func, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = func(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"scenario": name, "seconds": round(elapsed, 2), "peak_mb": round(peak / 2**20, 1), "output_mb": round(size / 2**20, 1)}
+
+
+def main_cli():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--skip-materialized", action="store_true")
+    args = parser.parse_args()
+
+    fake_oracledb.configure(latency=0, connect_latency=0, rows=args.rows)
+    results = []
+    if not args.skip_materialized:
+        results.append(measure("fetchall + JSON response", materialized))
+    results.append(measure("stream ndjson", streamed, "ndjson"))
+    results.append(measure("stream csv", streamed, "csv"))
+    print(f"rows: {args.rows}")
+    print(f"{'scenario':<28}{'seconds':>10}{'peak MB':>10}{'output MB':>11}")
+    for r in results:
+        print(f"{r['scenario']:<28}{r['seconds']:>10}{r['peak_mb']:>10}{r['output_mb']:>11}")
+
+
+if __name__ == "__main__":
+    main_cli()
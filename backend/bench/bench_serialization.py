@@ -0,0 +1,77 @@
+# Mikrobenchmark serializacji wynikow (zastepczy sterownik, bez opoznien sieci).
+# Porownuje dotychczasowa sciezke (fetchall + serialize_row + jsonable_encoder +
+# JSONResponse) ze skompilowanym rowfactory i kodowaniem do bajtow JSON
+# (serialization.fetch_json).
+# Uruchomienie z katalogu backend: python -m bench.bench_serialization [--rows 100000]
+import argparse
+import sys
+import time
+
+from bench import fake_oracledb
+
+sys.modules["oracledb"] = fake_oracledb
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+import db  # noqa: E402
+import main  # noqa: E402
+import serialization  # noqa: E402
+
+SQL = "SELECT * FROM v_oplaty_uslugi_full"
+
+
+def legacy():
+    with db.get_cursor() as (cursor, conn):
+        cursor.execute(SQL)
+        columns = [col[0].lower() for col in cursor.description]
+        data = [main.serialize_row(row, columns) for row in cursor.fetchall()]
+    return JSONResponse(jsonable_encoder(data)).body
+
+
+def compiled_rows():
+    with db.get_cursor() as (cursor, conn):
+        data = serialization.fetch_dicts(cursor, SQL)
+    return JSONResponse(jsonable_encoder(data)).body
+
+
+def compiled_json():
+    with db.get_cursor() as (cursor, conn):
+        body = serialization.fetch_json(cursor, conn, SQL)
+    return serialization.JSONBytesResponse(body).body
+
+
+def measure(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, len(body)
+
+
+def main_cli():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    fake_oracledb.configure(latency=0, connect_latency=0, rows=args.rows)
+    encoder = "orjson" if serialization.orjson is not None else "json"
+    scenarios = [
+        ("serialize_row + jsonable_encoder", legacy),
+        ("rowfactory + jsonable_encoder", compiled_rows),
+        (f"rowfactory + {encoder} bytes", compiled_json),
+    ]
+    print(f"rows: {args.rows}, best of {args.repeat}")
+    print(f"{'scenario':<36}{'ms':>10}{'rows/s':>12}{'bytes':>12}")
+    baseline = None
+    for name, func in scenarios:
+        elapsed, size = measure(func, args.repeat)
+        baseline = baseline or elapsed
+        print(f"{name:<36}{elapsed * 1000:>10.0f}{args.rows / elapsed:>12.0f}{size:>12}  x{baseline / elapsed:.1f}")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,588 @@
+# Zastepczy sterownik oracledb do benchmarkow - bez bazy Oracle.
+# Kazde wywolanie execute/callfunc symuluje opoznienie round-tripu przez
+# time.sleep (zwalnia GIL jak prawdziwe I/O sieciowe), a wyniki sa generowane
+# deterministycznie. Uzycie: sys.modules["oracledb"] = fake_oracledb przed
+# importem db/main.
+# Po use_schema(schema.STATIC_TABLES) SELECT-y z tabel rejestru dostaja kolumny
+# i typy z listy SELECT (aliasy, t.*, agregaty), a wartosci zaleza tylko od
+# kolumny i numeru wiersza; slownik danych (user_tab_columns, user_constraints)
+# odpowiada zgodnie ze schematem. Liczbe wierszy ustawia configure(rows=...,
+# table_rows={"oplata": 10000}); WHERE <klucz glowny> = :x zwraca jeden wiersz.
+# load_table() podstawia zamiast generowanych wierszy dane (tools/datagen.py).
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+
+POOL_GETMODE_WAIT = 0
+POOL_GETMODE_NOWAIT = 1
+POOL_GETMODE_FORCEGET = 2
+POOL_GETMODE_TIMEDWAIT = 3
+
+DB_TYPE_NUMBER = "DB_TYPE_NUMBER"
+DB_TYPE_VARCHAR = "DB_TYPE_VARCHAR"
+DB_TYPE_DATE = "DB_TYPE_DATE"
+DB_TYPE_TIMESTAMP = "DB_TYPE_TIMESTAMP"
+
+
+class Error(Exception):
+    pass
+
+
+class DatabaseError(Error):
+    pass
+
+
+class Settings:
+    latency = 0.005          # s na round-trip (execute, callfunc, commit)
+    connect_latency = 0.05   # s na nowe polaczenie (handshake + logowanie)
+    rows = 100               # liczba wierszy zwracanych przez SELECT
+    table_rows = {}          # tabela -> liczba wierszy (nadpisuje rows)
+
+
+settings = Settings()
+stats = {"connects": 0, "round_trips": 0}
+_stats_lock = threading.Lock()
+
+
+def configure(**kwargs):
+    for key, value in kwargs.items():
+        if not hasattr(Settings, key):
+            raise AttributeError(key)
+        setattr(settings, key, value)
+
+
+def reset_stats():
+    with _stats_lock:
+        for key in stats:
+            stats[key] = 0
+
+
+def _round_trip(latency=None):
+    with _stats_lock:
+        stats["round_trips"] += 1
+    delay = settings.latency if latency is None else latency
+    if delay:
+        time.sleep(delay)
+
+
+# Generyczny wynik: kolumny opisane jak w cursor.description (nazwa, typ, ...)
+GENERIC_COLUMNS = [
+    ("ID", DB_TYPE_NUMBER),
+    ("NAZWA", DB_TYPE_VARCHAR),
+    ("KWOTA", DB_TYPE_NUMBER),
+    ("DATA_NALICZENIA", DB_TYPE_DATE),
+    ("STATUS", DB_TYPE_VARCHAR),
+]
+_BASE_DATE = datetime(2024, 1, 1)
+
+
+def generic_row(i):
+    return (i + 1, f"rekord {i + 1}", round((i * 37) % 1000 + 0.5, 2), _BASE_DATE + timedelta(days=i % 365), "nieoplacone" if i % 3 else "oplacone")
+
+
+def _describe(columns):
+    return [(name, db_type, None, None, None, None, True) for name, db_type in columns]
+
+
+# Wyniki dla konkretnych zapytan: (wzorzec regex, kolumny, funkcja -> wiersze)
+_custom_results = []
+
+
+def register_result(pattern, columns, rows):
+    _custom_results.insert(0, (re.compile(pattern, re.I | re.S), columns, rows))
+
+
+def clear_results():
+    _custom_results.clear()
+
+
+def _row_limit(text, parameters, count):
+    limit = re.search(r"FETCH FIRST (\d+|:\w+) ROWS", text)
+    if limit:
+        value = limit.group(1)
+        if value.startswith(":"):
+            value = (parameters or {}).get(value[1:].lower()) if isinstance(parameters, dict) else None
+        if value is not None:
+            count = min(count, int(value))
+    if "ROWNUM = 1" in text:
+        count = min(count, 1)
+    return count
+
+
+def _count_rows(text):
+    # COUNT(*) z tabeli zaladowanej przez load_table (bez WHERE) albo rows
+    match = re.search(r"FROM\s+(\w+)\s*(WHERE)?", text)
+    if match and match.group(1).lower() in _data and not match.group(2):
+        return len(_data[match.group(1).lower()][1])
+    return settings.rows
+
+
+def _result_for(sql, parameters=None):
+    for pattern, columns, rows in _custom_results:
+        if pattern.search(sql):
+            return _describe(columns), iter(rows())
+    text = sql.strip().upper()
+    if not text.startswith(("SELECT", "WITH")):
+        return None, []
+    if re.match(r"SELECT\s+COUNT\(\*\)", text):
+        return _describe([("COUNT(*)", DB_TYPE_NUMBER)]), [(_count_rows(text),)]
+    if text.endswith("FROM DUAL"):
+        counts = re.findall(r"\(SELECT COUNT\(\*\) FROM (\w+(?:[^()]|\([^()]*\))*)\)\s+AS\s+(\w+)", text)
+        if counts:
+            return (_describe([(alias, DB_TYPE_NUMBER) for _, alias in counts]),
+                    [tuple(_count_rows("FROM " + source) for source, _ in counts)])
+        aliases = re.findall(r"\bAS\s+(\w+)", text)
+        return _describe([(alias, DB_TYPE_NUMBER) for alias in aliases]), [tuple(settings.rows for _ in aliases)]
+    shaped = _schema_result(sql, text, parameters) if _schema else None
+    if shaped is not None:
+        return shaped
+    count = _row_limit(text, parameters, settings.rows)
+    return _describe(GENERIC_COLUMNS), (generic_row(i) for i in range(count))
+
+
+# ------------------------------------------------------------------ schemat
+
+_schema = {}   # tabela -> {kolumna: typ Oracle}
+_keys = {}     # tabela -> (klucz glowny, {kolumna FK: (tabela, kolumna)})
+_DB_TYPES = {"NUMBER": DB_TYPE_NUMBER, "DATE": DB_TYPE_DATE, "TIMESTAMP": DB_TYPE_TIMESTAMP}
+_NUMERIC_EXPR = re.compile(r"^\(?\s*(COUNT|SUM|AVG|NVL|ROUND|COALESCE|TRUNC)\s*\(", re.I)
+_NUMERIC_NAMES = ("liczba", "suma", "total", "srednia", "count", "ilosc", "procent")
+_FLOAT_COLUMNS = ("kwota", "cena_za_jednostke", "saldo", "metraz", "zuzycie")
+_DOMAINS = {
+    "status_oplaty": ("oplacone", "nieoplacone", "zaleglosc"),
+    "status": ("zgloszona", "w trakcie", "wykonana"),
+    "priorytet": ("niski", "normalny", "wysoki"),
+    "typ_umowy": ("wlasnosc", "najem", "spoldzielcze"),
+    "jednostka_miary": ("m3", "kWh", "GJ", "szt"),
+}
+_FROM_TABLES = re.compile(r"(?:\bFROM|\bJOIN|,)\s+(\w+)(?:\s+(?!(?:ON|WHERE|JOIN|LEFT|RIGHT|INNER|FULL|CROSS|GROUP"
+                          r"|ORDER|FETCH|CONNECT|START|UNION)\b)(\w+))?", re.I)
+_SKIPPED_ALIASES = {"END", "DESC", "ASC"}
+
+
+def use_schema(tables):
+    # tables: nazwa -> obiekt z .columns {kolumna: typ}, .pk i .fks (np. schema.STATIC_TABLES)
+    _schema.clear()
+    _keys.clear()
+    for name, info in tables.items():
+        _schema[name.lower()] = {col.lower(): typ for col, typ in info.columns.items()}
+        _keys[name.lower()] = (info.pk, dict(getattr(info, "fks", {}) or {}))
+    register_result(r"\bFROM\s+user_tab_columns\b",
+                    [("TABLE_NAME", DB_TYPE_VARCHAR), ("COLUMN_NAME", DB_TYPE_VARCHAR), ("DATA_TYPE", DB_TYPE_VARCHAR)],
+                    lambda: [(table, col, typ) for table, cols in _schema.items() for col, typ in cols.items()])
+    register_result(r"\bFROM\s+user_constraints\b",
+                    [("TABLE_NAME", DB_TYPE_VARCHAR), ("CONSTRAINT_TYPE", DB_TYPE_VARCHAR),
+                     ("COLUMN_NAME", DB_TYPE_VARCHAR), ("R_TABLE_NAME", DB_TYPE_VARCHAR),
+                     ("R_COLUMN_NAME", DB_TYPE_VARCHAR)],
+                    lambda: [row for table, (pk, fks) in _keys.items()
+                             for row in [(table, "P", pk, None, None)]
+                             + [(table, "R", col, ref[0], ref[1]) for col, ref in fks.items()]])
+
+
+def _split_top_level(text):
+    # Podzial po przecinkach poza nawiasami i literalami
+    parts, depth, quoted, start = [], 0, False, 0
+    for i, char in enumerate(text):
+        if char == "'":
+            quoted = not quoted
+        elif quoted:
+            continue
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(text[start:i].strip())
+            start = i + 1
+    parts.append(text[start:].strip())
+    return parts
+
+
+def _top_level_from(sql):
+    depth, quoted = 0, False
+    for match in re.finditer(r"'|\(|\)|\bFROM\b", sql, re.I):
+        token = match.group(0)
+        if token == "'":
+            quoted = not quoted
+        elif quoted:
+            continue
+        elif token == "(":
+            depth += 1
+        elif token == ")":
+            depth -= 1
+        elif depth == 0:
+            return match.start()
+    return -1
+
+
+def _column_type(name, table, tables):
+    for candidate in ([table] if table else []) + tables:
+        typ = _schema.get(candidate, {}).get(name)
+        if typ is not None:
+            return typ
+    for columns in _schema.values():
+        if name in columns:
+            return columns[name]
+    return None
+
+
+def _select_columns(select_list, aliases):
+    # -> [(nazwa kolumny, kolumna zrodlowa, typ Oracle, tabela zrodlowa)]
+    tables = list(dict.fromkeys(aliases.values()))
+    columns = []
+    for expr in _split_top_level(select_list):
+        star = re.match(r"^(?:(\w+)\.)?\*$", expr)
+        if star:
+            for table in ([aliases.get(star.group(1).lower())] if star.group(1) else tables):
+                columns.extend((col, col, typ, table) for col, typ in _schema.get(table, {}).items())
+            continue
+        alias = re.search(r"(?:\bAS\s+|\s)(\w+)$", expr, re.I)
+        if alias and alias.group(1).upper() in _SKIPPED_ALIASES:
+            alias = None
+        ref = re.match(r"^(?:(\w+)\.)?(\w+)$", expr[:alias.start()].strip() if alias else expr)
+        table = aliases.get(ref.group(1).lower()) if ref and ref.group(1) else None
+        source = ref.group(2).lower() if ref else None
+        name = alias.group(1).lower() if alias else source or expr.lower()
+        source = source or name
+        typ = _column_type(source, table, tables)
+        if typ is None:
+            if name.startswith("data_"):
+                typ = "DATE"
+            elif _NUMERIC_EXPR.match(expr) or name.startswith(_NUMERIC_NAMES):
+                typ = "NUMBER"
+            else:
+                typ = "VARCHAR2"
+        columns.append((name, source, typ, table or (tables[0] if tables else None)))
+    return columns
+
+
+def _value(column, typ, table, i):
+    if typ == "NUMBER":
+        pk, fks = _keys.get(table, (None, {}))
+        if column == pk:
+            return i + 1
+        if column.startswith("id_"):
+            return i % 50 + 1
+        if column in _FLOAT_COLUMNS or column.startswith(("suma", "total")):
+            return round((i * 37) % 1000 + 0.5, 2)
+        return (i * 7) % 100 + 1
+    if typ in ("DATE", "TIMESTAMP"):
+        return _BASE_DATE + timedelta(days=i % 730)
+    domain = _DOMAINS.get(column)
+    if domain:
+        return domain[i % len(domain)]
+    if column == "email":
+        return f"mieszkaniec{i + 1}@example.com"
+    if column == "pesel":
+        return f"{80010100000 + i:011d}"
+    if column == "telefon":
+        return f"600{i:06d}"
+    if column == "numer":
+        return str(i % 60 + 1)
+    return f"{column} {i + 1}"
+
+
+def _schema_result(sql, text, parameters):
+    if not text.startswith("SELECT"):
+        return None
+    from_at = _top_level_from(sql)
+    if from_at < 0:
+        return None
+    aliases = {}
+    for table, alias in _FROM_TABLES.findall(sql[from_at:]):
+        table = table.lower()
+        if table in _schema:
+            aliases[table] = table
+            if alias:
+                aliases[alias.lower()] = table
+    if not aliases:
+        return None
+    select_list = re.sub(r"^\s*SELECT\s+(DISTINCT\s+)?", "", sql[:from_at], flags=re.I)
+    columns = _select_columns(select_list, aliases)
+    main_table = next(iter(aliases.values()))
+    if main_table in _data:
+        return _stored_result(sql, text, parameters, columns, aliases, main_table)
+    count = settings.table_rows.get(main_table, settings.rows)
+    pk = _keys[main_table][0]
+    if re.search(rf"\bWHERE\s+(?:\w+\.)?{pk}\s*=\s*:", sql, re.I):
+        count = min(count, 1)
+    count = _row_limit(text, parameters, count)
+    description = _describe([(name.upper(), _DB_TYPES.get(typ, DB_TYPE_VARCHAR)) for name, _, typ, _ in columns])
+    return description, (tuple(_value(source, typ, table, i) for _, source, typ, table in columns) for i in range(count))
+
+
+
+# ------------------------------------------------------------------ dane zaladowane
+
+_data = {}      # tabela -> (kolumny, wiersze) - np. z tools/datagen.py
+_indexes = {}   # (tabela, kolumna) -> {wartosc: wiersz}
+_EQUALITY = re.compile(r"(?:(\w+)\.)?(\w+)\s*=\s*:(\w+)")
+
+
+def load_table(table, columns, rows):
+    # SELECT z tej tabeli zwraca te wiersze (filtr rownosci na bindach, FETCH FIRST);
+    # kolumny tabel dolaczonych JOIN-em sa odczytywane przez klucz obcy
+    table = table.lower()
+    _data[table] = ([col.lower() for col in columns], list(rows))
+    for key in [key for key in _indexes if key[0] == table]:
+        del _indexes[key]
+
+
+def clear_tables():
+    _data.clear()
+    _indexes.clear()
+
+
+def _index(table, column):
+    key = (table, column)
+    if key not in _indexes:
+        columns, rows = _data[table]
+        position = columns.index(column)
+        _indexes[key] = {row[position]: row for row in rows}
+    return _indexes[key]
+
+
+def _group_index(table, column):
+    key = (table, column, "groups")
+    if key not in _indexes:
+        columns, rows = _data[table]
+        position = columns.index(column)
+        groups = {}
+        for row in rows:
+            groups.setdefault(row[position], []).append(row)
+        _indexes[key] = groups
+    return _indexes[key]
+
+
+def _bind_value(parameters, name):
+    if isinstance(parameters, dict):
+        return parameters.get(name.lower(), parameters.get(name))
+    if isinstance(parameters, (list, tuple)) and name.isdigit() and int(name) <= len(parameters):
+        return parameters[int(name) - 1]
+    return None
+
+
+def _stored_result(sql, text, parameters, columns, aliases, main_table):
+    stored_columns, rows = _data[main_table]
+    where = re.search(r"\bWHERE\b(.*?)(?:\bGROUP\s+BY\b|\bORDER\s+BY\b|\bFETCH\b|$)", sql, re.I | re.S)
+    for alias, column, bind in _EQUALITY.findall(where.group(1) if where else ""):
+        if (alias and aliases.get(alias.lower()) != main_table) or column.lower() not in stored_columns:
+            continue
+        value = _bind_value(parameters, bind)
+        if value is None:
+            continue
+        if rows is _data[main_table][1]:
+            # Pierwszy filtr z indeksu (jak indeks w bazie) - koszt sterownika nie zaciemnia pomiaru
+            groups = _group_index(main_table, column.lower())
+            if isinstance(value, str) and value.isdigit():
+                value = int(value)
+            rows = groups.get(value) or groups.get(str(value)) or []
+        else:
+            position = stored_columns.index(column.lower())
+            rows = [row for row in rows if row[position] == value or str(row[position]) == str(value)]
+    _, fks = _keys.get(main_table, (None, {}))
+    readers = []
+    for _, source, typ, table in columns:
+        if table == main_table and source in stored_columns:
+            readers.append(lambda row, i, position=stored_columns.index(source): row[position])
+            continue
+        via = next((col for col, ref in fks.items() if ref[0] == table), None)
+        if via is not None and table in _data and source in _data[table][0]:
+            readers.append(lambda row, i, via=stored_columns.index(via), index=_index(table, fks[via][1]),
+                           position=_data[table][0].index(source), source=source, typ=typ, table=table:
+                           index[row[via]][position] if row[via] in index else _value(source, typ, table, i))
+            continue
+        readers.append(lambda row, i, source=source, typ=typ, table=table: _value(source, typ, table, i))
+    count = _row_limit(text, parameters, len(rows))
+    description = _describe([(name.upper(), _DB_TYPES.get(typ, DB_TYPE_VARCHAR)) for name, _, typ, _ in columns])
+    return description, (tuple(read(rows[i], i) for read in readers) for i in range(count))
+
+
+class Var:
+    def __init__(self, typ=None, *args, **kwargs):
+        self.type = typ
+        self.value = None
+
+    def getvalue(self, pos=0):
+        return self.value
+
+    def setvalue(self, pos, value):
+        self.value = value
+
+
+class Cursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.arraysize = 100
+        self.prefetchrows = 2
+        self.rowfactory = None
+        self.description = None
+        self.rowcount = 0
+        self._dml_counts = []
+        self._rows = iter(())
+        self._implicit = []
+
+    def execute(self, statement, parameters=None, **kwargs):
+        _round_trip()
+        self.description, rows = _result_for(statement, parameters)
+        self._rows = iter(rows)
+        # Blok PL/SQL z DBMS_SQL.RETURN_RESULT - kursory "OPEN c FOR SELECT ..."
+        # wracaja w tym samym round-tripie
+        self._implicit = []
+        for select in re.findall(r"\bOPEN\s+\w+\s+FOR\s+(.*?);", statement, re.I | re.S):
+            child = Cursor(self.connection)
+            child.description, rows = _result_for(select, parameters)
+            child._rows = iter(rows)
+            self._implicit.append(child)
+        self.rowcount = 0
+        params = parameters.values() if isinstance(parameters, dict) else (parameters or [])
+        for param in params:
+            if isinstance(param, Var):
+                param.value = 1.0 if param.type is float else 1
+        return self if self.description else None
+
+    def executemany(self, statement, parameters, batcherrors=False, arraydmlrowcounts=False, **kwargs):
+        _round_trip()
+        self.rowcount = len(parameters) if not isinstance(parameters, int) else parameters
+        self._dml_counts = [1] * self.rowcount
+
+    def getimplicitresults(self):
+        return list(self._implicit)
+
+    def getbatcherrors(self):
+        return []
+
+    def getarraydmlrowcounts(self):
+        return list(self._dml_counts)
+
+    def _next(self):
+        row = next(self._rows, None)
+        if row is not None:
+            self.rowcount += 1
+            if self.rowfactory is not None:
+                return self.rowfactory(*row)
+        return row
+
+    def fetchone(self):
+        return self._next()
+
+    def fetchmany(self, size=None):
+        size = size or self.arraysize
+        result = []
+        for _ in range(size):
+            row = self._next()
+            if row is None:
+                break
+            result.append(row)
+        return result
+
+    def fetchall(self):
+        result = []
+        while True:
+            row = self._next()
+            if row is None:
+                return result
+            result.append(row)
+
+    def __iter__(self):
+        while True:
+            row = self._next()
+            if row is None:
+                return
+            yield row
+
+    def callfunc(self, name, return_type, parameters=None, **kwargs):
+        _round_trip()
+        return return_type(settings.rows) if return_type in (int, float) else f"{name}"
+
+    def callproc(self, name, parameters=None, **kwargs):
+        _round_trip()
+        return list(parameters or [])
+
+    def var(self, typ, *args, **kwargs):
+        return Var(typ)
+
+    def close(self):
+        self._rows = iter(())
+
+
+class Connection:
+    def __init__(self, pool=None):
+        self._pool = pool
+        self.stmtcachesize = 20
+
+    def cursor(self):
+        return Cursor(self)
+
+    def commit(self):
+        _round_trip()
+
+    def rollback(self):
+        _round_trip()
+
+    def ping(self):
+        _round_trip()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.release(self)
+
+
+def connect(user=None, password=None, dsn=None, **kwargs):
+    with _stats_lock:
+        stats["connects"] += 1
+    if settings.connect_latency:
+        time.sleep(settings.connect_latency)
+    return Connection()
+
+
+class ConnectionPool:
+    def __init__(self, min=1, max=2, increment=1, wait_timeout=0, getmode=POOL_GETMODE_WAIT, **kwargs):
+        self.min = min
+        self.max = max
+        self.wait_timeout = wait_timeout
+        self.getmode = getmode
+        self._idle = [connect() for _ in range(min)]
+        self._busy = 0
+        self._cond = threading.Condition()
+
+    @property
+    def opened(self):
+        return len(self._idle) + self._busy
+
+    @property
+    def busy(self):
+        return self._busy
+
+    def acquire(self):
+        with self._cond:
+            deadline = time.monotonic() + self.wait_timeout / 1000 if self.wait_timeout else None
+            while not self._idle and self.opened >= self.max:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise DatabaseError("DPY-4005: timed out waiting for the connection pool to return a connection")
+                self._cond.wait(remaining)
+            self._busy += 1
+            if self._idle:
+                conn = self._idle.pop()
+                conn._pool = self
+                return conn
+        conn = connect()
+        conn._pool = self
+        return conn
+
+    def release(self, connection):
+        with self._cond:
+            connection._pool = None
+            self._idle.append(connection)
+            self._busy -= 1
+            self._cond.notify()
+
+    def close(self, force=False):
+        with self._cond:
+            self._idle = []
+
+
+def create_pool(**kwargs):
+    return ConnectionPool(**kwargs)
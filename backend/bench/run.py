@@ -0,0 +1,306 @@
+# Zestaw benchmarkow goracych sciezek backendu na zastepczym sterowniku
+# (fake_oracledb ze schematem z schema.STATIC_TABLES, stale opoznienie i liczba
+# wierszy) - bez bazy Oracle i bez serwera HTTP: zadania ida bezposrednio do
+# aplikacji ASGI, razem z middleware. Wynik w JSON (--output), porownanie z
+# zapisanym wynikiem (--baseline): mediana (--metric) gorsza o wiecej niz --tolerance
+# oznacza regresje i kod wyjscia 1. Cache odpowiedzi jest wylaczony (chyba ze
+# --cache), zeby mierzyc zapytania, a nie trafienia w cache. Z --dataset tabele
+# sa wypelniane przez tools/datagen.py (licznosci i skos jak w produkcji).
+# --backend sqlite uruchamia te same scenariusze na prawdziwym silniku (storage/sqlite.py,
+# plik bazy w katalogu tymczasowym albo --sqlite-path); --dataset laduje wtedy dane
+# przez datagen.load, a liczba round-tripow nie jest liczona.
+# Uruchomienie z katalogu backend:
+#   python -m bench.run --output bench/baseline.json
+#   python -m bench.run --baseline bench/baseline.json [--filter resident]
+import argparse
+import asyncio
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from bench import fake_oracledb
+
+sys.modules["oracledb"] = fake_oracledb
+
+FORMAT_VERSION = 1
+ERROR_MESSAGES = [
+    "ORA-00001: unique constraint (SYSTEM.PK_OPLATA) violated",
+    "ORA-02291: integrity constraint (SYSTEM.FK_OPLATA_MIESZKANIE) violated - parent key not found",
+    "ORA-02292: integrity constraint (SYSTEM.FK_NAPRAWA_MIESZKANIE) violated - child record found",
+    "ORA-01400: cannot insert NULL into (\"SYSTEM\".\"CZLONEK\".\"IMIE\")",
+    "ORA-01722: invalid number",
+    "ORA-01861: literal does not match format string",
+    "ORA-12899: value too large for column \"SYSTEM\".\"CZLONEK\".\"PESEL\" (actual: 12, maximum: 11)",
+    "ORA-00942: table or view does not exist",
+    "DPY-4005: timed out waiting for the connection pool to return a connection",
+    "ORA-20001: Nieznany blad aplikacji",
+]
+
+
+def configure_environment(args):
+    # Przed importem modulow aplikacji - konfiguracja czytana jest przy imporcie
+    os.environ["RESPONSE_CACHE_TTL"] = os.environ.get("RESPONSE_CACHE_TTL", "30") if args.cache else "0"
+    os.environ.setdefault("SLOW_QUERY_MS", "-1")
+    os.environ.setdefault("LOG_LEVEL", "ERROR")
+    os.environ.setdefault("MV_REFRESH_INTERVAL", "0")
+    if args.backend == "sqlite":
+        os.environ["DB_BACKEND"] = "sqlite"
+        os.environ["DB_DSN"] = args.sqlite_path or os.path.join(tempfile.mkdtemp(prefix="coop-bench-"), "bench.db")
+
+
+# ------------------------------------------------------------------ ASGI
+
+async def asgi_request(app, method: str, url: str, body=None):
+    path, _, query = url.partition("?")
+    payload = json.dumps(body).encode() if body is not None else b""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "scheme": "http",
+        "method": method, "path": path, "raw_path": path.encode(), "query_string": query.encode(),
+        "root_path": "", "client": ("127.0.0.1", 0), "server": ("bench", 80),
+        "headers": [(b"host", b"bench"), (b"content-type", b"application/json"),
+                    (b"content-length", str(len(payload)).encode())],
+    }
+    response = {"status": None, "size": 0}
+    delivered = False
+
+    async def receive():
+        nonlocal delivered
+        if not delivered:
+            delivered = True
+            return {"type": "http.request", "body": payload, "more_body": False}
+        await asyncio.Event().wait()   # klient nie rozlacza sie w trakcie
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            response["size"] += len(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return response
+
+
+# ------------------------------------------------------------------ scenariusze
+
+def build_scenarios(args):
+    import main
+    import schema
+    from serialization import format_date
+
+    rows = [fake_oracledb.generic_row(i) for i in range(args.rows)]
+    columns = [name.lower() for name, _ in fake_oracledb.GENERIC_COLUMNS]
+    oplata = schema.get_table("oplata")
+    record = {"id_mieszkania": "1", "id_uslugi": 2, "kwota": 120.5, "zuzycie": 3.2,
+              "data_naliczenia": format_date(datetime(2024, 3, 1)), "status_oplaty": "nieoplacone"}
+    app = main.app
+
+    def http(method, url, body=None):
+        return lambda: asgi_request(app, method, url, body)
+
+    async def fan_out(urls):
+        # Rownolegle pojedyncze zadania (jak raport w panelu) - loader laczy je w partie
+        results = await asyncio.gather(*(asgi_request(app, "GET", url) for url in urls))
+        return {"status": max(result["status"] for result in results)}
+
+    lookup_ids = list(range(1, 51))
+
+    # (nazwa, grupa, operacja) - operacja synchroniczna albo zwracajaca korutyne
+    return [
+        ("serialize_row", "micro", lambda: [main.serialize_row(row, columns) for row in rows]),
+        ("convert_record.dates", "micro", lambda: [oplata.convert_record(record) for _ in range(args.rows)]),
+        ("translate_oracle_error", "micro", lambda: [main.translate_oracle_error(message)
+                                                      for _ in range(max(args.rows // len(ERROR_MESSAGES), 1))
+                                                      for message in ERROR_MESSAGES]),
+        ("crud.list", "http", http("GET", "/data/oplata")),
+        ("crud.page", "http", http("GET", "/data/oplata?limit=50&order_by=kwota")),
+        ("crud.export_ndjson", "http", http("GET", "/data/oplata?format=ndjson")),
+        ("crud.insert", "http", http("POST", "/data/oplata", {"data": record})),
+        ("crud.update", "http", http("PUT", "/data/oplata/id_oplaty/1", {"data": {"kwota": 99.5}})),
+        ("crud.delete", "http", http("DELETE", "/data/oplata/id_oplaty/1")),
+        ("search", "http", http("GET", "/data/czlonek/search?q=mieszkaniec1&limit=20")),
+        ("reports.summary", "http", http("GET", "/reports/summary")),
+        ("resident.snapshot", "http", http("GET", "/resident/snapshot/1")),
+        ("resident.my_data", "http", http("GET", "/resident/my-data/1")),
+        ("resident.payments", "http", http("GET", "/resident/payments/1")),
+        ("resident.repairs", "http", http("GET", "/resident/repairs/1")),
+        ("resident.meetings", "http", http("GET", "/resident/meetings")),
+        ("resident.consumption", "http", http("GET", "/resident/consumption/1")),
+        ("buildings.stats", "http", http("GET", "/buildings/stats?limit=100")),
+        ("buildings.members", "http", http("GET", "/buildings/members?limit=100")),
+        ("audit.page", "http", http("GET", "/system/audit-logs?member_id=1&limit=100")),
+        ("lookups.fan_out_50", "http", lambda: fan_out([f"/functions/apartment-fees/{i}" for i in lookup_ids])),
+        ("lookups.batch_50", "http", http("GET", f"/functions/apartment-fees?ids={','.join(map(str, lookup_ids))}")),
+    ]
+
+
+async def run_op(op):
+    result = op()
+    if asyncio.iscoroutine(result):
+        result = await result
+    return result
+
+
+async def measure(op, iterations: int, warmup: int, fake: bool = True) -> dict:
+    for _ in range(warmup):
+        await run_op(op)
+    fake_oracledb.reset_stats()
+    timings, statuses = [], set()
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = await run_op(op)
+        timings.append(time.perf_counter() - start)
+        if isinstance(result, dict) and "status" in result:
+            statuses.add(result["status"])
+    timings.sort()
+    mean = statistics.fmean(timings)
+    return {
+        "iterations": iterations,
+        "mean_ms": round(mean * 1000, 4),
+        "median_ms": round(statistics.median(timings) * 1000, 4),
+        "p95_ms": round(timings[min(int(len(timings) * 0.95), len(timings) - 1)] * 1000, 4),
+        "min_ms": round(timings[0] * 1000, 4),
+        "ops_per_s": round(1 / mean, 1) if mean else None,
+        "round_trips_per_op": round(fake_oracledb.stats["round_trips"] / iterations, 2) if fake else None,
+        "status": sorted(statuses) or None,
+    }
+
+
+async def run_suite(args) -> dict:
+    import audit
+    import db
+    import main
+    import readiness
+    import schema
+
+    fake = args.backend == "fake"
+    dataset = None
+    if fake:
+        fake_oracledb.use_schema({**schema.STATIC_TABLES, audit.TABLE.name: audit.TABLE})
+        fake_oracledb.configure(latency=args.latency_ms / 1000, connect_latency=0, rows=args.rows)
+        # Statystyki budynkow (WITH ... GROUP BY) - wiersze o ksztalcie wyniku zapytania
+        fake_oracledb.register_result(
+            r"WITH strona AS",
+            [("ID_BUDYNKU", fake_oracledb.DB_TYPE_NUMBER), ("ADRES", fake_oracledb.DB_TYPE_VARCHAR),
+             ("LICZBA_MIESZKAN", fake_oracledb.DB_TYPE_NUMBER), ("LICZBA_CZLONKOW", fake_oracledb.DB_TYPE_NUMBER),
+             ("LICZBA_NAPRAW", fake_oracledb.DB_TYPE_NUMBER), ("NAPRAWY_OTWARTE", fake_oracledb.DB_TYPE_NUMBER)],
+            lambda: [(i + 1, f"ul. Testowa {i + 1}", 30, 66, 45, 3) for i in range(min(args.rows, 101))],
+        )
+    if args.dataset:
+        from tools import datagen
+        config = datagen.DatagenConfig(**datagen.PRESETS[args.dataset])
+        if fake:
+            dataset = datagen.feed_fake(fake_oracledb, config)
+        else:
+            with db.get_db_connection() as conn:
+                dataset = datagen.load(config, conn.cursor(), conn, disable_triggers=True, report=lambda *a, **k: None)
+    await readiness.warm_up(main.load_metadata, main.warm_statements)
+    results = {}
+    try:
+        for name, group, op in build_scenarios(args):
+            if args.filter and not any(part in name or part == group for part in args.filter):
+                continue
+            results[name] = {"group": group, **await measure(op, args.iterations, args.warmup, fake)}
+            if not args.json:
+                print_result(name, results[name], file=sys.stderr)
+    finally:
+        db.close_pool()
+        if not fake and not args.sqlite_path:
+            shutil.rmtree(os.path.dirname(os.environ["DB_DSN"]), ignore_errors=True)
+    return {
+        "format": FORMAT_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "orjson": __import__("serialization").orjson is not None,
+        },
+        "config": {
+            "backend": args.backend,
+            "latency_ms": args.latency_ms,
+            "rows": args.rows,
+            "iterations": args.iterations,
+            "warmup": args.warmup,
+            "response_cache": args.cache,
+            "dataset": args.dataset,
+        },
+        "dataset_rows": dataset,
+        "results": results,
+    }
+
+
+# ------------------------------------------------------------------ raport
+
+def print_result(name, result, file=sys.stdout):
+    failed = [status for status in result["status"] or () if status >= 400]
+    note = f"  HTTP {','.join(map(str, failed))}" if failed else ""
+    print(f"{name:<26}{result['median_ms']:>12.3f}{result['p95_ms']:>12.3f}{result['ops_per_s']:>12.1f}"
+          f"{result['round_trips_per_op'] if result['round_trips_per_op'] is not None else '-':>8}{note}", file=file)
+
+
+def compare(current: dict, baseline: dict, tolerance: float, metric: str = "median_ms", file=sys.stdout) -> list:
+    # -> lista regresji; tabela porownania do `file`
+    if current["config"] != baseline.get("config"):
+        print(f"warning: config differs from baseline ({baseline.get('config')})", file=sys.stderr)
+    regressions = []
+    print(f"{'scenario':<26}{'base ms':>12}{'now ms':>12}{'change':>10}", file=file)
+    for name, result in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            print(f"{name:<26}{'-':>12}{result[metric]:>12.3f}{'new':>10}", file=file)
+            continue
+        change = result[metric] / base[metric] - 1 if base[metric] else 0.0
+        flag = ""
+        if change > tolerance:
+            flag = "  REGRESSION"
+            regressions.append({"scenario": name, "metric": metric, "baseline_ms": base[metric],
+                                "current_ms": result[metric], "change": round(change, 3)})
+        print(f"{name:<26}{base[metric]:>12.3f}{result[metric]:>12.3f}{change:>+10.1%}{flag}", file=file)
+    return regressions
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Backend hot-path benchmarks on the fake oracledb driver")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--rows", type=int, default=200, help="rows per SELECT (and per micro-benchmark batch)")
+    parser.add_argument("--latency-ms", type=float, default=1.0, help="simulated round-trip latency")
+    parser.add_argument("--backend", choices=("fake", "sqlite"), default="fake",
+                        help="fake driver (default) or a real SQLite database (storage/sqlite.py)")
+    parser.add_argument("--sqlite-path", help="SQLite database file for --backend sqlite (default: temporary file)")
+    parser.add_argument("--filter", action="append", help="run scenarios whose name contains this or whose group (micro, http) is this; repeatable")
+    parser.add_argument("--cache", action="store_true", help="keep the response cache enabled")
+    parser.add_argument("--dataset", choices=("tiny", "small", "medium", "large"),
+                        help="serve tables generated by tools/datagen.py instead of --rows synthetic rows")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="compare medians against a saved JSON result")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed slowdown vs baseline (0.15 = 15%%)")
+    parser.add_argument("--metric", default="median_ms", choices=("median_ms", "min_ms", "p95_ms", "mean_ms"),
+                        help="statistic compared against the baseline")
+    parser.add_argument("--json", action="store_true", help="print the JSON result to stdout")
+    args = parser.parse_args()
+
+    configure_environment(args)
+    if not args.json:
+        print(f"{'scenario':<26}{'median ms':>12}{'p95 ms':>12}{'ops/s':>12}{'trips':>8}", file=sys.stderr)
+    report = asyncio.run(run_suite(args))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        report["regressions"] = compare(report, baseline, args.tolerance, args.metric, sys.stderr if args.json else sys.stdout)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    if report.get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main_cli()
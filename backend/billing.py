@@ -0,0 +1,123 @@
+# Miesieczne naliczanie oplat (POST /billing/run): odczyty licznikow dla wielu
+# mieszkan/uslug w jednym zadaniu (JSON lub CSV). Kwoty sa wyliczane w bazie
+# jednym, tablicowo bindowanym INSERT ... SELECT z uslugi (cena_za_jednostke *
+# zuzycie, jak w dodaj_oplate_fn), calosc konczy jeden commit. Zamiast
+# SELECT + INSERT + COMMIT na kazda oplate sa trzy round-tripy na cale naliczenie.
+import csv
+import io
+import time
+from datetime import datetime
+
+MAX_READINGS = 100000
+CSV_COLUMNS = ("id_mieszkania", "id_uslugi", "zuzycie")
+UNKNOWN_SERVICE = "Nieznana usluga"
+
+# Ceny blokowane do konca transakcji - podsumowanie odpowiada kwotom wyliczonym
+# przez INSERT, nawet gdy rownolegle dziala zwieksz_oplaty
+PRICES_SQL = "SELECT id_uslugi, nazwa_uslugi, cena_za_jednostke FROM uslugi FOR UPDATE"
+
+INSERT_SQL = """
+    INSERT INTO oplata (id_mieszkania, id_uslugi, kwota, zuzycie{date_column})
+    SELECT :id_mieszkania, u.id_uslugi, ROUND(u.cena_za_jednostke * :zuzycie, 2), :zuzycie{date_value}
+    FROM uslugi u WHERE u.id_uslugi = :id_uslugi
+"""
+
+
+class BillingError(ValueError):
+    pass
+
+
+def parse_csv(text: str) -> list:
+    # Naglowek wymagany; separator "," lub ";" (eksport z arkusza)
+    lines = text.lstrip("\ufeff")
+    if not lines.strip():
+        raise BillingError("Pusty plik CSV")
+    delimiter = ";" if ";" in lines.splitlines()[0] else ","
+    reader = csv.DictReader(io.StringIO(lines), delimiter=delimiter)
+    header = [name.strip().lower() for name in reader.fieldnames or []]
+    missing = [col for col in CSV_COLUMNS if col not in header]
+    if missing:
+        raise BillingError(f"Brak kolumn w CSV: {', '.join(missing)}")
+    reader.fieldnames = header
+    return [{col: row[col] for col in CSV_COLUMNS} for row in reader]
+
+
+def parse_date(value):
+    if value in (None, ""):
+        return None
+    try:
+        return datetime.fromisoformat(str(value).strip()).replace(tzinfo=None)
+    except ValueError as e:
+        raise BillingError(f"Nieprawidlowa data naliczenia: {value}") from e
+
+
+def validate(readings: list) -> tuple[list, list]:
+    # -> (poprawne odczyty [(indeks, binds)], bledy [(indeks, komunikat)])
+    if not readings:
+        raise BillingError("Brak odczytow")
+    if len(readings) > MAX_READINGS:
+        raise BillingError(f"Maksymalnie {MAX_READINGS} odczytow w jednym naliczeniu")
+    valid, errors = [], []
+    for index, reading in enumerate(readings):
+        try:
+            id_mieszkania = int(reading["id_mieszkania"])
+            id_uslugi = int(reading["id_uslugi"])
+            zuzycie = float(str(reading["zuzycie"]).replace(",", "."))
+        except (KeyError, TypeError, ValueError):
+            errors.append((index, "Wymagane: id_mieszkania, id_uslugi, zuzycie"))
+            continue
+        if zuzycie < 0:
+            errors.append((index, "Zuzycie nie moze byc ujemne"))
+            continue
+        valid.append((index, {"id_mieszkania": id_mieszkania, "id_uslugi": id_uslugi, "zuzycie": zuzycie}))
+    return valid, errors
+
+
+def run(cursor, conn, valid: list, errors: list, data_naliczenia=None, translate=str) -> dict:
+    start = time.perf_counter()
+    errors = list(errors)
+    cursor.execute(PRICES_SQL)
+    prices = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+    sql = INSERT_SQL.format(
+        date_column=", data_naliczenia" if data_naliczenia else "",
+        date_value=", :data_naliczenia" if data_naliczenia else "",
+    )
+    rows = [binds if not data_naliczenia else {**binds, "data_naliczenia": data_naliczenia} for _, binds in valid]
+    inserted = []
+    if rows:
+        cursor.executemany(sql, rows, batcherrors=True, arraydmlrowcounts=True)
+        failed = {}
+        for error in cursor.getbatcherrors():
+            failed[error.offset] = translate(error.message)
+        counts = cursor.getarraydmlrowcounts()
+        for offset, (index, binds) in enumerate(valid):
+            if offset in failed:
+                errors.append((index, failed[offset]))
+            elif offset < len(counts) and counts[offset] == 0:
+                # INSERT ... SELECT nie zwrocil wiersza - brak uslugi
+                errors.append((index, UNKNOWN_SERVICE))
+            else:
+                inserted.append(binds)
+    conn.commit()
+
+    services = {}
+    total = 0.0
+    for binds in inserted:
+        name, price = prices.get(binds["id_uslugi"], (str(binds["id_uslugi"]), 0))
+        kwota = round(float(price or 0) * binds["zuzycie"], 2)
+        total += kwota
+        summary = services.setdefault(name, {"nazwa_uslugi": name, "oplaty": 0, "zuzycie": 0.0, "kwota": 0.0})
+        summary["oplaty"] += 1
+        summary["zuzycie"] = round(summary["zuzycie"] + binds["zuzycie"], 3)
+        summary["kwota"] = round(summary["kwota"] + kwota, 2)
+    errors.sort(key=lambda error: error[0])
+    return {
+        "success": not errors,
+        "inserted": len(inserted),
+        "rejected": [{"index": index, "message": message} for index, message in errors],
+        "apartments": len({binds["id_mieszkania"] for binds in inserted}),
+        "total_kwota": round(total, 2),
+        "services": sorted(services.values(), key=lambda s: -s["kwota"]),
+        "data_naliczenia": data_naliczenia.strftime("%Y-%m-%d") if data_naliczenia else None,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+    }
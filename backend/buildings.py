@@ -0,0 +1,128 @@
+# Raporty budynkow w postaci strukturalnej: czlonkowie budynku (zamiast
+# pobierz_czlonkow_budynku - tekst VARCHAR2(4000) skladany w petli kursora,
+# ucinany na duzych budynkach) i statystyki (zamiast statystyki_budynku - trzy
+# osobne COUNT i sformatowany tekst). Jeden budynek, wybrane albo wszystkie naraz:
+# jedna instrukcja na strone, stronicowanie keyset z kursorem z pagination.py.
+from pagination import PaginationError, decode_cursor, encode_cursor
+from schema import get_table
+from search import IN_LIST_SIZES
+from serialization import fetch_dicts
+
+MAX_IDS = IN_LIST_SIZES[-1]
+
+# Czlonkowie w kolejnosci (id_budynku, id_czlonka) - kursor strony to ta para;
+# bez pesel/telefon (jak v_czlonek_bezpieczny)
+MEMBERS_SQL = """
+    SELECT m.id_budynku, c.id_mieszkania, m.numer AS numer_mieszkania, c.id_czlonka,
+           c.imie, c.nazwisko, c.email, c.data_przystapienia
+    FROM czlonek c
+    JOIN mieszkanie m ON c.id_mieszkania = m.id_mieszkania
+    {where}
+    ORDER BY m.id_budynku, c.id_czlonka
+    FETCH FIRST :limit_rows ROWS ONLY
+"""
+MEMBERS_AFTER = "(m.id_budynku > :after_building OR (m.id_budynku = :after_building AND c.id_czlonka > :after_pk))"
+
+# Strona budynkow, a liczniki jako GROUP BY po mieszkaniach tej strony (indeksy
+# idx_mieszkanie_budynek, idx_czlonek_mieszkanie, idx_naprawa_mieszkanie) -
+# budynki bez mieszkan maja zera
+STATS_SQL = """
+    WITH strona AS (
+        SELECT id_budynku, adres FROM budynek
+        {where}
+        ORDER BY id_budynku
+        FETCH FIRST :limit_rows ROWS ONLY
+    ), mieszkania AS (
+        SELECT m.id_mieszkania, m.id_budynku
+        FROM mieszkanie m JOIN strona s ON m.id_budynku = s.id_budynku
+    )
+    SELECT s.id_budynku, s.adres,
+           NVL(mi.liczba, 0) AS liczba_mieszkan,
+           NVL(cz.liczba, 0) AS liczba_czlonkow,
+           NVL(na.liczba, 0) AS liczba_napraw,
+           NVL(na.otwarte, 0) AS naprawy_otwarte
+    FROM strona s
+    LEFT JOIN (
+        SELECT id_budynku, COUNT(*) AS liczba FROM mieszkania GROUP BY id_budynku
+    ) mi ON mi.id_budynku = s.id_budynku
+    LEFT JOIN (
+        SELECT mi.id_budynku, COUNT(*) AS liczba
+        FROM czlonek c JOIN mieszkania mi ON c.id_mieszkania = mi.id_mieszkania
+        GROUP BY mi.id_budynku
+    ) cz ON cz.id_budynku = s.id_budynku
+    LEFT JOIN (
+        SELECT mi.id_budynku, COUNT(*) AS liczba,
+               SUM(CASE WHEN n.status = 'wykonana' THEN 0 ELSE 1 END) AS otwarte
+        FROM naprawa n JOIN mieszkania mi ON n.id_mieszkania = mi.id_mieszkania
+        GROUP BY mi.id_budynku
+    ) na ON na.id_budynku = s.id_budynku
+    ORDER BY s.id_budynku
+"""
+
+
+class BuildingsError(ValueError):
+    pass
+
+
+def parse_ids(text) -> list:
+    if not text:
+        return []
+    try:
+        ids = sorted({int(part) for part in text.split(",") if part.strip()})
+    except ValueError:
+        raise BuildingsError("Parametr ids musi byc lista liczb calkowitych oddzielonych przecinkami")
+    if len(ids) > MAX_IDS:
+        raise BuildingsError(f"Maksymalnie {MAX_IDS} ID w jednym zadaniu")
+    return ids
+
+
+def _decode(token: str) -> tuple:
+    try:
+        return decode_cursor(get_table("mieszkanie"), "id_budynku", token)
+    except PaginationError as e:
+        raise BuildingsError(str(e)) from e
+
+
+def _page(rows: list, limit: int, cursor_of) -> dict:
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = cursor_of(rows[-1])
+    return {"items": rows, "next_cursor": next_cursor, "limit": limit}
+
+
+def _in_list(ids: list, params: dict) -> str:
+    # Lista dopelniona do rozmiaru z IN_LIST_SIZES (powtarzalny tekst SQL)
+    size = next(n for n in IN_LIST_SIZES if n >= len(ids))
+    params.update({f"b{i}": ids[min(i, len(ids) - 1)] for i in range(size)})
+    return ", ".join(f":b{i}" for i in range(size))
+
+
+def members_page(cursor, conn, building_id, after, limit: int) -> dict:
+    conditions, params = [], {"limit_rows": limit + 1}
+    if building_id is not None:
+        conditions.append("m.id_budynku = :id_budynku")
+        params["id_budynku"] = building_id
+    if after:
+        params["after_building"], params["after_pk"] = _decode(after)
+        conditions.append(MEMBERS_AFTER)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    rows = fetch_dicts(cursor, MEMBERS_SQL.format(where=where), params)
+    return _page(rows, limit, lambda row: encode_cursor(row["id_budynku"], row["id_czlonka"]))
+
+
+def stats_page(cursor, conn, ids: list, after, limit: int) -> dict:
+    conditions, params = [], {"limit_rows": limit + 1}
+    if ids:
+        conditions.append(f"id_budynku IN ({_in_list(ids, params)})")
+    if after:
+        params["after_pk"] = _decode(after)[1]
+        conditions.append("id_budynku > :after_pk")
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    rows = fetch_dicts(cursor, STATS_SQL.format(where=where), params)
+    return _page(rows, limit, lambda row: encode_cursor(None, row["id_budynku"]))
+
+
+def building_exists(cursor, conn, building_id: int) -> bool:
+    cursor.execute("SELECT COUNT(*) FROM budynek WHERE id_budynku = :id_budynku", {"id_budynku": building_id})
+    return cursor.fetchone()[0] > 0
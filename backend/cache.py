@@ -0,0 +1,221 @@
+# Cache odpowiedzi GET dla widokow i list tabel: klucz = sciezka + posortowane
+# parametry, wpisy z TTL i limitem LRU, ETag liczony z tresci (If-None-Match -> 304).
+# Kazda trasa ma przypisane tabele, z ktorych czyta (ROUTE_TABLES); endpointy
+# zapisujace wolaja invalidate(tabele...), co usuwa zalezne wpisy. Licznik generacji
+# tabel chroni przed zapisaniem odpowiedzi policzonej przed zmiana danych.
+import hashlib
+import os
+import re
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from fastapi.responses import Response
+
+import profiler
+import schema
+
+
+class CacheConfig:
+    TTL = float(os.getenv("RESPONSE_CACHE_TTL", "30"))               # s; 0 wylacza cache
+    MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_SIZE", "256"))
+    MAX_BODY = int(os.getenv("RESPONSE_CACHE_MAX_BODY", str(5 * 1024 * 1024)))  # bajty
+
+
+# Trasa -> tabele (lub widoki zmaterializowane) zrodlowe, zgodnie z definicjami w INIT_DB.sql
+SUMMARY_TABLES = ("budynek", "mieszkanie", "czlonek", "pracownik", "naprawa", "oplata", "umowa", "uslugi")
+ROUTE_TABLES = {
+    "/views/mieszkania-info": ("mieszkanie", "budynek"),
+    "/views/oplaty-summary": ("mieszkanie", "oplata"),
+    "/views/naprawy-status": ("naprawa", "pracownik"),
+    "/views/dashboard-stats": ("mv_dashboard_stats",),
+    "/views/zuzycie-per-budynek": ("mv_zuzycie_mediow", "budynek"),
+    "/views/czlonek-bezpieczny": ("czlonek",),
+    "/views/pracownicy-naprawy": ("naprawa", "pracownik"),
+    "/views/oplaty-uslugi-full": ("oplata", "uslugi"),
+    "/views/budynki-uslugi-cross": ("budynek", "uslugi"),
+    "/views/pracownicy-koledzy": ("pracownik",),
+    "/views/czlonkowie-pelne-info": ("czlonek", "mieszkanie", "budynek"),
+    "/reports/summary": SUMMARY_TABLES,
+}
+# Trasy z parametrem w sciezce: (wzorzec, nazwa trasy w statystykach, tabele)
+ROUTE_PATTERNS = [
+    (re.compile(r"^/views/czlonek-pelne-dane/\d+$"), lambda match: "/views/czlonek-pelne-dane/{id}", lambda match: ("czlonek",)),
+    (re.compile(r"^/data/(?P<table>\w+)$"), lambda match: match.string, lambda match: (match["table"],)),
+]
+# Parametry, przy ktorych odpowiedz nie jest buforowana (eksport strumieniowy,
+# profilowanie - profil ma objac handler, a nie odczyt z cache)
+UNCACHED_PARAMS = ("format", "profile")
+# Parametry pomijane w kluczu cache - wymuszanie pobrania ("?t=<czas>") nie
+# tworzy nowego wpisu; swiezosc zapewnia rewalidacja ETag (Cache-Control: no-cache)
+IGNORED_PARAMS = ("t", "_")
+# Naglowki aplikacji (X-...) ustawione przez handler zapisywane razem z trescia;
+# stan widokow MV dokleja main.mv_headers_middleware poza cache
+STORED_HEADER_PREFIX = "x-"
+
+
+def resolve_route(path: str):
+    # -> (nazwa trasy, tabele zrodlowe) albo None, gdy trasa nie jest buforowana
+    tables = ROUTE_TABLES.get(path)
+    if tables is not None:
+        return path, tables
+    for pattern, name, resolve in ROUTE_PATTERNS:
+        match = pattern.match(path)
+        if match:
+            tables = resolve(match)
+            if all(table in schema.TABLES for table in tables):
+                return name(match), tables
+    return None
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+
+def etag_matches(header, etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in [tag.strip().removeprefix("W/") for tag in header.split(",")]
+
+
+class CacheEntry:
+    __slots__ = ("body", "etag", "media_type", "tables", "expires", "headers")
+
+    def __init__(self, body: bytes, etag: str, media_type: str, tables, expires: float, headers=None):
+        self.body = body
+        self.etag = etag
+        self.media_type = media_type
+        self.tables = tables
+        self.expires = expires
+        self.headers = headers or {}
+
+
+class ResponseCache:
+    def __init__(self, ttl: float = CacheConfig.TTL, max_entries: int = CacheConfig.MAX_ENTRIES,
+                 max_body: int = CacheConfig.MAX_BODY):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_body = max_body
+        self._entries = OrderedDict()
+        self._generations = {}
+        self._lock = Lock()
+        self.stats = {"hits": 0, "misses": 0, "not_modified": 0, "stores": 0, "evictions": 0,
+                      "expirations": 0, "invalidations": 0, "skipped": 0}
+        self.routes = {}   # trasa -> {"hits": n, "misses": n}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def _count(self, route: str, name: str):
+        self.stats[name] += 1
+        self.routes.setdefault(route, {"hits": 0, "misses": 0})[name] += 1
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires <= time.monotonic():
+                del self._entries[key]
+                self.stats["expirations"] += 1
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def generation(self, tables) -> tuple:
+        with self._lock:
+            return tuple(self._generations.get(table, 0) for table in tables)
+
+    def put(self, key: str, entry: CacheEntry, generation: tuple) -> bool:
+        with self._lock:
+            if generation != tuple(self._generations.get(table, 0) for table in entry.tables):
+                return False
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self.stats["stores"] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+            return True
+
+    def invalidate(self, *tables):
+        changed = set(tables)
+        with self._lock:
+            for table in changed:
+                self._generations[table] = self._generations.get(table, 0) + 1
+            stale = [key for key, entry in self._entries.items() if changed.intersection(entry.tables)]
+            for key in stale:
+                del self._entries[key]
+            self.stats["invalidations"] += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                "enabled": self.enabled,
+                "ttl_seconds": self.ttl,
+                "max_entries": self.max_entries,
+                "entries": len(self._entries),
+                "bytes": sum(len(entry.body) for entry in self._entries.values()),
+                "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else None,
+                **self.stats,
+                "routes": {path: dict(counts) for path, counts in sorted(self.routes.items())},
+            }
+
+    def _response(self, entry: CacheEntry, request, status: str) -> Response:
+        headers = {**entry.headers, "ETag": entry.etag, "Cache-Control": "no-cache", "X-Cache": status}
+        if etag_matches(request.headers.get("if-none-match"), entry.etag):
+            self.stats["not_modified"] += 1
+            return Response(status_code=304, headers=headers)
+        return Response(entry.body, media_type=entry.media_type, headers=headers)
+
+    async def handle(self, request, call_next):
+        if request.method != "GET" or not self.enabled:
+            return await call_next(request)
+        path = request.url.path
+        resolved = resolve_route(path)
+        if (resolved is None or any(param in request.query_params for param in UNCACHED_PARAMS)
+                or profiler.requested(request)):
+            return await call_next(request)
+        route, tables = resolved
+        key = path + "?" + "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items())
+                                    if k not in IGNORED_PARAMS)
+        entry = self.get(key)
+        if entry is not None:
+            self._count(route, "hits")
+            return self._response(entry, request, "HIT")
+
+        self._count(route, "misses")
+        generation = self.generation(tables)
+        response = await call_next(request)
+        if response.status_code != 200:
+            return response
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        headers = {name: value for name, value in response.headers.items() if name.startswith(STORED_HEADER_PREFIX)}
+        entry = CacheEntry(body, make_etag(body), response.headers.get("content-type") or response.media_type,
+                           tables, time.monotonic() + self.ttl, headers)
+        if len(body) > self.max_body or not self.put(key, entry, generation):
+            self.stats["skipped"] += 1
+        return self._response(entry, request, "MISS")
+
+
+response_cache = ResponseCache()
+# Inne cache w pamieci (np. meetings.py) uniewazniane razem z cache odpowiedzi
+_listeners = {}   # tabela -> [callback(*tabele)]
+
+
+def on_invalidate(table: str, callback):
+    _listeners.setdefault(table, []).append(callback)
+
+
+def invalidate(*tables):
+    response_cache.invalidate(*tables)
+    for callback in {callback for table in tables for callback in _listeners.get(table, ())}:
+        callback(*tables)
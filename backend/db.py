@@ -1,18 +1,93 @@
-import oracledb
 import os
+import asyncio
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 
+import metrics
+import profiler
+from storage import BACKEND, DEFAULT_DSN, driver
+
 class DatabaseConfig:
     USER = os.getenv("DB_USER", "system")
     PASSWORD = os.getenv("DB_PASSWORD", "oracle")
-    DSN = os.getenv("DB_DSN", "localhost:1521/XEPDB1")
+    DSN = os.getenv("DB_DSN", DEFAULT_DSN[BACKEND])   # dla sqlite: sciezka pliku bazy
+    # Pula sesji: rozmiar, przyrost, limit oczekiwania na polaczenie (ms) i ping przy pobraniu (s)
+    POOL_MIN = int(os.getenv("DB_POOL_MIN", "2"))
+    POOL_MAX = int(os.getenv("DB_POOL_MAX", "10"))
+    POOL_INCREMENT = int(os.getenv("DB_POOL_INCREMENT", "1"))
+    POOL_WAIT_TIMEOUT = int(os.getenv("DB_POOL_WAIT_TIMEOUT", "5000"))
+    POOL_PING_INTERVAL = int(os.getenv("DB_POOL_PING_INTERVAL", "60"))
+    # Cache instrukcji sterownika na sesje (liczba tekstow SQL trzymanych otwartych);
+    # kanoniczne teksty z sqlbuilder.py sprawiaja, ze powtarzalne zapytania sie w nim mieszcza
+    STMT_CACHE_SIZE = int(os.getenv("DB_STMT_CACHE_SIZE", "50"))
+
+_pool = None
+_executor = None
+
+def create_pool():
+    global _pool
+    if _pool is None:
+        _pool = driver.create_pool(
+            user=DatabaseConfig.USER,
+            password=DatabaseConfig.PASSWORD,
+            dsn=DatabaseConfig.DSN,
+            min=DatabaseConfig.POOL_MIN,
+            max=DatabaseConfig.POOL_MAX,
+            increment=DatabaseConfig.POOL_INCREMENT,
+            getmode=driver.POOL_GETMODE_TIMEDWAIT,
+            wait_timeout=DatabaseConfig.POOL_WAIT_TIMEOUT,
+            ping_interval=DatabaseConfig.POOL_PING_INTERVAL,
+            stmtcachesize=DatabaseConfig.STMT_CACHE_SIZE
+        )
+    return _pool
+
+def close_pool():
+    global _pool, _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+    if _pool is not None:
+        _pool.close(force=True)
+        _pool = None
+
+def get_pool():
+    return _pool
+
+def warm_pool(statements=()):
+    # Otwiera naraz DB_POOL_MIN sesji (ping) i parsuje na kazdej podane zapytania
+    # bez pobierania wierszy - pierwsze zadania nie czekaja na polaczenie ani parsowanie
+    pool = create_pool()
+    connections = []
+    try:
+        for _ in range(min(DatabaseConfig.POOL_MIN, DatabaseConfig.POOL_MAX)):
+            conn = pool.acquire()
+            connections.append(conn)
+            conn.ping()
+            for sql in statements:
+                cursor = conn.cursor()
+                try:
+                    cursor.prefetchrows = 0
+                    cursor.arraysize = 1
+                    cursor.execute(sql)
+                finally:
+                    cursor.close()
+    finally:
+        for conn in connections:
+            conn.close()
+    return len(connections), len(statements)
 
 def get_connection():
-    return oracledb.connect(
-        user=DatabaseConfig.USER,
-        password=DatabaseConfig.PASSWORD,
-        dsn=DatabaseConfig.DSN
-    )
+    # Bez utworzonej puli (np. skrypty, start aplikacji) laczymy sie bezposrednio
+    if _pool is None:
+        return driver.connect(
+            user=DatabaseConfig.USER,
+            password=DatabaseConfig.PASSWORD,
+            dsn=DatabaseConfig.DSN,
+            stmtcachesize=DatabaseConfig.STMT_CACHE_SIZE
+        )
+    return _pool.acquire()
 
 @contextmanager
 def get_db_connection():
@@ -26,14 +101,48 @@ def get_db_connection():
 
 @contextmanager
 def get_cursor():
+    # Kursor opakowany przez metrics.instrument (czas execute/fetch, wiersze);
+    # mierzony jest tez czas oczekiwania na sesje z puli
     conn = None
     cursor = None
     try:
+        start = time.perf_counter()
         conn = get_connection()
-        cursor = conn.cursor()
+        metrics.db_acquire.observe(time.perf_counter() - start)
+        cursor = metrics.instrument(conn.cursor())
         yield cursor, conn
     finally:
         if cursor:
             cursor.close()
         if conn:
             conn.close()
+
+
+# Warstwa asynchroniczna: synchroniczne wywolania oracledb wykonywane sa w
+# ograniczonej puli watkow (rozmiar = DB_POOL_MAX), wiec nie blokuja petli zdarzen
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=DatabaseConfig.POOL_MAX, thread_name_prefix="db")
+    return _executor
+
+def _run_with_cursor(func, args, kwargs):
+    with profiler.attach(), get_cursor() as (cursor, conn):
+        return func(cursor, conn, *args, **kwargs)
+
+async def run_db(func, *args, **kwargs):
+    # Kontekst zadania (sciezka dla slowlog.py, sesja profilera) przechodzi do watku puli
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(get_executor(), context.run, _run_with_cursor, func, args, kwargs)
+
+
+@metrics.registry.collector
+def pool_metrics():
+    if _pool is None:
+        return []
+    return [
+        ("db_pool_open_sessions", "gauge", "Otwarte sesje w puli", [({}, _pool.opened)]),
+        ("db_pool_busy_sessions", "gauge", "Sesje wypozyczone z puli", [({}, _pool.busy)]),
+        ("db_pool_max_sessions", "gauge", "Maksymalny rozmiar puli", [({}, _pool.max)]),
+    ]
@@ -0,0 +1,71 @@
+# Eksport strumieniowy (?format=ndjson|csv): wiersze sa pobierane partiami przez
+# fetchmany i kodowane przyrostowo, wiec zuzycie pamieci nie zalezy od liczby wierszy.
+import csv
+import io
+import json
+from datetime import datetime
+
+from fastapi.responses import StreamingResponse
+
+from db import get_cursor
+from storage import DATE_DB_TYPES
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+EXPORT_ARRAYSIZE = 1000
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.strftime(DATE_FORMAT)
+    return str(value)
+
+
+def _encode_ndjson(columns, rows):
+    dumps = json.dumps
+    return "".join(
+        dumps(dict(zip(columns, row)), default=_json_default, ensure_ascii=False) + "\n" for row in rows
+    )
+
+
+def _encode_csv(columns, date_indexes, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if date_indexes:
+        rows = [list(row) for row in rows]
+        for row in rows:
+            for i in date_indexes:
+                if row[i] is not None:
+                    row[i] = row[i].strftime(DATE_FORMAT)
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+# Celowo bez run_db: StreamingResponse iteruje synchroniczny generator w puli watkow
+# Starlette (anyio), wiec eksport trzyma sesje z puli bazy przez caly transfer poza
+# limitem executora db.py - rownolegle eksporty ogranicza tylko DB_POOL_MAX sesji
+def stream_rows(sql: str, params=None, export_format: str = "ndjson", arraysize: int = EXPORT_ARRAYSIZE):
+    with get_cursor() as (cursor, conn):
+        cursor.arraysize = arraysize
+        cursor.prefetchrows = arraysize + 1
+        cursor.execute(sql, params)
+        columns = [col[0].lower() for col in cursor.description]
+        date_indexes = [i for i, col in enumerate(cursor.description) if col[1] in DATE_DB_TYPES]
+        if export_format == "csv":
+            yield _encode_csv(columns, [], [columns])
+        while True:
+            rows = cursor.fetchmany()
+            if not rows:
+                break
+            yield _encode_csv(columns, date_indexes, rows) if export_format == "csv" else _encode_ndjson(columns, rows)
+
+
+def export_response(sql: str, params=None, export_format: str = "ndjson", filename: str = "export") -> StreamingResponse:
+    return StreamingResponse(
+        stream_rows(sql, params, export_format),
+        media_type=EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format}"'},
+    )
@@ -0,0 +1,58 @@
+# Logowanie strukturalne: jeden wiersz JSON na zdarzenie (LOG_FORMAT=json,
+# domyslnie) albo czytelny tekst (LOG_FORMAT=text), poziom z LOG_LEVEL.
+# Dodatkowe pola przekazuje sie przez extra={"fields": {...}}. Komunikaty DEBUG
+# (np. SQL zapisow) sa formatowane leniwie, wiec przy wyzszym poziomie nic nie kosztuja.
+import json
+import logging
+import os
+import sys
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+ROOT_LOGGER = "coop"
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}",
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry.update(fields)
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            text += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        return text
+
+
+def setup(level: str = LOG_LEVEL, fmt: str = LOG_FORMAT):
+    root = logging.getLogger(ROOT_LOGGER)
+    if getattr(root, "_configured", False):
+        return root
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(JSONFormatter() if fmt == "json" else TextFormatter())
+    root.addHandler(handler)
+    root.setLevel(getattr(logging, level, logging.INFO))
+    root.propagate = False
+    root._configured = True
+    return root
+
+
+def get_logger(name: str) -> logging.Logger:
+    setup()
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
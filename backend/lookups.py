@@ -0,0 +1,186 @@
+# Wyszukiwania wsadowe dla funkcji pakietow wywolywanych per ID (coop_pkg,
+# coop_crud_pkg): lista ID -> mapa wynikow z jednego zapytania zbiorowego (GROUP BY
+# / IN po oplata, naprawa, mieszkanie...) zamiast N wywolan PL/SQL i N round-tripow.
+# Wyniki maja semantyke funkcji z INIT_DB.sql (brak danych -> 0 albo
+# "Nie znaleziono"), a partia z jednym ID idzie przez sama funkcje pakietu.
+# Loader laczy rownolegle pojedyncze zadania (/functions/apartment-fees/{id} itd.)
+# w jedna partie (jak DataLoader): ID zebrane w tej samej iteracji petli zdarzen
+# (lub w oknie LOOKUP_BATCH_WINDOW_MS) ida jednym zapytaniem, powtorzone ID - raz.
+import asyncio
+import os
+
+import metrics
+from db import run_db
+from search import IN_LIST_SIZES
+
+MAX_IDS = 1000
+BATCH_WINDOW = float(os.getenv("LOOKUP_BATCH_WINDOW_MS", "0")) / 1000   # s; 0 = biezaca iteracja petli
+NOT_FOUND = "Nie znaleziono"
+
+lookup_requests = metrics.registry.counter("lookup_requests_total", "Pojedyncze zadania wyszukiwan przez loader",
+                                           ("lookup",))
+lookup_batches = metrics.registry.counter("lookup_batches_total", "Zapytania wsadowe wyszukiwan", ("lookup",))
+lookup_keys = metrics.registry.counter("lookup_keys_total", "Rozne ID w zapytaniach wsadowych", ("lookup",))
+
+
+class LookupsError(ValueError):
+    pass
+
+
+def parse_ids(text: str) -> list:
+    # "1,2,3" -> [1, 2, 3] bez powtorzen, w kolejnosci podania
+    try:
+        ids = list(dict.fromkeys(int(part) for part in text.split(",") if part.strip()))
+    except ValueError:
+        raise LookupsError("Parametr ids musi byc lista liczb calkowitych oddzielonych przecinkami")
+    if not ids:
+        raise LookupsError("Pusta lista ids")
+    if len(ids) > MAX_IDS:
+        raise LookupsError(f"Maksymalnie {MAX_IDS} ID w jednym zadaniu")
+    return ids
+
+
+def _number(value):
+    return float(value) if value else 0
+
+
+def _count(value):
+    return int(value) if value else 0
+
+
+def _stats(mieszkan, czlonkow, napraw) -> str:
+    # Tekst jak z coop_crud_pkg.statystyki_budynku
+    return f"Mieszkan: {_count(mieszkan)}, Czlonkow: {_count(czlonkow)}, Napraw: {_count(napraw)}"
+
+
+def _call_out(plsql: str, convert):
+    def call(cursor, key):
+        out = cursor.var(float)
+        cursor.execute(plsql, [out, key])
+        return convert(out.getvalue())
+    return call
+
+
+def _callfunc(name: str):
+    def call(cursor, key):
+        return cursor.callfunc(name, str, [key])
+    return call
+
+
+class Lookup:
+    # sql: zapytanie z {keys} (lista bindow IN), wiersze (id, wartosci...);
+    # default: wynik dla ID bez wierszy; single: (cursor, id) -> wynik funkcji pakietu
+    def __init__(self, name: str, sql: str, convert, default, single):
+        self.name = name
+        self.sql = sql
+        self.convert = convert
+        self.default = default
+        self.single = single
+
+    def fetch(self, cursor, conn, keys: list) -> dict:
+        lookup_batches.inc(self.name)
+        lookup_keys.inc(self.name, value=len(keys))
+        if len(keys) == 1:
+            return {keys[0]: self.single(cursor, keys[0])}
+        results = dict.fromkeys(keys, self.default)
+        limit = IN_LIST_SIZES[-1]
+        for start in range(0, len(keys), limit):
+            chunk = keys[start:start + limit]
+            size = next(n for n in IN_LIST_SIZES if n >= len(chunk))
+            binds = {f"k{i}": chunk[min(i, len(chunk) - 1)] for i in range(size)}
+            cursor.execute(self.sql.format(keys=", ".join(":" + name for name in binds)), binds)
+            for key, *values in cursor:
+                results[int(key)] = self.convert(*values)
+        return results
+
+
+LOOKUPS = {lookup.name: lookup for lookup in (
+    Lookup("apartment_fees", """
+        SELECT id_mieszkania, NVL(SUM(kwota), 0)
+        FROM oplata
+        WHERE id_mieszkania IN ({keys})
+        GROUP BY id_mieszkania
+    """, _number, 0, _call_out("BEGIN :1 := coop_pkg.suma_oplat_mieszkania(:2); END;", _number)),
+    Lookup("worker_repairs", """
+        SELECT id_pracownika, COUNT(*)
+        FROM naprawa
+        WHERE id_pracownika IN ({keys})
+        GROUP BY id_pracownika
+    """, _count, 0, _call_out("BEGIN :1 := coop_pkg.policz_naprawy_pracownika(:2); END;", _count)),
+    Lookup("member_surname", """
+        SELECT id_czlonka, nazwisko FROM czlonek WHERE id_czlonka IN ({keys})
+    """, str, NOT_FOUND, _callfunc("coop_crud_pkg.pobierz_nazwisko_czlonka")),
+    Lookup("building_address", """
+        SELECT id_budynku, adres FROM budynek WHERE id_budynku IN ({keys})
+    """, str, NOT_FOUND, _callfunc("coop_crud_pkg.pobierz_adres_budynku")),
+    # Liczniki czlonkow i napraw zawezone do mieszkan z wybranych budynkow (indeksy
+    # idx_mieszkanie_budynek, idx_czlonek_mieszkanie, idx_naprawa_mieszkanie)
+    Lookup("building_stats", """
+        SELECT m.id_budynku, COUNT(*), NVL(SUM(c.liczba), 0), NVL(SUM(n.liczba), 0)
+        FROM mieszkanie m
+        LEFT JOIN (
+            SELECT id_mieszkania, COUNT(*) AS liczba FROM czlonek
+            WHERE id_mieszkania IN (SELECT id_mieszkania FROM mieszkanie WHERE id_budynku IN ({keys}))
+            GROUP BY id_mieszkania
+        ) c ON c.id_mieszkania = m.id_mieszkania
+        LEFT JOIN (
+            SELECT id_mieszkania, COUNT(*) AS liczba FROM naprawa
+            WHERE id_mieszkania IN (SELECT id_mieszkania FROM mieszkanie WHERE id_budynku IN ({keys}))
+            GROUP BY id_mieszkania
+        ) n ON n.id_mieszkania = m.id_mieszkania
+        WHERE m.id_budynku IN ({keys})
+        GROUP BY m.id_budynku
+    """, _stats, _stats(0, 0, 0), _callfunc("coop_crud_pkg.statystyki_budynku")),
+)}
+
+
+async def fetch_many(name: str, keys: list) -> dict:
+    return await run_db(LOOKUPS[name].fetch, keys)
+
+
+class Loader:
+    def __init__(self, lookup: Lookup):
+        self.lookup = lookup
+        self._pending = {}     # ID -> future wspolny dla wszystkich zadan o to ID
+        self._handle = None
+        self._tasks = set()
+
+    async def load(self, key: int):
+        lookup_requests.inc(self.lookup.name)
+        loop = asyncio.get_running_loop()
+        future = self._pending.get(key)
+        if future is None:
+            future = self._pending[key] = loop.create_future()
+            if len(self._pending) >= MAX_IDS:
+                self._dispatch()
+            elif self._handle is None:
+                self._handle = loop.call_later(BATCH_WINDOW, self._dispatch) if BATCH_WINDOW else loop.call_soon(self._dispatch)
+        # shield: anulowanie jednego zadania nie anuluje wyniku pozostalych
+        return await asyncio.shield(future)
+
+    def _dispatch(self):
+        if self._handle is not None:
+            self._handle.cancel()
+        batch, self._pending, self._handle = self._pending, {}, None
+        task = asyncio.get_running_loop().create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: dict):
+        try:
+            results = await run_db(self.lookup.fetch, list(batch))
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for key, future in batch.items():
+            if not future.done():
+                future.set_result(results[key])
+
+
+loaders = {name: Loader(lookup) for name, lookup in LOOKUPS.items()}
+
+
+async def load(name: str, key: int):
+    return await loaders[name].load(key)
@@ -1,58 +1,180 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from starlette.routing import Match
 from pydantic import BaseModel
 from typing import Optional, Any
 from datetime import datetime
-from db import get_cursor, get_connection
+from db import close_pool, run_db
+import schema
+import sqlbuilder
+from schema import SchemaError, get_table
+from pagination import PaginationError, parse_order_by, parse_fields, parse_limit, encode_cursor, decode_cursor, build_page_query
+from export import EXPORT_FORMATS, export_response
+from serialization import JSONBytesResponse, dumps, fetch_dicts, fetch_json
+import search
+import audit
+import batch
+import billing
+import buildings
+import cache
+import lookups
+import mviews
+import readiness
+import resident
+from meetings import SCOPES as MEETING_SCOPES, meetings_cache
+import metrics
+import profiler
+import slowlog
+from logconfig import get_logger
+import asyncio
+import logging
 import time
-import traceback
+
+log = get_logger("api")
 
 app = FastAPI()
 
+VALID_TABLES = ["budynek", "mieszkanie", "czlonek", "pracownik", "naprawa", "uslugi", "oplata", "umowa", "konto_spoldzielni", "spotkanie_mieszkancow"]
+
+
+# ==============================================================================
+# Funkcje pomocnicze
+# ==============================================================================
+
+def load_schema(cursor, conn):
+    return schema.refresh(cursor, VALID_TABLES)
+
+
+async def load_metadata():
+    try:
+        await run_db(load_schema)
+        log.info("Schema registry loaded", extra={"fields": {"source": schema.SOURCE}})
+    except Exception as e:
+        log.warning("Schema registry: using static metadata", extra={"fields": {"error": str(e)}})
+    try:
+        await run_db(mviews.load_status)
+    except Exception as e:
+        log.warning("Materialized view status unavailable", extra={"fields": {"error": str(e)}})
+
+
+def warm_statements() -> list:
+    # Domyslne listy tabel (/data/{table}) - parsowane na sesjach puli przy rozgrzewce
+    return [sqlbuilder.select(get_table(table)) for table in VALID_TABLES]
+
+
+# Cache odpowiedzi GET dla widokow i list tabel (cache.py)
+@app.middleware("http")
+async def response_cache_middleware(request: Request, call_next):
+    return await cache.response_cache.handle(request, call_next)
+
+
+# Stan widokow zmaterializowanych (X-MV-Staleness, X-MV-Refreshed-At) liczony przy
+# kazdej odpowiedzi - poza cache, wiec odpowiedz z cache nie niesie starego stanu
+MV_ROUTES = {
+    "/views/dashboard-stats": ("mv_dashboard_stats",),
+    "/views/zuzycie-per-budynek": ("mv_zuzycie_mediow",),
+}
+
+
+@app.middleware("http")
+async def mv_headers_middleware(request: Request, call_next):
+    response = await call_next(request)
+    views = MV_ROUTES.get(request.url.path)
+    if views is not None and response.status_code in (200, 304):
+        response.headers.update(mviews.state.headers(*views))
+    return response
+
+
+# Do konca rozgrzewki bazy (readiness.py) endpointy korzystajace z bazy odpowiadaja
+# 503 z Retry-After zamiast czekac na polaczenie; /health, /ready i /metrics dzialaja.
+# Odpowiedz 503 przechodzi przez CORS (dodany na koncu), a Retry-After jest w
+# expose_headers - frontend z innego originu widzi status i czas ponowienia
+@app.middleware("http")
+async def readiness_middleware(request: Request, call_next):
+    if readiness.state.ready or request.method == "OPTIONS" or readiness.exempt(request.url.path):
+        return await call_next(request)
+    return JSONResponse(status_code=503, content={"detail": "Baza danych nie jest jeszcze gotowa - sprobuj ponownie"},
+                        headers={"Retry-After": str(readiness.ReadinessConfig.RETRY_AFTER)})
+
+
+# Czas obslugi i liczba zadan per trasa (metrics.py); zdefiniowane po cache, wiec
+# jest zewnetrzne i obejmuje rowniez odpowiedzi z cache. Etykieta to szablon trasy
+# (/data/{table}), nie sciezka - liczba serii pozostaje ograniczona
+def route_template(request: Request) -> str:
+    route = request.scope.get("route")
+    if route is None:
+        # Odpowiedz z cache nie przechodzi przez router - szablon wyznaczany tutaj
+        route = next((r for r in app.router.routes if r.matches(request.scope)[0] == Match.FULL), None)
+    return route.path if route is not None else "unmatched"
+
+
+@app.middleware("http")
+async def metrics_middleware(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    slowlog.current_request.set(f"{request.method} {request.url.path}")
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = route_template(request)
+        metrics.http_latency.observe(time.perf_counter() - start, request.method, route)
+        metrics.http_requests.inc(request.method, route, str(status))
+
+
+# ?profile=1 lub naglowek X-Profile: 1 - zamiast odpowiedzi stosy z probkowania
+# (profiler.py) w formacie collapsed dla flamegraph.pl/speedscope; tresc odpowiedzi
+# jest odczytywana do konca, wiec profil obejmuje tez eksport strumieniowy
+@app.middleware("http")
+async def profile_middleware(request: Request, call_next):
+    if not profiler.requested(request):
+        return await call_next(request)
+    session = profiler.ProfileSession().start()
+    token = profiler.current.set(session)
+    try:
+        response = await call_next(request)
+        async for _ in response.body_iterator:
+            pass
+    finally:
+        profiler.current.reset(token)
+        session.stop()
+    return Response(session.collapsed(), media_type="text/plain; charset=utf-8",
+                    headers=session.headers(response.status_code))
+
+
+# CORS jako ostatni dodany, czyli zewnetrzny middleware: odpowiedzi budowane od nowa
+# przez cache, profiler i bramke gotowosci (503) tez dostaja naglowki CORS
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After"],
 )
 
-VALID_TABLES = ["budynek", "mieszkanie", "czlonek", "pracownik", "naprawa", "uslugi", "oplata", "umowa", "konto_spoldzielni", "spotkanie_mieszkancow"]
-
-
-# ==============================================================================
-# Funkcje pomocnicze
-# ==============================================================================
 
-def init_database():
-    max_retries = 30
-    for attempt in range(max_retries):
-        try:
-            conn = get_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM user_tables WHERE table_name = 'BUDYNEK'")
-            if cursor.fetchone()[0] > 0:
-                print("Database already initialized (BUDYNEK table exists)!")
-                cursor.close()
-                conn.close()
-                return
-            cursor.close()
-            conn.close()
-            if attempt < max_retries - 1:
-                print(f"Waiting for database schema... attempt {attempt + 1}/{max_retries}")
-                time.sleep(5)
-        except Exception as e:
-            if attempt < max_retries - 1:
-                print(f"Waiting for database connection... attempt {attempt + 1}/{max_retries}")
-                time.sleep(5)
-            else:
-                print(f"Database connection failed: {e}")
+def start_schedulers():
+    mviews.start_scheduler()
+    audit.start_scheduler()
 
 
+# Start nie czeka na baze: rozgrzewka w tle (readiness.py), harmonogramy MV
+# i archiwizacji audytu ruszaja po gotowosci bazy
 @app.on_event("startup")
 async def startup_event():
-    print("Starting application...")
-    init_database()
+    log.info("Starting application")
+    readiness.start(load_metadata, warm_statements, on_ready=start_schedulers)
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await readiness.stop()
+    await mviews.stop_scheduler()
+    await audit.stop_scheduler()
+    close_pool()
 
 
 def translate_oracle_error(error_msg: str) -> str:
@@ -81,11 +203,15 @@ def translate_oracle_error(error_msg: str) -> str:
         return "Nieprawidlowa nazwa kolumny."
     if "ORA-02449" in error_msg:
         return "Nie mozna usunac tabeli - istnieja klucze obce."
+    if "DPY-4005" in error_msg:
+        return "Baza danych jest przeciazona - sprobuj ponownie za chwile."
     if "constraint" in error_msg.lower():
         return "Operacja narusza reguly integralnosci danych."
     return f"Blad bazy danych: {error_msg[:200]}"
 
 
+# Wersja referencyjna (punkt odniesienia w bench/bench_serialization.py) - zapytania
+# korzystaja ze skompilowanych konwerterow z serialization.py
 def serialize_row(row: tuple, columns: list) -> dict:
     result = {}
     for col_name, value in zip(columns, row):
@@ -96,12 +222,32 @@ def serialize_row(row: tuple, columns: list) -> dict:
     return result
 
 
-def convert_date_value(key: str, value):
-    if value is None or value == '':
-        return None
-    if 'data' in key.lower() and isinstance(value, str) and '-' in value:
-        return datetime.strptime(value.split('T')[0], '%Y-%m-%d')
-    return value
+def fetch_all(cursor, conn, sql: str, params=None) -> list:
+    return fetch_dicts(cursor, sql, params)
+
+
+def mark_deleted(table: str, *ids):
+    # ON DELETE CASCADE usuwa tez wiersze tabel zaleznych - ich indeksy wyszukiwania
+    # sa przebudowywane, a odpowiedzi z cache uniewazniane
+    dependents = schema.dependents(table)
+    cache.invalidate(table, *dependents)
+    search.mark_changed(table, *ids)
+    for dependent in dependents:
+        search.mark_stale(dependent)
+
+
+def post_commit(table: str, hook, *args):
+    # Zapis jest juz zatwierdzony - blad odswiezenia indeksu wyszukiwania lub cache
+    # jest logowany i nie zamienia odpowiedzi w 500
+    try:
+        hook(*args)
+    except Exception as e:
+        log.warning("Post-commit hook failed", extra={"fields": {"table": table, "error": str(e)}})
+
+
+def check_export_format(export_format: Optional[str]):
+    if export_format is not None and export_format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Nieobslugiwany format eksportu: {export_format}")
 
 
 # ==============================================================================
@@ -119,6 +265,16 @@ class ResidentLoginRequest(BaseModel):
 class RecordData(BaseModel):
     data: dict[str, Any]
 
+class BatchRecords(BaseModel):
+    records: list[dict[str, Any]]
+
+class BatchIds(BaseModel):
+    ids: list[Any]
+
+class BillingRunRequest(BaseModel):
+    readings: list[dict[str, Any]]
+    data_naliczenia: Optional[str] = None
+
 class ProcedureRequest(BaseModel):
     procent: Optional[float] = None
     id_mieszkania: Optional[int] = None
@@ -159,30 +315,39 @@ class RepairRequest(BaseModel):
 # Interfejs: Panel Administratora -> wszystkie zakladki, Strona logowania
 # ==============================================================================
 
+# Sonda zycia: proces obsluguje zadania (bez zapytania do bazy)
 @app.get("/health")
 async def health_check():
     return {"status": "ok"}
 
 
+# Sonda gotowosci: rozgrzewka zakonczona i baza odpowiada na zapytanie kontrolne;
+# w tresci czasy startu, liczba prob polaczenia i czasy krokow rozgrzewki
+@app.get("/ready")
+async def ready_check():
+    result = await readiness.probe()
+    return JSONResponse(status_code=200 if result["status"] == "ready" else 503, content=result)
+
+
 # LAB 7: SELECT z WHERE - logowanie administratora
 # Interfejs: Strona logowania administratora
 @app.post("/login")
 async def login(req: LoginRequest):
+    def query(cursor, conn):
+        cursor.execute(
+            "SELECT id, login FROM uzytkownicy WHERE login = :1 AND haslo = :2",
+            [req.login, req.haslo]
+        )
+        row = cursor.fetchone()
+        if row:
+            return {"success": True, "user": {"id": row[0], "login": row[1]}}
+        raise HTTPException(status_code=401, detail="Nieprawidlowe dane logowania")
     try:
-        with get_cursor() as (cursor, conn):
-            cursor.execute(
-                "SELECT id, login FROM uzytkownicy WHERE login = :1 AND haslo = :2",
-                [req.login, req.haslo]
-            )
-            row = cursor.fetchone()
-            if row:
-                return {"success": True, "user": {"id": row[0], "login": row[1]}}
-            raise HTTPException(status_code=401, detail="Nieprawidlowe dane logowania")
+        return await run_db(query)
     except HTTPException:
         raise
     except Exception as e:
-        print(f"LOGIN ERROR: {e}")
-        traceback.print_exc()
+        log.exception("Login failed")
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
 
 
@@ -190,99 +355,189 @@ async def login(req: LoginRequest):
 # Interfejs: Portal Mieszkanca -> Strona logowania
 @app.post("/login/resident")
 async def login_resident(req: ResidentLoginRequest):
-    try:
-        with get_cursor() as (cursor, conn):
-            cursor.execute("""
-                SELECT c.id_czlonka, c.imie, c.nazwisko, c.email, m.id_mieszkania, m.numer, b.adres
-                FROM czlonek c
-                JOIN mieszkanie m ON c.id_mieszkania = m.id_mieszkania
-                JOIN budynek b ON m.id_budynku = b.id_budynku
-                WHERE LOWER(c.email) = LOWER(:1)
-                  AND m.numer = :2
-            """, [req.email, req.numer])
-            row = cursor.fetchone()
-            if row:
-                return {
-                    "success": True,
-                    "user": {
-                        "id": row[0], "imie": row[1], "nazwisko": row[2],
-                        "email": row[3], "apt_id": row[4], "apt_num": row[5], "adres": row[6]
-                    }
+    def query(cursor, conn):
+        cursor.execute("""
+            SELECT c.id_czlonka, c.imie, c.nazwisko, c.email, m.id_mieszkania, m.numer, b.adres
+            FROM czlonek c
+            JOIN mieszkanie m ON c.id_mieszkania = m.id_mieszkania
+            JOIN budynek b ON m.id_budynku = b.id_budynku
+            WHERE LOWER(c.email) = LOWER(:1)
+              AND m.numer = :2
+        """, [req.email, req.numer])
+        row = cursor.fetchone()
+        if row:
+            return {
+                "success": True,
+                "user": {
+                    "id": row[0], "imie": row[1], "nazwisko": row[2],
+                    "email": row[3], "apt_id": row[4], "apt_num": row[5], "adres": row[6]
                 }
-            raise HTTPException(status_code=401, detail="Nie znaleziono mieszkanca z podanym emailem i numerem mieszkania")
+            }
+        raise HTTPException(status_code=401, detail="Nie znaleziono mieszkanca z podanym emailem i numerem mieszkania")
+    try:
+        return await run_db(query)
     except HTTPException:
         raise
     except Exception as e:
-        print(f"LOGIN RESIDENT ERROR: {e}")
-        traceback.print_exc()
+        log.exception("Resident login failed")
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
 
 
-# LAB 8: SELECT z WHERE LIKE - wyszukiwanie tekstowe w tabeli
+# LAB 8: Wyszukiwanie tekstowe w tabeli - indeks odwrocony w pamieci (search.py)
+# z dopasowaniem prefiksow i wynikami uszeregowanymi wg trafnosci; z limit/offset
+# zwraca strone wynikow
 # Interfejs: Panel Administratora -> pole wyszukiwania w kazdej zakladce
 @app.get("/data/{table}/search")
-async def search_table_data(table: str, q: str = ""):
+async def search_table_data(table: str, q: str = "", limit: Optional[int] = None, offset: int = 0):
     if table not in VALID_TABLES:
         raise HTTPException(status_code=400, detail="Nieprawidlowa tabela")
     if not q or len(q) < 1:
-        return await get_table_data(table)
-    try:
-        with get_cursor() as (cursor, conn):
-            cursor.execute(f"SELECT * FROM {table} WHERE ROWNUM = 1")
-            columns = [col[0].lower() for col in cursor.description]
-            text_columns = []
-            for col in cursor.description:
-                if col[1] in (str, None) or 'VARCHAR' in str(col[1]).upper() or 'CHAR' in str(col[1]).upper():
-                    text_columns.append(col[0])
-            if not text_columns:
-                text_columns = [col[0] for col in cursor.description]
-            like_clauses = " OR ".join([f"UPPER({col}) LIKE UPPER(:search_term)" for col in text_columns])
-            sql = f"SELECT * FROM {table} WHERE {like_clauses}"
-            cursor.execute(sql, {"search_term": f"%{q}%"})
-            columns = [col[0].lower() for col in cursor.description]
-            rows = cursor.fetchall()
-            return [serialize_row(row, columns) for row in rows]
+        return await get_table_data(table, export_format=None)
+    try:
+        page_size = parse_limit(limit) if limit is not None else None
+    except PaginationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    offset = max(offset, 0)
+    def query(cursor, conn):
+        rows, total = search.search(cursor, table, q, page_size, offset)
+        if page_size is None:
+            return dumps(rows)
+        return dumps({"items": rows, "total": total, "limit": page_size, "offset": offset})
+    try:
+        return JSONBytesResponse(await run_db(query))
     except Exception as e:
-        print(f"SEARCH ERROR: {e}")
+        log.error("Search failed", extra={"fields": {"table": table, "error": str(e)}})
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
 
 
 # LAB 7: SELECT * - pobranie wszystkich rekordow z tabeli
+# Z parametrami limit/after/order_by/fields zwraca strone danych (stronicowanie keyset),
+# a z ?format=ndjson|csv strumieniuje cala tabele
 # Interfejs: Panel Administratora -> kazda zakladka z danymi
 @app.get("/data/{table}")
-async def get_table_data(table: str):
+async def get_table_data(table: str, limit: Optional[int] = None, after: Optional[str] = None,
+                         order_by: Optional[str] = None, fields: Optional[str] = None,
+                         export_format: Optional[str] = Query(None, alias="format")):
     if table not in VALID_TABLES:
         raise HTTPException(status_code=400, detail="Nieprawidlowa tabela")
+    check_export_format(export_format)
+    if export_format:
+        info = get_table(table)
+        try:
+            columns = parse_fields(info, fields, [])
+            order_column, descending = parse_order_by(info, order_by)
+        except PaginationError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        sql = sqlbuilder.select(info, columns, [(order_column, descending)])
+        return export_response(sql, None, export_format, table)
+    if limit is None and after is None and order_by is None and fields is None:
+        try:
+            return JSONBytesResponse(await run_db(fetch_json, sqlbuilder.select(get_table(table))))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
+    info = get_table(table)
+    try:
+        order_column, descending = parse_order_by(info, order_by)
+        columns = parse_fields(info, fields, [info.pk, order_column])
+        page_size = parse_limit(limit)
+        after_values = decode_cursor(info, order_column, after) if after else None
+    except PaginationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    sql, params = build_page_query(info, columns, order_column, descending, after_values, page_size)
+    def query(cursor, conn):
+        rows = fetch_dicts(cursor, sql, params)
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            last = rows[-1]
+            next_cursor = encode_cursor(last[order_column], last[info.pk])
+        return dumps({"items": rows, "next_cursor": next_cursor, "limit": page_size})
     try:
-        with get_cursor() as (cursor, conn):
-            cursor.execute(f"SELECT * FROM {table}")
-            columns = [col[0].lower() for col in cursor.description]
-            rows = cursor.fetchall()
-            return [serialize_row(row, columns) for row in rows]
+        return JSONBytesResponse(await run_db(query))
     except Exception as e:
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
 
 
+# LAB 7: Operacje wsadowe - wiele rekordow w jednym zadaniu (batch.py): executemany
+# z batcherrors, jeden commit na partie, bledy raportowane per rekord
+# Interfejs: import czlonkow, naliczanie oplat
+def batch_response(result: dict, total: int) -> dict:
+    errors = [{"index": index, "message": message} for index, message in result["errors"]]
+    return {
+        "success": not errors,
+        "processed": total,
+        "affected": result["affected"],
+        "committed": result["committed"],
+        "errors": errors,
+    }
+
+
+async def run_batch(table: str, prepare, items: list, count_rows: bool, atomic: bool, after_commit) -> dict:
+    if table not in VALID_TABLES:
+        raise HTTPException(status_code=400, detail="Nieprawidlowa tabela")
+    try:
+        batch.check_size(len(items))
+    except batch.BatchError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    groups, errors = prepare(get_table(table), items)
+    def query(cursor, conn):
+        result = batch.execute(cursor, conn, groups, errors, count_rows, atomic, translate_oracle_error)
+        if result["committed"]:
+            post_commit(table, cache.invalidate, table)
+            post_commit(table, after_commit, batch.applied_keys(groups, result))
+        return batch_response(result, len(items))
+    try:
+        return await run_db(query)
+    except Exception as e:
+        log.error("Batch failed", extra={"fields": {"table": table, "error": str(e)}})
+        raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
+
+
+@app.post("/data/{table}/batch")
+async def insert_records_batch(table: str, body: BatchRecords, atomic: bool = False):
+    return await run_batch(table, batch.prepare_insert, body.records, False, atomic,
+                           lambda keys: search.mark_appended(table))
+
+
+@app.put("/data/{table}/batch")
+async def update_records_batch(table: str, body: BatchRecords, atomic: bool = False):
+    return await run_batch(table, batch.prepare_update, body.records, True, atomic,
+                           lambda keys: search.mark_changed(table, *keys))
+
+
+@app.delete("/data/{table}/batch")
+async def delete_records_batch(table: str, body: BatchIds, atomic: bool = False):
+    return await run_batch(table, batch.prepare_delete, body.ids, True, atomic,
+                           lambda keys: mark_deleted(table, *keys))
+
+
 # LAB 7: INSERT - dodawanie nowego rekordu do tabeli
 # Interfejs: Panel Administratora -> kazda zakladka -> przycisk Dodaj
 @app.post("/data/{table}")
 async def insert_record(table: str, record: RecordData):
     if table not in VALID_TABLES:
         raise HTTPException(status_code=400, detail="Nieprawidlowa tabela")
+    info = get_table(table)
     try:
-        with get_cursor() as (cursor, conn):
-            data = {k: convert_date_value(k, v) for k, v in record.data.items()}
-            data = {k: v for k, v in data.items() if v is not None or 'data' not in k.lower()}
-            columns = list(data.keys())
-            placeholders = [f":{i+1}" for i in range(len(columns))]
-            values = list(data.values())
-            sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(placeholders)})"
-            print(f"SQL: {sql}, VALUES: {values}")
-            cursor.execute(sql, values)
-            conn.commit()
-            return {"success": True, "message": "Rekord dodany"}
+        data = info.convert_record(record.data)
+    except SchemaError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not data:
+        raise HTTPException(status_code=400, detail="Brak danych do zapisania")
+    sql = info.insert_sql(data)
+    def query(cursor, conn):
+        new_id = cursor.var(int)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("insert", extra={"fields": {"sql": sql, "columns": sorted(data)}})
+        cursor.execute(sql, {**info.binds(data), "new_id": new_id})
+        conn.commit()
+        post_commit(table, cache.invalidate, table)
+        post_commit(table, search.mark_changed, table, new_id.getvalue())
+        return {"success": True, "message": "Rekord dodany"}
+    try:
+        return await run_db(query)
     except Exception as e:
-        print(f"INSERT ERROR: {e}")
+        log.error("Insert failed", extra={"fields": {"table": table, "error": str(e)}})
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
 
 
@@ -292,20 +547,28 @@ async def insert_record(table: str, record: RecordData):
 async def update_record(table: str, id_field: str, id_value: str, record: RecordData):
     if table not in VALID_TABLES:
         raise HTTPException(status_code=400, detail="Nieprawidlowa tabela")
+    info = get_table(table)
+    try:
+        info.check_id_field(id_field)
+        key = info.convert_key(id_value)
+        data = info.convert_record(record.data, exclude=(info.pk,))
+    except SchemaError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not data:
+        raise HTTPException(status_code=400, detail="Brak danych do zapisania")
+    sql = info.update_sql(data)
+    def query(cursor, conn):
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("update", extra={"fields": {"sql": sql, "columns": sorted(data)}})
+        cursor.execute(sql, {**info.binds(data), "id_value": key})
+        conn.commit()
+        post_commit(table, cache.invalidate, table)
+        post_commit(table, search.mark_changed, table, key)
+        return {"success": True, "message": "Rekord zaktualizowany"}
     try:
-        with get_cursor() as (cursor, conn):
-            fk_fields = ['id_mieszkania', 'id_uslugi', 'id_pracownika', 'id_budynku']
-            data = {k: convert_date_value(k, v) for k, v in record.data.items() if not k.startswith('id_') or k in fk_fields}
-            data = {k: v for k, v in data.items() if v is not None or 'data' not in k.lower()}
-            set_clause = ", ".join([f"{k} = :{i+1}" for i, k in enumerate(data.keys())])
-            values = list(data.values()) + [id_value]
-            sql = f"UPDATE {table} SET {set_clause} WHERE {id_field} = :{len(values)}"
-            print(f"UPDATE SQL: {sql}, VALUES: {values}")
-            cursor.execute(sql, values)
-            conn.commit()
-            return {"success": True, "message": "Rekord zaktualizowany"}
+        return await run_db(query)
     except Exception as e:
-        print(f"UPDATE ERROR: {e}")
+        log.error("Update failed", extra={"fields": {"table": table, "error": str(e)}})
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
 
 
@@ -315,11 +578,19 @@ async def update_record(table: str, id_field: str, id_value: str, record: Record
 async def delete_record(table: str, id_field: str, id_value: str):
     if table not in VALID_TABLES:
         raise HTTPException(status_code=400, detail="Nieprawidlowa tabela")
+    info = get_table(table)
+    try:
+        info.check_id_field(id_field)
+        key = info.convert_key(id_value)
+    except SchemaError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    def query(cursor, conn):
+        cursor.execute(info.delete_sql(), {"id_value": key})
+        conn.commit()
+        post_commit(table, mark_deleted, table, key)
+        return {"success": True, "message": "Rekord usuniety"}
     try:
-        with get_cursor() as (cursor, conn):
-            cursor.execute(f"DELETE FROM {table} WHERE {id_field} = :1", [id_value])
-            conn.commit()
-            return {"success": True, "message": "Rekord usuniety"}
+        return await run_db(query)
     except Exception as e:
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
 
@@ -329,89 +600,99 @@ async def delete_record(table: str, id_field: str, id_value: str):
 # Interfejs: Panel Administratora -> Raporty, Pulpit Glowny
 # ==============================================================================
 
+# LAB 8: Sekcje raportu zbiorczego - niezalezne zapytania wykonywane rownolegle
+# na osobnych sesjach z puli; liczniki tabel pobierane jednym zapytaniem
+SUMMARY_STATS_TABLES = ['budynek', 'mieszkanie', 'czlonek', 'pracownik', 'naprawa', 'oplata', 'umowa']
+
+SUMMARY_COUNTS_SQL = "SELECT " + ", ".join(
+    [f"(SELECT COUNT(*) FROM {table}) AS {table}" for table in SUMMARY_STATS_TABLES]
+    + ["(SELECT COUNT(*) FROM oplata WHERE status_oplaty IN ('nieoplacone', 'zaleglosc')) AS zaleglosci"]
+) + " FROM DUAL"
+
+
+def summary_services(cursor, conn):
+    cursor.execute("""
+        SELECT 
+            u.nazwa_uslugi,
+            u.jednostka_miary,
+            NVL(SUM(o.zuzycie), 0) as total_zuzycie,
+            NVL(SUM(o.kwota), 0) as total_kwota
+        FROM uslugi u
+        LEFT JOIN oplata o ON u.id_uslugi = o.id_uslugi
+        GROUP BY u.id_uslugi, u.nazwa_uslugi, u.jednostka_miary
+        ORDER BY total_kwota DESC
+    """)
+    return [{
+        "nazwa_uslugi": row[0],
+        "jednostka_miary": row[1] or "szt",
+        "total_zuzycie": float(row[2]) if row[2] else 0,
+        "total_kwota": float(row[3]) if row[3] else 0
+    } for row in cursor.fetchall()]
+
+
+def summary_counts(cursor, conn):
+    cursor.execute(SUMMARY_COUNTS_SQL)
+    row = cursor.fetchone()
+    table_stats = dict(zip(SUMMARY_STATS_TABLES, row))
+    return table_stats, row[len(SUMMARY_STATS_TABLES)]
+
+
+def summary_unpaid(cursor, conn):
+    cursor.execute("""
+        SELECT 
+            b.adres, m.numer as numer_mieszkania, u.nazwa_uslugi, o.kwota, o.data_naliczenia
+        FROM oplata o
+        JOIN mieszkanie m ON o.id_mieszkania = m.id_mieszkania
+        JOIN budynek b ON m.id_budynku = b.id_budynku
+        LEFT JOIN uslugi u ON o.id_uslugi = u.id_uslugi
+        WHERE o.status_oplaty IN ('nieoplacone', 'zaleglosc')
+        ORDER BY o.kwota DESC
+        FETCH FIRST 50 ROWS ONLY
+    """)
+    return [{
+        "adres": row[0], "numer_mieszkania": row[1], "nazwa_uslugi": row[2] or "Inne",
+        "kwota": float(row[3]) if row[3] else 0,
+        "data_platnosci": row[4].strftime("%Y-%m-%d") if row[4] else None
+    } for row in cursor.fetchall()]
+
+
+async def timed_section(timings: dict, name: str, func, *args):
+    start = time.perf_counter()
+    try:
+        return await run_db(func, *args)
+    finally:
+        timings[name] = round((time.perf_counter() - start) * 1000, 1)
+
+
 # LAB 8: Raport zbiorczy z agregacja (GROUP BY, SUM, COUNT, JOIN)
 # Interfejs: Panel Administratora -> Raporty -> Podsumowanie
 @app.get("/reports/summary")
 async def get_summary_report():
+    timings = {}
+    start = time.perf_counter()
     try:
-        with get_cursor() as (cursor, conn):
-            cursor.execute("""
-                SELECT 
-                    u.nazwa_uslugi,
-                    u.jednostka_miary,
-                    NVL(SUM(o.zuzycie), 0) as total_zuzycie,
-                    NVL(SUM(o.kwota), 0) as total_kwota
-                FROM uslugi u
-                LEFT JOIN oplata o ON u.id_uslugi = o.id_uslugi
-                GROUP BY u.id_uslugi, u.nazwa_uslugi, u.jednostka_miary
-                ORDER BY total_kwota DESC
-            """)
-            
-            services_summary = []
-            total_revenue = 0
-            for row in cursor.fetchall():
-                services_summary.append({
-                    "nazwa_uslugi": row[0],
-                    "jednostka_miary": row[1] or "szt",
-                    "total_zuzycie": float(row[2]) if row[2] else 0,
-                    "total_kwota": float(row[3]) if row[3] else 0
-                })
-                total_revenue += float(row[3]) if row[3] else 0
-            
-            cursor.execute("SELECT COUNT(*) FROM czlonek")
-            members_count = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM oplata WHERE status_oplaty IN ('nieoplacone', 'zaleglosc')")
-            arrears_count = cursor.fetchone()[0]
-            
-            cursor.execute("""
-                SELECT 
-                    b.adres, m.numer as numer_mieszkania, u.nazwa_uslugi, o.kwota, o.data_naliczenia
-                FROM oplata o
-                JOIN mieszkanie m ON o.id_mieszkania = m.id_mieszkania
-                JOIN budynek b ON m.id_budynku = b.id_budynku
-                LEFT JOIN uslugi u ON o.id_uslugi = u.id_uslugi
-                WHERE o.status_oplaty IN ('nieoplacone', 'zaleglosc')
-                ORDER BY o.kwota DESC
-                FETCH FIRST 50 ROWS ONLY
-            """)
-            unpaid_details = []
-            for row in cursor.fetchall():
-                unpaid_details.append({
-                    "adres": row[0], "numer_mieszkania": row[1], "nazwa_uslugi": row[2] or "Inne",
-                    "kwota": float(row[3]) if row[3] else 0,
-                    "data_platnosci": row[4].strftime("%Y-%m-%d") if row[4] else None
-                })
-            
-            table_stats = {}
-            for table in ['budynek', 'mieszkanie', 'czlonek', 'pracownik', 'naprawa', 'oplata', 'umowa']:
-                try:
-                    count = cursor.callfunc("policz_rekordy", int, [table])
-                    table_stats[table] = count
-                except:
-                    table_stats[table] = 0
-            
-            cursor.execute("SELECT * FROM v_oplaty_summary ORDER BY suma_oplat DESC FETCH FIRST 10 ROWS ONLY")
-            cols = [col[0].lower() for col in cursor.description]
-            apartments_summary = [serialize_row(row, cols) for row in cursor.fetchall()]
-            
-            cursor.execute("SELECT * FROM v_naprawy_status")
-            cols = [col[0].lower() for col in cursor.description]
-            repairs_status = [serialize_row(row, cols) for row in cursor.fetchall()]
-            
-            return {
-                "services_summary": services_summary,
-                "total_revenue": total_revenue,
-                "members_count": members_count,
-                "arrears_count": arrears_count,
-                "unpaid_details": unpaid_details,
-                "table_stats": table_stats,
-                "apartments_summary": apartments_summary,
-                "repairs_status": repairs_status
-            }
+        services_summary, (table_stats, arrears_count), unpaid_details, apartments_summary, repairs_status = await asyncio.gather(
+            timed_section(timings, "services", summary_services),
+            timed_section(timings, "counts", summary_counts),
+            timed_section(timings, "unpaid", summary_unpaid),
+            timed_section(timings, "apartments", fetch_all, "SELECT * FROM v_oplaty_summary ORDER BY suma_oplat DESC FETCH FIRST 10 ROWS ONLY"),
+            timed_section(timings, "repairs", fetch_all, "SELECT * FROM v_naprawy_status"),
+        )
     except Exception as e:
-        print(f"REPORT ERROR: {e}")
+        log.error("Report failed", extra={"fields": {"error": str(e)}})
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
+    timings["total"] = round((time.perf_counter() - start) * 1000, 1)
+    return {
+        "services_summary": services_summary,
+        "total_revenue": sum(service["total_kwota"] for service in services_summary),
+        "members_count": table_stats["czlonek"],
+        "arrears_count": arrears_count,
+        "unpaid_details": unpaid_details,
+        "table_stats": table_stats,
+        "apartments_summary": apartments_summary,
+        "repairs_status": repairs_status,
+        "timings_ms": timings
+    }
 
 
 # ==============================================================================
@@ -424,10 +705,7 @@ async def get_summary_report():
 @app.get("/views/mieszkania-info")
 async def get_mieszkania_info():
     try:
-        with get_cursor() as (cursor, conn):
-            cursor.execute("SELECT * FROM v_mieszkania_info")
-            columns = [col[0].lower() for col in cursor.description]
-            return [serialize_row(row, columns) for row in cursor.fetchall()]
+        return JSONBytesResponse(await run_db(fetch_json, "SELECT * FROM v_mieszkania_info"))
     except Exception as e:
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
 
@@ -437,10 +715,7 @@ async def get_mieszkania_info():
 @app.get("/views/oplaty-summary")
 async def get_oplaty_summary():
     try:
-        with get_cursor() as (cursor, conn):
-            cursor.execute("SELECT * FROM v_oplaty_summary")
-            columns = [col[0].lower() for col in cursor.description]
-            return [serialize_row(row, columns) for row in cursor.fetchall()]
+        return JSONBytesResponse(await run_db(fetch_json, "SELECT * FROM v_oplaty_summary"))
     except Exception as e:
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
 
@@ -450,10 +725,7 @@ async def get_oplaty_summary():
 @app.get("/views/naprawy-status")
 async def get_naprawy_status():
     try:
-        with get_cursor() as (cursor, conn):
-            cursor.execute("SELECT * FROM v_naprawy_status")
-            columns = [col[0].lower() for col in cursor.description]
-            return [serialize_row(row, columns) for row in cursor.fetchall()]
+        return JSONBytesResponse(await run_db(fetch_json, "SELECT * FROM v_naprawy_status"))
     except Exception as e:
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
 
@@ -463,26 +735,29 @@ async def get_naprawy_status():
 @app.get("/views/dashboard-stats")
 async def get_dashboard_stats():
     try:
-        with get_cursor() as (cursor, conn):
-            cursor.execute("SELECT * FROM mv_dashboard_stats")
-            columns = [col[0].lower() for col in cursor.description]
-            rows = cursor.fetchall()
-            if rows:
-                return serialize_row(rows[0], columns)
-            return {}
+        rows = await run_db(fetch_all, "SELECT * FROM mv_dashboard_stats")
+        return JSONBytesResponse(rows[0] if rows else {})
     except Exception as e:
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
 
 
 # LAB 9: Widok zmaterializowany mv_zuzycie_mediow - zuzycie per budynek
 # Interfejs: Panel Administratora -> Raporty -> Statystyki mediow
+# Widok agreguje tylko istniejace oplaty (REFRESH FAST); adres i budynki bez
+# oplat dolaczane sa tutaj
+ZUZYCIE_SQL = """
+    SELECT b.id_budynku, b.adres, z.nazwa_uslugi,
+           NVL(z.suma_zuzycia, 0) AS suma_zuzycia, NVL(z.suma_kwot, 0) AS suma_kwot
+    FROM budynek b
+    LEFT JOIN mv_zuzycie_mediow z ON z.id_budynku = b.id_budynku
+    ORDER BY b.id_budynku, z.nazwa_uslugi
+"""
+
+
 @app.get("/views/zuzycie-per-budynek")
 async def get_zuzycie_per_budynek():
     try:
-        with get_cursor() as (cursor, conn):
-            cursor.execute("SELECT * FROM mv_zuzycie_mediow ORDER BY id_budynku, nazwa_uslugi")
-            columns = [col[0].lower() for col in cursor.description]
-            return [serialize_row(row, columns) for row in cursor.fetchall()]
+        return JSONBytesResponse(await run_db(fetch_json, ZUZYCIE_SQL))
     except Exception as e:
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
 
@@ -492,10 +767,18 @@ async def get_zuzycie_per_budynek():
 @app.post("/views/refresh-mv")
 async def refresh_materialized_views():
     try:
-        with get_cursor() as (cursor, conn):
-            cursor.execute("BEGIN DBMS_MVIEW.REFRESH('MV_ZUZYCIE_MEDIOW'); END;")
-            conn.commit()
-            return {"success": True, "message": "Widoki zmaterializowane odswiezone"}
+        result = await run_db(mviews.refresh, "manual")
+        return {"success": True, "message": "Widoki zmaterializowane odswiezone", **result}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
+
+
+# Stan widokow zmaterializowanych (user_mviews) i harmonogramu odswiezania
+@app.get("/views/mv-status")
+async def get_mv_status():
+    try:
+        await run_db(mviews.load_status)
+        return mviews.state.snapshot()
     except Exception as e:
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
 
@@ -505,10 +788,7 @@ async def refresh_materialized_views():
 @app.get("/views/czlonek-bezpieczny")
 async def get_czlonek_bezpieczny():
     try:
-        with get_cursor() as (cursor, conn):
-            cursor.execute("SELECT * FROM v_czlonek_bezpieczny")
-            columns = [col[0].lower() for col in cursor.description]
-            return [serialize_row(row, columns) for row in cursor.fetchall()]
+        return JSONBytesResponse(await run_db(fetch_json, "SELECT * FROM v_czlonek_bezpieczny"))
     except Exception as e:
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
 
@@ -518,16 +798,13 @@ async def get_czlonek_bezpieczny():
 @app.get("/views/czlonek-pelne-dane/{id_czlonka}")
 async def get_czlonek_pelne_dane(id_czlonka: int):
     try:
-        with get_cursor() as (cursor, conn):
-            cursor.execute("""
-                SELECT id_czlonka, imie, nazwisko, email, data_przystapienia, pesel, telefon
-                FROM v_czlonek_bezpieczny WHERE id_czlonka = :1
-            """, [id_czlonka])
-            columns = [col[0].lower() for col in cursor.description]
-            row = cursor.fetchone()
-            if row:
-                return serialize_row(row, columns)
-            raise HTTPException(status_code=404, detail="Nie znaleziono czlonka")
+        rows = await run_db(fetch_all, """
+            SELECT id_czlonka, imie, nazwisko, email, data_przystapienia, pesel, telefon
+            FROM v_czlonek_bezpieczny WHERE id_czlonka = :1
+        """, [id_czlonka])
+        if rows:
+            return rows[0]
+        raise HTTPException(status_code=404, detail="Nie znaleziono czlonka")
     except HTTPException:
         raise
     except Exception as e:
@@ -544,10 +821,7 @@ async def get_czlonek_pelne_dane(id_czlonka: int):
 @app.get("/views/pracownicy-naprawy")
 async def get_pracownicy_naprawy():
     try:
-        with get_cursor() as (cursor, conn):
-            cursor.execute("SELECT * FROM v_pracownicy_naprawy")
-            columns = [col[0].lower() for col in cursor.description]
-            return [serialize_row(row, columns) for row in cursor.fetchall()]
+        return JSONBytesResponse(await run_db(fetch_json, "SELECT * FROM v_pracownicy_naprawy"))
     except Exception as e:
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
 
@@ -555,12 +829,12 @@ async def get_pracownicy_naprawy():
 # LAB 10: FULL OUTER JOIN v_oplaty_uslugi_full - wszystkie oplaty i uslugi
 # Interfejs: Panel Administratora -> Raporty -> Oplaty i uslugi
 @app.get("/views/oplaty-uslugi-full")
-async def get_oplaty_uslugi_full():
+async def get_oplaty_uslugi_full(export_format: Optional[str] = Query(None, alias="format")):
+    check_export_format(export_format)
+    if export_format:
+        return export_response("SELECT * FROM v_oplaty_uslugi_full", None, export_format, "v_oplaty_uslugi_full")
     try:
-        with get_cursor() as (cursor, conn):
-            cursor.execute("SELECT * FROM v_oplaty_uslugi_full")
-            columns = [col[0].lower() for col in cursor.description]
-            return [serialize_row(row, columns) for row in cursor.fetchall()]
+        return JSONBytesResponse(await run_db(fetch_json, "SELECT * FROM v_oplaty_uslugi_full"))
     except Exception as e:
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
 
@@ -568,12 +842,12 @@ async def get_oplaty_uslugi_full():
 # LAB 10: CROSS JOIN v_budynki_uslugi_cross - wszystkie kombinacje
 # Interfejs: Panel Administratora -> Raporty -> Budynki x Uslugi
 @app.get("/views/budynki-uslugi-cross")
-async def get_budynki_uslugi_cross():
+async def get_budynki_uslugi_cross(export_format: Optional[str] = Query(None, alias="format")):
+    check_export_format(export_format)
+    if export_format:
+        return export_response("SELECT * FROM v_budynki_uslugi_cross", None, export_format, "v_budynki_uslugi_cross")
     try:
-        with get_cursor() as (cursor, conn):
-            cursor.execute("SELECT * FROM v_budynki_uslugi_cross")
-            columns = [col[0].lower() for col in cursor.description]
-            return [serialize_row(row, columns) for row in cursor.fetchall()]
+        return JSONBytesResponse(await run_db(fetch_json, "SELECT * FROM v_budynki_uslugi_cross"))
     except Exception as e:
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
 
@@ -583,10 +857,7 @@ async def get_budynki_uslugi_cross():
 @app.get("/views/pracownicy-koledzy")
 async def get_pracownicy_koledzy():
     try:
-        with get_cursor() as (cursor, conn):
-            cursor.execute("SELECT * FROM v_pracownicy_koledzy")
-            columns = [col[0].lower() for col in cursor.description]
-            return [serialize_row(row, columns) for row in cursor.fetchall()]
+        return JSONBytesResponse(await run_db(fetch_json, "SELECT * FROM v_pracownicy_koledzy"))
     except Exception as e:
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
 
@@ -596,10 +867,7 @@ async def get_pracownicy_koledzy():
 @app.get("/views/czlonkowie-pelne-info")
 async def get_czlonkowie_pelne_info():
     try:
-        with get_cursor() as (cursor, conn):
-            cursor.execute("SELECT * FROM v_czlonkowie_pelne_info")
-            columns = [col[0].lower() for col in cursor.description]
-            return [serialize_row(row, columns) for row in cursor.fetchall()]
+        return JSONBytesResponse(await run_db(fetch_json, "SELECT * FROM v_czlonkowie_pelne_info"))
     except Exception as e:
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
 
@@ -613,12 +881,14 @@ async def get_czlonkowie_pelne_info():
 # Interfejs: Narzedzia Administratora -> Zwieksz ceny
 @app.post("/procedures/increase-fees")
 async def call_increase_fees(req: ProcedureRequest):
+    def query(cursor, conn):
+        procent = req.procent if req.procent else 10
+        cursor.execute("BEGIN zwieksz_oplaty(:1); END;", [procent])
+        conn.commit()
+        cache.invalidate("uslugi")
+        return {"success": True, "message": f"Ceny uslug zwiekszone o {procent}%"}
     try:
-        with get_cursor() as (cursor, conn):
-            procent = req.procent if req.procent else 10
-            cursor.execute("BEGIN zwieksz_oplaty(:1); END;", [procent])
-            conn.commit()
-            return {"success": True, "message": f"Ceny uslug zwiekszone o {procent}%"}
+        return await run_db(query)
     except Exception as e:
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
 
@@ -627,14 +897,17 @@ async def call_increase_fees(req: ProcedureRequest):
 # Interfejs: Panel Administratora -> Czlonkowie -> Dodaj (przez procedure)
 @app.post("/procedures/dodaj-czlonka")
 async def proc_dodaj_czlonka(data: CzlonekCreate):
+    def query(cursor, conn):
+        out_id = cursor.var(int)
+        cursor.execute("""
+            BEGIN dodaj_czlonka(:1, :2, :3, :4, :5, :6, :7); END;
+        """, [data.id_mieszkania, data.imie, data.nazwisko, data.pesel, data.telefon, data.email, out_id])
+        conn.commit()
+        search.mark_changed("czlonek", out_id.getvalue())
+        cache.invalidate("czlonek")
+        return {"success": True, "id_czlonka": out_id.getvalue(), "message": "Czlonek dodany przez procedure DB"}
     try:
-        with get_cursor() as (cursor, conn):
-            out_id = cursor.var(int)
-            cursor.execute("""
-                BEGIN dodaj_czlonka(:1, :2, :3, :4, :5, :6, :7); END;
-            """, [data.id_mieszkania, data.imie, data.nazwisko, data.pesel, data.telefon, data.email, out_id])
-            conn.commit()
-            return {"success": True, "id_czlonka": out_id.getvalue(), "message": "Czlonek dodany przez procedure DB"}
+        return await run_db(query)
     except Exception as e:
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
 
@@ -643,14 +916,17 @@ async def proc_dodaj_czlonka(data: CzlonekCreate):
 # Interfejs: Panel Administratora -> Czlonkowie -> Edytuj (przez procedure)
 @app.put("/procedures/aktualizuj-czlonka/{id_czlonka}")
 async def proc_aktualizuj_czlonka(id_czlonka: int, data: CzlonekUpdate):
+    def query(cursor, conn):
+        out_rows = cursor.var(int)
+        cursor.execute("""
+            BEGIN aktualizuj_czlonka(:1, :2, :3, :4, :5, :6); END;
+        """, [id_czlonka, data.imie, data.nazwisko, data.telefon, data.email, out_rows])
+        conn.commit()
+        search.mark_changed("czlonek", id_czlonka)
+        cache.invalidate("czlonek")
+        return {"success": True, "rows_updated": out_rows.getvalue(), "message": "Czlonek zaktualizowany przez procedure DB"}
     try:
-        with get_cursor() as (cursor, conn):
-            out_rows = cursor.var(int)
-            cursor.execute("""
-                BEGIN aktualizuj_czlonka(:1, :2, :3, :4, :5, :6); END;
-            """, [id_czlonka, data.imie, data.nazwisko, data.telefon, data.email, out_rows])
-            conn.commit()
-            return {"success": True, "rows_updated": out_rows.getvalue(), "message": "Czlonek zaktualizowany przez procedure DB"}
+        return await run_db(query)
     except Exception as e:
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
 
@@ -659,12 +935,14 @@ async def proc_aktualizuj_czlonka(id_czlonka: int, data: CzlonekUpdate):
 # Interfejs: Panel Administratora -> Czlonkowie -> Usun (przez procedure)
 @app.delete("/procedures/usun-czlonka/{id_czlonka}")
 async def proc_usun_czlonka(id_czlonka: int):
+    def query(cursor, conn):
+        out_rows = cursor.var(int)
+        cursor.execute("BEGIN usun_czlonka(:1, :2); END;", [id_czlonka, out_rows])
+        conn.commit()
+        mark_deleted("czlonek", id_czlonka)
+        return {"success": True, "rows_deleted": out_rows.getvalue(), "message": "Czlonek usuniety przez procedure DB"}
     try:
-        with get_cursor() as (cursor, conn):
-            out_rows = cursor.var(int)
-            cursor.execute("BEGIN usun_czlonka(:1, :2); END;", [id_czlonka, out_rows])
-            conn.commit()
-            return {"success": True, "rows_deleted": out_rows.getvalue(), "message": "Czlonek usuniety przez procedure DB"}
+        return await run_db(query)
     except Exception as e:
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
 
@@ -673,12 +951,15 @@ async def proc_usun_czlonka(id_czlonka: int):
 # Interfejs: Portal Mieszkanca -> Zglos naprawe
 @app.post("/resident/repairs")
 async def submit_repair(req: RepairRequest):
+    def query(cursor, conn):
+        out_id = cursor.var(int)
+        cursor.execute("BEGIN zglos_naprawe(:1, :2, :3); END;", [req.id_mieszkania, req.opis, out_id])
+        conn.commit()
+        search.mark_changed("naprawa", out_id.getvalue())
+        cache.invalidate("naprawa")
+        return {"success": True, "id_naprawy": out_id.getvalue(), "message": "Zgloszenie przyjete"}
     try:
-        with get_cursor() as (cursor, conn):
-            out_id = cursor.var(int)
-            cursor.execute("BEGIN zglos_naprawe(:1, :2, :3); END;", [req.id_mieszkania, req.opis, out_id])
-            conn.commit()
-            return {"success": True, "id_naprawy": out_id.getvalue(), "message": "Zgloszenie przyjete"}
+        return await run_db(query)
     except Exception as e:
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
 
@@ -692,47 +973,145 @@ async def submit_repair(req: RepairRequest):
 # Interfejs: Narzedzia Administratora -> Nowa oplata
 @app.post("/procedures/add-fee")
 async def call_add_fee(req: ProcedureRequest):
+    if not req.id_mieszkania or not req.id_uslugi or not req.zuzycie:
+        return {"success": False, "message": "Wymagane: id_mieszkania, id_uslugi, zuzycie"}
+    def query(cursor, conn):
+        out_var = cursor.var(float)
+        cursor.execute("""
+            BEGIN :1 := dodaj_oplate_fn(:2, :3, :4); END;
+        """, [out_var, req.id_mieszkania, req.id_uslugi, req.zuzycie])
+        conn.commit()
+        search.mark_appended("oplata")
+        cache.invalidate("oplata")
+        kwota = out_var.getvalue()
+        return {"success": True, "message": f"Dodano oplate {kwota:.2f} PLN dla mieszkania {req.id_mieszkania}"}
+    try:
+        return await run_db(query)
+    except Exception as e:
+        log.error("Add fee failed", extra={"fields": {"error": str(e)}})
+        raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
+
+
+# Naliczanie zbiorcze (billing.py) - odczyty wszystkich mieszkan w jednym zadaniu
+# (JSON: {"readings": [...], "data_naliczenia": "RRRR-MM-DD"} lub CSV z naglowkiem
+# id_mieszkania,id_uslugi,zuzycie i opcjonalnym ?data_naliczenia=), kwoty liczone
+# jednym INSERT ... SELECT z uslugi, jeden commit
+# Interfejs: Narzedzia Administratora -> Naliczanie miesieczne
+@app.post("/billing/run")
+async def billing_run(request: Request, data_naliczenia: Optional[str] = None):
+    content_type = request.headers.get("content-type", "")
+    try:
+        if content_type.startswith(("text/csv", "text/plain")):
+            readings = billing.parse_csv((await request.body()).decode("utf-8"))
+        else:
+            try:
+                payload = BillingRunRequest(**await request.json())
+            except (ValueError, TypeError):
+                raise billing.BillingError("Oczekiwano JSON {\"readings\": [...]} lub pliku CSV")
+            readings = payload.readings
+            data_naliczenia = payload.data_naliczenia or data_naliczenia
+        run_date = billing.parse_date(data_naliczenia)
+        valid, errors = billing.validate(readings)
+    except (billing.BillingError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    def query(cursor, conn):
+        return billing.run(cursor, conn, valid, errors, run_date, translate_oracle_error)
     try:
-        with get_cursor() as (cursor, conn):
-            if not req.id_mieszkania or not req.id_uslugi or not req.zuzycie:
-                return {"success": False, "message": "Wymagane: id_mieszkania, id_uslugi, zuzycie"}
-            out_var = cursor.var(float)
-            cursor.execute("""
-                BEGIN :1 := dodaj_oplate_fn(:2, :3, :4); END;
-            """, [out_var, req.id_mieszkania, req.id_uslugi, req.zuzycie])
-            conn.commit()
-            kwota = out_var.getvalue()
-            return {"success": True, "message": f"Dodano oplate {kwota:.2f} PLN dla mieszkania {req.id_mieszkania}"}
+        result = await run_db(query)
     except Exception as e:
-        print(f"ADD-FEE ERROR: {e}")
+        log.error("Billing run failed", extra={"fields": {"error": str(e)}})
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
+    search.mark_appended("oplata")
+    cache.invalidate("oplata")
+    return {"readings": len(readings), **result}
 
 
 # LAB 11: Funkcja pobierz_czlonkow_budynku z CURSOR - lista czlonkow budynku
 # Interfejs: Panel Administratora -> Raporty -> Czlonkowie budynku
 @app.get("/functions/members-of-building/{building_id}")
 async def get_members_of_building(building_id: int):
+    def query(cursor, conn):
+        out_var = cursor.var(str)
+        cursor.execute("BEGIN :1 := pobierz_czlonkow_budynku(:2); END;", [out_var, building_id])
+        result = out_var.getvalue()
+        return {"building_id": building_id, "members": result or "Brak czlonkow"}
+    try:
+        return await run_db(query)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
+
+
+# Raporty budynkow (buildings.py): czlonkowie i statystyki jako JSON ze
+# stronicowaniem keyset (limit, after) - jeden budynek albo wszystkie, jedno
+# zapytanie na strone zamiast tekstu z pobierz_czlonkow_budynku/statystyki_budynku
+# Interfejs: Panel Administratora -> Raporty -> Budynki
+async def buildings_page(func, *args, limit: Optional[int] = None) -> dict:
+    try:
+        page_size = parse_limit(limit)
+    except PaginationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        return await run_db(func, *args, page_size)
+    except buildings.BuildingsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
+
+
+async def check_building(id_budynku: int):
     try:
-        with get_cursor() as (cursor, conn):
-            out_var = cursor.var(str)
-            cursor.execute("BEGIN :1 := pobierz_czlonkow_budynku(:2); END;", [out_var, building_id])
-            result = out_var.getvalue()
-            return {"building_id": building_id, "members": result or "Brak czlonkow"}
+        exists = await run_db(buildings.building_exists, id_budynku)
     except Exception as e:
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
+    if not exists:
+        raise HTTPException(status_code=404, detail=f"Nie znaleziono budynku o ID: {id_budynku}")
+
+
+@app.get("/buildings/members")
+async def get_buildings_members(building_id: Optional[int] = None, limit: Optional[int] = None,
+                                after: Optional[str] = None):
+    return await buildings_page(buildings.members_page, building_id, after, limit=limit)
+
+
+@app.get("/buildings/stats")
+async def get_buildings_stats(ids: Optional[str] = None, limit: Optional[int] = None, after: Optional[str] = None):
+    try:
+        building_ids = buildings.parse_ids(ids)
+    except buildings.BuildingsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return await buildings_page(buildings.stats_page, building_ids, after, limit=limit)
+
+
+@app.get("/buildings/{id_budynku}/members")
+async def get_building_members(id_budynku: int, limit: Optional[int] = None, after: Optional[str] = None):
+    page = await buildings_page(buildings.members_page, id_budynku, after, limit=limit)
+    if not page["items"] and not after:
+        await check_building(id_budynku)
+    return page
+
+
+@app.get("/buildings/{id_budynku}/stats")
+async def get_building_stats(id_budynku: int):
+    page = await buildings_page(buildings.stats_page, [id_budynku], None, limit=1)
+    if not page["items"]:
+        raise HTTPException(status_code=404, detail=f"Nie znaleziono budynku o ID: {id_budynku}")
+    return page["items"][0]
 
 
 # LAB 11: Funkcja dodaj_spotkanie - dodaje spotkanie z uzyciem SEQUENCE
 # Interfejs: Panel Administratora -> Spotkania -> Dodaj
 @app.post("/functions/dodaj-spotkanie")
 async def func_dodaj_spotkanie(data: SpotkanieCreate):
+    def query(cursor, conn):
+        data_spotkania = datetime.strptime(data.data, '%Y-%m-%d') if data.data else None
+        out_id = cursor.var(int)
+        cursor.execute("BEGIN :1 := dodaj_spotkanie(:2, :3, :4); END;", [out_id, data.temat, data.miejsce, data_spotkania])
+        conn.commit()
+        search.mark_changed("spotkanie_mieszkancow", out_id.getvalue())
+        cache.invalidate("spotkanie_mieszkancow")
+        return {"success": True, "id_spotkania": out_id.getvalue(), "message": "Spotkanie dodane z uzyciem SEQUENCE"}
     try:
-        with get_cursor() as (cursor, conn):
-            data_spotkania = datetime.strptime(data.data, '%Y-%m-%d') if data.data else None
-            out_id = cursor.var(int)
-            cursor.execute("BEGIN :1 := dodaj_spotkanie(:2, :3, :4); END;", [out_id, data.temat, data.miejsce, data_spotkania])
-            conn.commit()
-            return {"success": True, "id_spotkania": out_id.getvalue(), "message": "Spotkanie dodane z uzyciem SEQUENCE"}
+        return await run_db(query)
     except Exception as e:
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
 
@@ -741,12 +1120,14 @@ async def func_dodaj_spotkanie(data: SpotkanieCreate):
 # Interfejs: Panel Administratora -> Konta -> Aktualizuj saldo
 @app.put("/functions/aktualizuj-saldo/{id_konta}")
 async def func_aktualizuj_saldo(id_konta: int, nowe_saldo: float):
+    def query(cursor, conn):
+        out_rows = cursor.var(int)
+        cursor.execute("BEGIN :1 := aktualizuj_saldo_konta(:2, :3); END;", [out_rows, id_konta, nowe_saldo])
+        conn.commit()
+        cache.invalidate("konto_spoldzielni")
+        return {"success": True, "rows_updated": out_rows.getvalue(), "message": f"Saldo konta {id_konta} zaktualizowane"}
     try:
-        with get_cursor() as (cursor, conn):
-            out_rows = cursor.var(int)
-            cursor.execute("BEGIN :1 := aktualizuj_saldo_konta(:2, :3); END;", [out_rows, id_konta, nowe_saldo])
-            conn.commit()
-            return {"success": True, "rows_updated": out_rows.getvalue(), "message": f"Saldo konta {id_konta} zaktualizowane"}
+        return await run_db(query)
     except Exception as e:
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
 
@@ -758,41 +1139,63 @@ async def func_aktualizuj_saldo(id_konta: int, nowe_saldo: float):
 
 # LAB 12: Pakiet coop_pkg.suma_oplat_mieszkania - suma oplat dla mieszkania
 # Interfejs: Portal Mieszkanca, Panel Administratora -> Raporty
+# Rownolegle zadania o rozne mieszkania lacza sie w jedno zapytanie (lookups.py)
 @app.get("/functions/apartment-fees/{apt_id}")
 async def get_apartment_fees(apt_id: int):
     try:
-        with get_cursor() as (cursor, conn):
-            out_var = cursor.var(float)
-            cursor.execute("BEGIN :1 := coop_pkg.suma_oplat_mieszkania(:2); END;", [out_var, apt_id])
-            return {"apartment_id": apt_id, "total_fees": out_var.getvalue() or 0}
+        return {"apartment_id": apt_id, "total_fees": await lookups.load("apartment_fees", apt_id)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
+
+
+# Wyszukiwania wsadowe (lookups.py): ?ids=1,2,3 -> {"results": {id: wynik}} z jednego
+# zapytania GROUP BY / IN zamiast wywolania funkcji pakietu per ID
+async def batch_lookup(name: str, ids: str) -> dict:
+    try:
+        keys = lookups.parse_ids(ids)
+    except lookups.LookupsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        return {"results": await lookups.fetch_many(name, keys)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
 
 
+# Interfejs: Panel Administratora -> Raporty (zestawienia wielu mieszkan)
+@app.get("/functions/apartment-fees")
+async def get_apartment_fees_batch(ids: str):
+    return await batch_lookup("apartment_fees", ids)
+
+
 # LAB 12: Pakiet coop_pkg.policz_naprawy_pracownika - liczba napraw pracownika
 # Interfejs: Panel Administratora -> Raporty -> Statystyki pracownikow
 @app.get("/functions/worker-repairs/{worker_id}")
 async def get_worker_repairs_count(worker_id: int):
     try:
-        with get_cursor() as (cursor, conn):
-            out_var = cursor.var(float)
-            cursor.execute("BEGIN :1 := coop_pkg.policz_naprawy_pracownika(:2); END;", [out_var, worker_id])
-            return {"worker_id": worker_id, "repairs_count": int(out_var.getvalue()) if out_var.getvalue() else 0}
+        return {"worker_id": worker_id, "repairs_count": await lookups.load("worker_repairs", worker_id)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
 
 
+@app.get("/functions/worker-repairs")
+async def get_worker_repairs_batch(ids: str):
+    return await batch_lookup("worker_repairs", ids)
+
+
 # LAB 12: Pakiet coop_crud_pkg.insert_budynek - dodanie budynku przez pakiet
 # Interfejs: Panel Administratora -> Budynki -> Dodaj (przez package)
 @app.post("/package/insert-budynek")
 async def pkg_insert_budynek(data: BudynekCreate):
+    def query(cursor, conn):
+        out_id = cursor.var(int)
+        cursor.execute("BEGIN coop_crud_pkg.insert_budynek(:1, :2, :3, :4); END;", 
+                      [data.adres, data.liczba_pieter, data.rok_budowy, out_id])
+        conn.commit()
+        search.mark_changed("budynek", out_id.getvalue())
+        cache.invalidate("budynek")
+        return {"success": True, "id_budynku": out_id.getvalue(), "message": "Budynek dodany przez package"}
     try:
-        with get_cursor() as (cursor, conn):
-            out_id = cursor.var(int)
-            cursor.execute("BEGIN coop_crud_pkg.insert_budynek(:1, :2, :3, :4); END;", 
-                          [data.adres, data.liczba_pieter, data.rok_budowy, out_id])
-            conn.commit()
-            return {"success": True, "id_budynku": out_id.getvalue(), "message": "Budynek dodany przez package"}
+        return await run_db(query)
     except Exception as e:
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
 
@@ -801,11 +1204,14 @@ async def pkg_insert_budynek(data: BudynekCreate):
 # Interfejs: Panel Administratora -> Budynki -> Edytuj (przez package)
 @app.put("/package/update-budynek/{id_budynku}")
 async def pkg_update_budynek(id_budynku: int, adres: str, liczba_pieter: int):
+    def query(cursor, conn):
+        cursor.execute("BEGIN coop_crud_pkg.update_budynek(:1, :2, :3); END;", [id_budynku, adres, liczba_pieter])
+        conn.commit()
+        search.mark_changed("budynek", id_budynku)
+        cache.invalidate("budynek")
+        return {"success": True, "message": f"Budynek {id_budynku} zaktualizowany przez package"}
     try:
-        with get_cursor() as (cursor, conn):
-            cursor.execute("BEGIN coop_crud_pkg.update_budynek(:1, :2, :3); END;", [id_budynku, adres, liczba_pieter])
-            conn.commit()
-            return {"success": True, "message": f"Budynek {id_budynku} zaktualizowany przez package"}
+        return await run_db(query)
     except Exception as e:
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
 
@@ -814,12 +1220,14 @@ async def pkg_update_budynek(id_budynku: int, adres: str, liczba_pieter: int):
 # Interfejs: Panel Administratora -> Budynki -> Usun (przez package)
 @app.delete("/package/delete-budynek/{id_budynku}")
 async def pkg_delete_budynek(id_budynku: int):
+    def query(cursor, conn):
+        out_deleted = cursor.var(int)
+        cursor.execute("BEGIN coop_crud_pkg.delete_budynek(:1, :2); END;", [id_budynku, out_deleted])
+        conn.commit()
+        mark_deleted("budynek", id_budynku)
+        return {"success": True, "rows_deleted": out_deleted.getvalue(), "message": "Budynek usuniety przez package"}
     try:
-        with get_cursor() as (cursor, conn):
-            out_deleted = cursor.var(int)
-            cursor.execute("BEGIN coop_crud_pkg.delete_budynek(:1, :2); END;", [id_budynku, out_deleted])
-            conn.commit()
-            return {"success": True, "rows_deleted": out_deleted.getvalue(), "message": "Budynek usuniety przez package"}
+        return await run_db(query)
     except Exception as e:
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
 
@@ -829,58 +1237,177 @@ async def pkg_delete_budynek(id_budynku: int):
 @app.get("/package/nazwisko-czlonka/{id_czlonka}")
 async def pkg_nazwisko_czlonka(id_czlonka: int):
     try:
-        with get_cursor() as (cursor, conn):
-            result = cursor.callfunc("coop_crud_pkg.pobierz_nazwisko_czlonka", str, [id_czlonka])
-            return {"id_czlonka": id_czlonka, "nazwisko": result}
+        return {"id_czlonka": id_czlonka, "nazwisko": await lookups.load("member_surname", id_czlonka)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
 
 
+@app.get("/package/nazwisko-czlonka")
+async def pkg_nazwisko_czlonka_batch(ids: str):
+    return await batch_lookup("member_surname", ids)
+
+
 # LAB 12: Pakiet coop_crud_pkg.pobierz_adres_budynku - z obsluga NO_DATA_FOUND
 # Interfejs: Panel Administratora -> Raporty
 @app.get("/package/adres-budynku/{id_budynku}")
 async def pkg_adres_budynku(id_budynku: int):
     try:
-        with get_cursor() as (cursor, conn):
-            result = cursor.callfunc("coop_crud_pkg.pobierz_adres_budynku", str, [id_budynku])
-            return {"id_budynku": id_budynku, "adres": result}
+        return {"id_budynku": id_budynku, "adres": await lookups.load("building_address", id_budynku)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
 
 
+@app.get("/package/adres-budynku")
+async def pkg_adres_budynku_batch(ids: str):
+    return await batch_lookup("building_address", ids)
+
+
 # LAB 12: Pakiet coop_crud_pkg.statystyki_budynku - statystyki budynku
 # Interfejs: Panel Administratora -> Raporty -> Statystyki budynku
 @app.get("/package/statystyki-budynku/{id_budynku}")
 async def pkg_statystyki_budynku(id_budynku: int):
     try:
-        with get_cursor() as (cursor, conn):
-            result = cursor.callfunc("coop_crud_pkg.statystyki_budynku", str, [id_budynku])
-            return {"id_budynku": id_budynku, "statystyki": result}
+        return {"id_budynku": id_budynku, "statystyki": await lookups.load("building_stats", id_budynku)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
 
 
+@app.get("/package/statystyki-budynku")
+async def pkg_statystyki_budynku_batch(ids: str):
+    return await batch_lookup("building_stats", ids)
+
+
 # ==============================================================================
 # LAB 13: TRIGGER - logi audytu z triggera trg_audit_czlonek
 # Interfejs: Narzedzia Administratora -> Historia zmian
 # ==============================================================================
 
 # LAB 13: Logi audytu - wyniki dzialania triggera AFTER INSERT/UPDATE/DELETE
+# Bez parametrow: 100 ostatnich wpisow (lista). Z since/until/member_id/limit/after/source
+# zwraca strone {items, next_cursor, limit}; wpisy zarchiwizowane (audit.py) sa
+# czytane razem z tabela (source=all), albo osobno (source=db|archive)
 # Interfejs: Narzedzia Administratora -> Historia zmian
 @app.get("/system/audit-logs")
-async def get_audit_logs():
-    try:
-        with get_cursor() as (cursor, conn):
-            cursor.execute("""
-                SELECT id_logu, id_czlonka, operacja, stare_dane, nowe_dane, data_zmiany
-                FROM log_zmian_czlonka
-                ORDER BY data_zmiany DESC
-                FETCH FIRST 100 ROWS ONLY
-            """)
-            columns = [col[0].lower() for col in cursor.description]
-            return [serialize_row(row, columns) for row in cursor.fetchall()]
+async def get_audit_logs(since: Optional[str] = None, until: Optional[str] = None,
+                         member_id: Optional[int] = None, limit: Optional[int] = None,
+                         after: Optional[str] = None, source: Optional[str] = None):
+    legacy = all(value is None for value in (since, until, member_id, limit, after, source))
+    try:
+        query = audit.Query(audit.parse_date(since, "since"), audit.parse_date(until, "until"), member_id,
+                            audit.decode_after(after), parse_limit(limit))
+        source = audit.parse_source(source)
+    except (audit.AuditError, PaginationError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        page = await run_db(audit.page, query, source)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
+    return JSONBytesResponse(page["items"] if legacy else page)
+
+
+# Retencja logow audytu: przeniesienie wpisow starszych niz AUDIT_RETENTION_DAYS
+# (lub ?before=) do archiwum gzip JSON lines; GET - stan i lista plikow archiwum
+# Interfejs: Narzedzia Administratora -> Historia zmian
+@app.post("/system/audit-logs/archive")
+async def archive_audit_logs(before: Optional[str] = None):
+    try:
+        cutoff = audit.parse_date(before, "before")
+    except audit.AuditError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        return await run_db(audit.archive, "manual", cutoff)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
+
+
+@app.get("/system/audit-logs/archive")
+async def get_audit_archive():
+    return audit.state.snapshot()
+
+
+# Statystyki cache odpowiedzi - trafienia/chybienia ogolem i per trasa
+# Interfejs: Narzedzia Administratora
+@app.get("/system/cache-stats")
+async def get_cache_stats():
+    return {**cache.response_cache.snapshot(), "meetings": meetings_cache.snapshot()}
+
+
+# Metryki w formacie tekstowym Prometheusa: zadania HTTP, czasy instrukcji SQL,
+# pula polaczen (db.py) oraz liczniki cache odpowiedzi, spotkan i instrukcji
+@metrics.registry.collector
+def cache_metrics():
+    samples = []
+    for name, source in (("response", cache.response_cache.stats), ("meetings", meetings_cache.stats),
+                         ("sqlbuilder", sqlbuilder.statements.snapshot())):
+        for event in ("hits", "misses", "loads", "evictions", "invalidations"):
+            if event in source:
+                samples.append(({"cache": name, "event": event}, source[event]))
+    return [("cache_events_total", "counter", "Zdarzenia cache aplikacji", samples)]
+
+
+@app.get("/metrics")
+async def get_metrics():
+    return Response(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+# Statystyki cache instrukcji: teksty SQL z sqlbuilder.py, rozmiar cache sterownika
+# na sesji oraz parsowanie po stronie Oracle (v$sysstat, wymaga uprawnien SELECT_CATALOG)
+# Interfejs: Narzedzia Administratora
+PARSE_STATS_SQL = """
+    SELECT name, value FROM v$sysstat
+    WHERE name IN ('parse count (total)', 'parse count (hard)', 'session cursor cache hits', 'execute count')
+"""
+
+
+@app.get("/system/statement-cache")
+async def get_statement_cache_stats():
+    def query(cursor, conn):
+        result = {"builder": sqlbuilder.statements.snapshot(), "stmtcachesize": conn.stmtcachesize}
+        try:
+            cursor.execute(PARSE_STATS_SQL)
+            stats = {name: value for name, value in cursor.fetchall()}
+        except Exception as e:
+            result["server"] = {"error": translate_oracle_error(str(e))}
+            return result
+        parses = stats.get("parse count (total)") or 0
+        result["server"] = {
+            **stats,
+            "hard_parse_ratio": round(stats.get("parse count (hard)", 0) / parses, 4) if parses else None,
+            "cursor_cache_hit_ratio": round(stats.get("session cursor cache hits", 0) / parses, 4) if parses else None,
+        }
+        return result
+    return await run_db(query)
+
+
+# Dziennik wolnych zapytan (slowlog.py): najnowsze instrukcje powyzej SLOW_QUERY_MS
+# z zamaskowanymi bindami, czasem, liczba wierszy i zadaniem HTTP
+# Interfejs: Narzedzia Administratora
+@app.get("/system/slow-queries")
+async def get_slow_queries(limit: int = Query(50, ge=1, le=slowlog.LOG_SIZE), min_ms: float = 0):
+    return {**slowlog.slow_queries.snapshot(), "entries": slowlog.slow_queries.entries(limit, min_ms)}
+
+
+@app.delete("/system/slow-queries")
+async def clear_slow_queries():
+    slowlog.slow_queries.clear()
+    return {"success": True}
+
+
+# Rejestr schematu (schema.py) - podglad i ponowne zaladowanie po zmianach DDL
+# Interfejs: Narzedzia Administratora
+@app.get("/system/schema")
+async def get_schema():
+    return schema.describe()
+
+
+@app.post("/system/schema/refresh")
+async def refresh_schema():
+    try:
+        result = await run_db(load_schema)
     except Exception as e:
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
+    search.reset()
+    return {"success": True, "source": result["source"], "tables": len(result["tables"])}
 
 
 # ==============================================================================
@@ -892,11 +1419,12 @@ async def get_audit_logs():
 # Interfejs: Narzedzia Administratora -> Statystyki tabel
 @app.get("/functions/count-records/{table_name}")
 async def count_records(table_name: str):
+    def query(cursor, conn):
+        out_var = cursor.var(int)
+        cursor.execute("BEGIN :1 := policz_rekordy(:2); END;", [out_var, table_name])
+        return {"table": table_name, "count": out_var.getvalue()}
     try:
-        with get_cursor() as (cursor, conn):
-            out_var = cursor.var(int)
-            cursor.execute("BEGIN :1 := policz_rekordy(:2); END;", [out_var, table_name])
-            return {"table": table_name, "count": out_var.getvalue()}
+        return await run_db(query)
     except Exception as e:
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
 
@@ -906,43 +1434,29 @@ async def count_records(table_name: str):
 # Interfejs: Portal Mieszkanca -> wszystkie zakladki
 # ==============================================================================
 
-# LAB 7 + LAB 12: Dane mieszkanca z uzyciem pakietu coop_pkg
+# Portal Mieszkanca - migawka mieszkania jednym round-tripem (resident.py):
+# oplaty, naprawy, umowy, nadchodzace spotkania (maks. `meetings`), zuzycie per
+# usluga oraz suma oplat i zaleglosci liczone z pobranych oplat
+# Interfejs: Portal Mieszkanca -> Pulpit (wszystkie zakladki)
+@app.get("/resident/snapshot/{apt_id}")
+async def get_resident_snapshot(apt_id: int, meetings: int = Query(resident.DEFAULT_MEETINGS, ge=1, le=resident.MAX_MEETINGS)):
+    try:
+        snapshot = await run_db(resident.fetch_snapshot, apt_id)
+        snapshot["spotkania"] = (await meetings_cache.get()).upcoming[:meetings]
+        return JSONBytesResponse(snapshot)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
+
+
+# LAB 7 + LAB 12: Dane mieszkanca (suma jak coop_pkg.suma_oplat_mieszkania)
 # Interfejs: Portal Mieszkanca -> Pulpit
 @app.get("/resident/my-data/{apt_id}")
 async def get_resident_data(apt_id: int):
     try:
-        with get_cursor() as (cursor, conn):
-            cursor.execute("""
-                SELECT id_oplaty, id_mieszkania, id_uslugi, kwota, data_naliczenia, status_oplaty, zuzycie
-                FROM oplata WHERE id_mieszkania = :1 ORDER BY data_naliczenia DESC
-            """, [apt_id])
-            cols_o = [col[0].lower() for col in cursor.description]
-            oplaty = [serialize_row(row, cols_o) for row in cursor.fetchall()]
-            
-            cursor.execute("""
-                SELECT id_naprawy, id_mieszkania, id_pracownika, opis, data_zgloszenia, status
-                FROM naprawa WHERE id_mieszkania = :1 ORDER BY data_zgloszenia DESC
-            """, [apt_id])
-            cols_n = [col[0].lower() for col in cursor.description]
-            naprawy = [serialize_row(row, cols_n) for row in cursor.fetchall()]
-            
-            cursor.execute("SELECT id_spotkania, temat, miejsce, data_spotkania FROM spotkanie_mieszkancow ORDER BY data_spotkania DESC")
-            cols_s = [col[0].lower() for col in cursor.description]
-            spotkania = [serialize_row(row, cols_s) for row in cursor.fetchall()]
-            
-            cursor.execute("""
-                SELECT id_umowy, id_mieszkania, id_czlonka, data_zawarcia, data_wygasniecia, typ_umowy
-                FROM umowa WHERE id_mieszkania = :1
-            """, [apt_id])
-            cols_u = [col[0].lower() for col in cursor.description]
-            umowy = [serialize_row(row, cols_u) for row in cursor.fetchall()]
-            
-            try:
-                suma_oplat = cursor.callfunc("coop_pkg.suma_oplat_mieszkania", float, [apt_id])
-            except:
-                suma_oplat = 0
-            
-            return {"oplaty": oplaty, "naprawy": naprawy, "spotkania": spotkania, "umowy": umowy, "suma_oplat": suma_oplat or 0}
+        snapshot = await run_db(resident.fetch_snapshot, apt_id)
+        # Pelna lista spotkan od najnowszych, jak przed wprowadzeniem /resident/snapshot
+        snapshot["spotkania"] = (await meetings_cache.get()).all
+        return JSONBytesResponse({key: snapshot[key] for key in ("oplaty", "naprawy", "spotkania", "umowy", "suma_oplat")})
     except Exception as e:
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
 
@@ -952,13 +1466,10 @@ async def get_resident_data(apt_id: int):
 @app.get("/resident/payments/{id_mieszkania}")
 async def get_resident_payments(id_mieszkania: int):
     try:
-        with get_cursor() as (cursor, conn):
-            cursor.execute("""
-                SELECT id_oplaty, nazwa_uslugi, kwota, zuzycie, jednostka_miary, data_naliczenia, status_oplaty
-                FROM v_moje_oplaty WHERE id_mieszkania = :1 ORDER BY data_naliczenia DESC
-            """, [id_mieszkania])
-            columns = [col[0].lower() for col in cursor.description]
-            return [serialize_row(row, columns) for row in cursor.fetchall()]
+        return JSONBytesResponse(await run_db(fetch_json, """
+            SELECT id_oplaty, nazwa_uslugi, kwota, zuzycie, jednostka_miary, data_naliczenia, status_oplaty
+            FROM v_moje_oplaty WHERE id_mieszkania = :1 ORDER BY data_naliczenia DESC
+        """, [id_mieszkania]))
     except Exception as e:
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
 
@@ -968,31 +1479,27 @@ async def get_resident_payments(id_mieszkania: int):
 @app.get("/resident/repairs/{id_mieszkania}")
 async def get_resident_repairs(id_mieszkania: int):
     try:
-        with get_cursor() as (cursor, conn):
-            cursor.execute("""
-                SELECT n.id_naprawy, n.opis, n.data_zgloszenia, n.data_wykonania, 
-                       n.status, p.imie || ' ' || p.nazwisko AS pracownik
-                FROM naprawa n LEFT JOIN pracownik p ON n.id_pracownika = p.id_pracownika
-                WHERE n.id_mieszkania = :1 ORDER BY n.data_zgloszenia DESC
-            """, [id_mieszkania])
-            columns = [col[0].lower() for col in cursor.description]
-            return [serialize_row(row, columns) for row in cursor.fetchall()]
+        return JSONBytesResponse(await run_db(fetch_json, """
+            SELECT n.id_naprawy, n.opis, n.data_zgloszenia, n.data_wykonania, 
+                   n.status, p.imie || ' ' || p.nazwisko AS pracownik
+            FROM naprawa n LEFT JOIN pracownik p ON n.id_pracownika = p.id_pracownika
+            WHERE n.id_mieszkania = :1 ORDER BY n.data_zgloszenia DESC
+        """, [id_mieszkania]))
     except Exception as e:
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
 
 
 # LAB 7: Nadchodzace spotkania z WHERE
 # Interfejs: Portal Mieszkanca -> Spotkania
+# Lista wspolna dla wszystkich mieszkancow - gotowy JSON z cache (meetings.py);
+# scope: upcoming (domyslnie, rosnaco), history (malejaco, bez daty na koncu),
+# all (malejaco, jak pelna lista w /resident/my-data)
 @app.get("/resident/meetings")
-async def get_upcoming_meetings():
-    try:
-        with get_cursor() as (cursor, conn):
-            cursor.execute("""
-                SELECT id_spotkania, temat, miejsce, data_spotkania
-                FROM spotkanie_mieszkancow WHERE data_spotkania >= SYSDATE ORDER BY data_spotkania ASC
-            """)
-            columns = [col[0].lower() for col in cursor.description]
-            return [serialize_row(row, columns) for row in cursor.fetchall()]
+async def get_upcoming_meetings(scope: str = "upcoming"):
+    if scope not in MEETING_SCOPES:
+        raise HTTPException(status_code=400, detail=f"Nieprawidlowy zakres: {scope}")
+    try:
+        return JSONBytesResponse((await meetings_cache.get()).json[scope])
     except Exception as e:
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
 
@@ -1002,16 +1509,13 @@ async def get_upcoming_meetings():
 @app.get("/resident/consumption/{id_mieszkania}")
 async def get_resident_consumption(id_mieszkania: int):
     try:
-        with get_cursor() as (cursor, conn):
-            cursor.execute("""
-                SELECT u.nazwa_uslugi, SUM(o.zuzycie) as zuzycie, u.jednostka_miary, SUM(o.kwota) as suma_kwot
-                FROM oplata o JOIN uslugi u ON o.id_uslugi = u.id_uslugi
-                WHERE o.id_mieszkania = :1
-                GROUP BY u.nazwa_uslugi, u.jednostka_miary
-                ORDER BY suma_kwot DESC
-            """, [id_mieszkania])
-            columns = [col[0].lower() for col in cursor.description]
-            return [serialize_row(row, columns) for row in cursor.fetchall()]
+        return JSONBytesResponse(await run_db(fetch_json, """
+            SELECT u.nazwa_uslugi, SUM(o.zuzycie) as zuzycie, u.jednostka_miary, SUM(o.kwota) as suma_kwot
+            FROM oplata o JOIN uslugi u ON o.id_uslugi = u.id_uslugi
+            WHERE o.id_mieszkania = :1
+            GROUP BY u.nazwa_uslugi, u.jednostka_miary
+            ORDER BY suma_kwot DESC
+        """, [id_mieszkania]))
     except Exception as e:
         raise HTTPException(status_code=500, detail=translate_oracle_error(str(e)))
 
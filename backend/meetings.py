@@ -0,0 +1,107 @@
+# Wspolny cache listy spotkan mieszkancow: lista jest taka sama dla wszystkich
+# mieszkancow, wiec jest czytana z bazy raz i trzymana w pamieci procesu razem z
+# gotowym JSON-em (nadchodzace / archiwalne). Wpis traci waznosc, gdy:
+#  - zapis do spotkanie_mieszkancow wywola cache.invalidate (dodaj-spotkanie, CRUD, batch),
+#  - minie data najblizszego spotkania (podzial liczony ponownie w pamieci, bez bazy),
+#  - minie MEETINGS_CACHE_TTL (zmiany wprowadzone poza aplikacja).
+# Rownolegle chybienia czekaja na jedno zapytanie (single-flight).
+import asyncio
+import os
+import time
+from datetime import datetime
+
+import cache
+from db import run_db
+from serialization import dumps, fetch_dicts, format_date
+
+TABLE = "spotkanie_mieszkancow"
+SCOPES = ("upcoming", "history", "all")
+MEETINGS_SQL = """
+    SELECT id_spotkania, temat, miejsce, data_spotkania
+    FROM spotkanie_mieszkancow
+    ORDER BY data_spotkania ASC, id_spotkania ASC
+"""
+
+
+class MeetingsConfig:
+    TTL = float(os.getenv("MEETINGS_CACHE_TTL", "300"))   # s; 0 = tylko uniewaznianie zapisami
+
+
+class MeetingsView:
+    # Podzial na nadchodzace (rosnaco) i archiwalne (malejaco) wg chwili `now`;
+    # spotkania bez daty nie sa nadchodzace (jak WHERE data_spotkania >= SYSDATE)
+    def __init__(self, rows: list, now: str):
+        dated = [row for row in rows if row["data_spotkania"] is not None]
+        undated = [row for row in rows if row["data_spotkania"] is None]
+        first_upcoming = next((i for i, row in enumerate(dated) if row["data_spotkania"] >= now), len(dated))
+        self.upcoming = dated[first_upcoming:]
+        self.history = dated[:first_upcoming][::-1] + undated
+        # Cala lista od najnowszych, bez daty na poczatku (ORDER BY data_spotkania DESC w Oracle)
+        self.all = undated + dated[::-1]
+        # Najblizsze spotkanie przechodzi do archiwum, gdy minie jego data
+        self.valid_until = self.upcoming[0]["data_spotkania"] if self.upcoming else None
+        self.json = {
+            "upcoming": dumps(self.upcoming),
+            "history": dumps(self.history),
+            "all": dumps(self.all),
+        }
+
+
+class MeetingsCache:
+    def __init__(self, ttl: float = MeetingsConfig.TTL):
+        self.ttl = ttl
+        self._rows = None
+        self._view = None
+        self._loaded_at = 0.0
+        self._generation = 0
+        self._lock = asyncio.Lock()
+        self.stats = {"hits": 0, "loads": 0, "resplits": 0, "invalidations": 0}
+
+    def invalidate(self, *tables):
+        self._generation += 1
+        self._rows = self._view = None
+        self.stats["invalidations"] += 1
+
+    def _fresh(self) -> bool:
+        return self._rows is not None and (self.ttl <= 0 or time.monotonic() - self._loaded_at < self.ttl)
+
+    def _current_view(self) -> MeetingsView:
+        now = format_date(datetime.now())
+        if self._view is None or (self._view.valid_until is not None and now > self._view.valid_until):
+            self._view = MeetingsView(self._rows, now)
+            self.stats["resplits"] += 1
+        return self._view
+
+    async def get(self) -> MeetingsView:
+        if self._fresh():
+            self.stats["hits"] += 1
+            return self._current_view()
+        async with self._lock:
+            if not self._fresh():
+                generation = self._generation
+                rows = await run_db(load)
+                self.stats["loads"] += 1
+                if generation != self._generation:
+                    # Zapis w trakcie odczytu - wynik moze byc nieaktualny, nie zapisujemy go
+                    return MeetingsView(rows, format_date(datetime.now()))
+                self._rows, self._view, self._loaded_at = rows, None, time.monotonic()
+            else:
+                self.stats["hits"] += 1
+            return self._current_view()
+
+    def snapshot(self) -> dict:
+        return {
+            "ttl_seconds": self.ttl,
+            "cached": self._rows is not None,
+            "meetings": len(self._rows) if self._rows is not None else None,
+            "valid_until": self._view.valid_until if self._view else None,
+            **self.stats,
+        }
+
+
+def load(cursor, conn) -> list:
+    return fetch_dicts(cursor, MEETINGS_SQL)
+
+
+meetings_cache = MeetingsCache()
+cache.on_invalidate(TABLE, meetings_cache.invalidate)
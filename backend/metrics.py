@@ -0,0 +1,276 @@
+# Metryki w formacie tekstowym Prometheusa (GET /metrics), bez zaleznosci
+# zewnetrznych: liczniki i histogramy z etykietami, czas odpowiedzi per trasa
+# (middleware w main.py) oraz instrumentacja kursora bazy - czas execute i fetch,
+# liczba wierszy per instrukcja i czas oczekiwania na sesje z puli (db.get_cursor).
+# Etykieta instrukcji to "OPERACJA tabela" (np. "SELECT oplata"), a nie pelny
+# tekst SQL - liczba serii pozostaje ograniczona. Ten sam kursor zasila dziennik
+# wolnych zapytan (slowlog.py). METRICS_ENABLED=0 razem z SLOW_QUERY_MS<0 wylacza
+# instrumentacje kursora (zwracany jest surowy kursor sterownika).
+import os
+import re
+import time
+from bisect import bisect_left
+from threading import Lock
+
+from slowlog import slow_queries
+
+ENABLED = os.getenv("METRICS_ENABLED", "1") not in ("0", "false", "no")
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _labels(names, values) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labels=()):
+        self.name, self.help, self.label_names = name, help_text, tuple(labels)
+        self._values = {}
+        self._lock = Lock()
+
+    def inc(self, *labels, value: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + value
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.label_names, labels)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, labels=(), buckets=LATENCY_BUCKETS):
+        self.name, self.help, self.label_names = name, help_text, tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}   # etykiety -> [liczniki kubelkow..., suma, liczba]
+        self._lock = Lock()
+
+    def observe(self, value: float, *labels):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        names = self.label_names + ("le",)
+        with self._lock:
+            for labels, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, series):
+                    cumulative += count
+                    lines.append(f"{self.name}_bucket{_labels(names, labels + (bound,))} {cumulative}")
+                lines.append(f"{self.name}_bucket{_labels(names, labels + ('+Inf',))} {series[-1]}")
+                lines.append(f"{self.name}_sum{_labels(self.label_names, labels)} {round(series[-2], 6)}")
+                lines.append(f"{self.name}_count{_labels(self.label_names, labels)} {series[-1]}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []   # funkcje -> [(nazwa, typ, pomoc, [(etykiety dict, wartosc)])]
+
+    def counter(self, *args, **kwargs) -> Counter:
+        metric = Counter(*args, **kwargs)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, *args, **kwargs) -> Histogram:
+        metric = Histogram(*args, **kwargs)
+        self._metrics.append(metric)
+        return metric
+
+    def collector(self, func):
+        # Wartosci liczone przy odczycie /metrics (stan puli, statystyki cache)
+        self._collectors.append(func)
+        return func
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collect in self._collectors:
+            try:
+                samples = collect()
+            except Exception:
+                continue
+            for name, kind, help_text, values in samples:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in values:
+                    lines.append(f"{name}{_labels(tuple(labels), tuple(labels.values()))} {value}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.counter("http_requests_total", "Liczba zadan HTTP", ("method", "route", "status"))
+http_latency = registry.histogram("http_request_duration_seconds", "Czas obslugi zadania HTTP",
+                                  ("method", "route"))
+db_execute = registry.histogram("db_execute_seconds", "Czas execute/executemany/callfunc", ("statement",))
+db_fetch = registry.histogram("db_fetch_seconds", "Czas pobierania wierszy (fetch*)", ("statement",))
+db_rows = registry.counter("db_rows_total", "Liczba pobranych wierszy", ("statement",))
+db_errors = registry.counter("db_errors_total", "Bledy wykonania instrukcji", ("statement",))
+db_acquire = registry.histogram("db_pool_acquire_seconds", "Czas oczekiwania na sesje z puli")
+
+
+# ------------------------------------------------------------------ instrukcje
+
+_STATEMENT_RE = re.compile(
+    r"^\s*(?:(SELECT|WITH)\b.*?\bFROM\s+(\w+)|(INSERT)\s+INTO\s+(\w+)|(UPDATE)\s+(\w+)|(DELETE)\s+FROM\s+(\w+)"
+    r"|(MERGE)\s+INTO\s+(\w+)|(BEGIN)\s+(?::\w+\s*:=\s*)?([\w.]+)|(DECLARE)\b)",
+    re.I | re.S)
+_labels_cache = {}
+_LABELS_CACHE_SIZE = 2048
+
+
+def statement_label(sql: str) -> str:
+    label = _labels_cache.get(sql)
+    if label is not None:
+        return label
+    match = _STATEMENT_RE.match(sql)
+    if match is None:
+        label = "OTHER"
+    else:
+        groups = [group for group in match.groups() if group]
+        operation = groups[0].upper()
+        if operation in ("WITH", "SELECT"):
+            operation = "SELECT"
+        elif operation in ("BEGIN", "DECLARE"):   # blok PL/SQL: nazwa wywolywanej procedury
+            operation = "PLSQL"
+        target = groups[1].lower() if len(groups) > 1 else ""
+        label = f"{operation} {target}".strip()
+    if len(_labels_cache) < _LABELS_CACHE_SIZE:
+        _labels_cache[sql] = label
+    return label
+
+
+class InstrumentedCursor:
+    # Pelnomocnik kursora oracledb: mierzy execute i fetch, pozostale atrybuty
+    # (rowfactory, arraysize, description, var, ...) przekazuje bez zmian.
+    # Czas i wiersze biezacej instrukcji sa sumowane do nastepnego execute lub
+    # close - wtedy instrukcja wolniejsza niz prog trafia do slowlog.py
+    __slots__ = ("_cursor", "_label", "_sql", "_params", "_elapsed", "_rows")
+
+    def __init__(self, cursor):
+        object.__setattr__(self, "_cursor", cursor)
+        object.__setattr__(self, "_label", "OTHER")
+        object.__setattr__(self, "_sql", None)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._cursor, name, value)
+
+    def _finish(self):
+        if self._sql is not None:
+            if slow_queries.enabled and self._elapsed >= slow_queries.threshold:
+                slow_queries.record(self._label, self._sql, self._params, self._elapsed, self._rows)
+            object.__setattr__(self, "_sql", None)
+
+    def _timed(self, label, sql, params, method, *args, **kwargs):
+        self._finish()
+        set_slot = object.__setattr__
+        set_slot(self, "_label", label)
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        except Exception:
+            db_errors.inc(label)
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            db_execute.observe(elapsed, label)
+            set_slot(self, "_sql", sql)
+            set_slot(self, "_params", params)
+            set_slot(self, "_elapsed", elapsed)
+            set_slot(self, "_rows", 0)
+
+    def execute(self, statement, parameters=None, **kwargs):
+        result = self._timed(statement_label(statement), statement, parameters or kwargs or None,
+                             self._cursor.execute, statement, parameters, **kwargs)
+        return self if result is not None else None
+
+    def executemany(self, statement, parameters, **kwargs):
+        # Do dziennika trafia tylko liczba wierszy partii, nie jej binds
+        size = parameters if isinstance(parameters, int) else len(parameters)
+        return self._timed(statement_label(statement), statement, {"batch_rows": size},
+                           self._cursor.executemany, statement, parameters, **kwargs)
+
+    def callfunc(self, name, *args, **kwargs):
+        return self._timed(f"CALL {name.lower()}", f"CALL {name}", args[1] if len(args) > 1 else None,
+                           self._cursor.callfunc, name, *args, **kwargs)
+
+    def callproc(self, name, *args, **kwargs):
+        return self._timed(f"CALL {name.lower()}", f"CALL {name}", args[0] if args else None,
+                           self._cursor.callproc, name, *args, **kwargs)
+
+    def _fetched(self, elapsed: float, rows: int):
+        db_fetch.observe(elapsed, self._label)
+        if rows:
+            db_rows.inc(self._label, value=rows)
+        if self._sql is not None:
+            object.__setattr__(self, "_elapsed", self._elapsed + elapsed)
+            object.__setattr__(self, "_rows", self._rows + rows)
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = self._cursor.fetchone()
+        self._fetched(time.perf_counter() - start, row is not None)
+        return row
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        rows = self._cursor.fetchmany(size) if size is not None else self._cursor.fetchmany()
+        self._fetched(time.perf_counter() - start, len(rows))
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = self._cursor.fetchall()
+        self._fetched(time.perf_counter() - start, len(rows))
+        return rows
+
+    def __iter__(self):
+        # Mierzony jest tylko czas pobierania kolejnych wierszy, nie przetwarzania ich
+        rows = iter(self._cursor)
+        elapsed, count = 0.0, 0
+        try:
+            while True:
+                start = time.perf_counter()
+                row = next(rows, None)
+                elapsed += time.perf_counter() - start
+                if row is None:
+                    return
+                count += 1
+                yield row
+        finally:
+            self._fetched(elapsed, count)
+
+    def close(self):
+        self._finish()
+        self._cursor.close()
+
+
+def instrument(cursor):
+    return InstrumentedCursor(cursor) if ENABLED or slow_queries.enabled else cursor
+
+
+def render() -> str:
+    return registry.render()
@@ -0,0 +1,172 @@
+# Odswiezanie widokow zmaterializowanych: agregaty z logami MV (INIT_DB.sql)
+# odswiezane przyrostowo metoda FAST (z awaryjnym COMPLETE, gdy log jest
+# niedostepny), a nastepnie zbudowany na nich mv_dashboard_stats (tanie pelne
+# odswiezenie). Harmonogram w tle co MV_REFRESH_INTERVAL sekund sprawdza
+# user_mviews i odswieza tylko, gdy ktorys widok jest nieaktualny. Stan ostatniego
+# odswiezenia jest trzymany w pamieci i zwracany w naglowkach odpowiedzi
+# (X-MV-Refreshed-At, X-MV-Staleness) oraz przez /views/mv-status. Zapis tabeli
+# bazowej przez API (cache.invalidate) oznacza zalezne widoki jako STALE do
+# nastepnego odswiezenia.
+import asyncio
+import os
+import time
+from datetime import datetime
+from threading import Lock
+
+import cache
+from db import run_db
+from logconfig import get_logger
+from serialization import fetch_dicts, format_date
+from storage import BACKEND
+
+log = get_logger("mviews")
+
+
+class MViewConfig:
+    REFRESH_INTERVAL = float(os.getenv("MV_REFRESH_INTERVAL", "300"))   # s; 0 wylacza harmonogram
+
+
+# Kolejnosc ma znaczenie: mv_dashboard_stats czyta z agregatow
+INCREMENTAL_VIEWS = ("mv_oplata_status_agg", "mv_naprawa_status_agg", "mv_zuzycie_mediow")
+COMPLETE_VIEWS = ("mv_dashboard_stats",)
+ALL_VIEWS = INCREMENTAL_VIEWS + COMPLETE_VIEWS
+# Widoki czytane przez endpointy (pseudo-tabele w cache odpowiedzi)
+CACHED_VIEWS = ("mv_dashboard_stats", "mv_zuzycie_mediow")
+# Tabele bazowe widokow (definicje w INIT_DB.sql); mv_dashboard_stats czyta oplata
+# i naprawa przez agregaty
+BASE_TABLES = {
+    "mv_oplata_status_agg": ("oplata",),
+    "mv_naprawa_status_agg": ("naprawa",),
+    "mv_zuzycie_mediow": ("oplata", "mieszkanie", "uslugi"),
+    "mv_dashboard_stats": ("budynek", "mieszkanie", "czlonek", "pracownik", "oplata", "naprawa"),
+}
+STALE = "STALE"
+
+STATUS_SQL = f"""
+    SELECT LOWER(mview_name) AS name, staleness, last_refresh_type, last_refresh_date
+    FROM user_mviews
+    WHERE mview_name IN ({", ".join(f"'{name.upper()}'" for name in ALL_VIEWS)})
+"""
+# Metoda "?" = FAST, a gdy niemozliwe (np. po TRUNCATE tabeli bazowej) COMPLETE
+REFRESH_SQL = "BEGIN DBMS_MVIEW.REFRESH(:names, :methods); END;"
+UNKNOWN = "UNKNOWN"
+
+
+class RefreshState:
+    def __init__(self):
+        self.lock = Lock()          # jedno odswiezenie naraz (harmonogram i POST /views/refresh-mv)
+        self.views = {}             # widok -> {"staleness", "last_refresh_type", "last_refresh_date"}
+        self.lock_views = Lock()    # mark_stale z watkow zapisu wzgledem update
+        self.last_run = None
+        self.runs = 0
+        self.skipped = 0
+        self.failures = 0
+
+    def update(self, rows: list):
+        views = {row["name"]: {key: row[key] for key in ("staleness", "last_refresh_type", "last_refresh_date")}
+                 for row in rows}
+        with self.lock_views:
+            self.views = views
+
+    def mark_stale(self, *tables):
+        changed = set(tables)
+        with self.lock_views:
+            for view, base in BASE_TABLES.items():
+                info = self.views.get(view)
+                if info is not None and changed.intersection(base):
+                    self.views[view] = {**info, "staleness": STALE}
+
+    def headers(self, *views) -> dict:
+        # Najstarsze odswiezenie i najgorszy stan sposrod widokow uzytych w odpowiedzi
+        known = [self.views.get(view) for view in views]
+        if not all(known):
+            return {"X-MV-Staleness": UNKNOWN}
+        dates = [info["last_refresh_date"] for info in known if info["last_refresh_date"]]
+        states = {info["staleness"] or UNKNOWN for info in known}
+        headers = {"X-MV-Staleness": "FRESH" if states == {"FRESH"} else sorted(states - {"FRESH"})[0]}
+        if dates:
+            headers["X-MV-Refreshed-At"] = min(dates)
+        return headers
+
+    def snapshot(self) -> dict:
+        return {
+            "interval_seconds": MViewConfig.REFRESH_INTERVAL,
+            "runs": self.runs,
+            "skipped": self.skipped,
+            "failures": self.failures,
+            "last_run": self.last_run,
+            "views": {name: dict(info) for name, info in sorted(self.views.items())},
+        }
+
+
+state = RefreshState()
+# Na SQLite widoki mv_* sa zwyklymi widokami - zawsze aktualne
+if BACKEND != "sqlite":
+    for _table in sorted({table for tables in BASE_TABLES.values() for table in tables}):
+        cache.on_invalidate(_table, state.mark_stale)
+
+
+def load_status(cursor, conn=None) -> dict:
+    state.update(fetch_dicts(cursor, STATUS_SQL))
+    return state.views
+
+
+def refresh(cursor, conn, trigger: str = "manual", only_stale: bool = False) -> dict:
+    with state.lock:
+        if only_stale:
+            views = load_status(cursor)
+            if len(views) == len(ALL_VIEWS) and all(info["staleness"] == "FRESH" for info in views.values()):
+                state.skipped += 1
+                return {"refreshed": [], "skipped": True}
+        start = time.perf_counter()
+        run = {"trigger": trigger, "started_at": format_date(datetime.now()), "elapsed_ms": None, "error": None}
+        try:
+            cursor.execute(REFRESH_SQL, {"names": ",".join(INCREMENTAL_VIEWS), "methods": "?" * len(INCREMENTAL_VIEWS)})
+            cursor.execute(REFRESH_SQL, {"names": ",".join(COMPLETE_VIEWS), "methods": "C" * len(COMPLETE_VIEWS)})
+            conn.commit()
+        except Exception as e:
+            run["error"] = str(e)
+            state.failures += 1
+            raise
+        finally:
+            run["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            state.last_run = run
+            state.runs += 1
+        cache.invalidate(*CACHED_VIEWS)
+        load_status(cursor)
+        return {"refreshed": list(ALL_VIEWS), "skipped": False, "elapsed_ms": run["elapsed_ms"],
+                "views": {name: dict(info) for name, info in state.views.items()}}
+
+
+async def scheduler(interval: float):
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            result = await run_db(refresh, "scheduler", True)
+            if not result["skipped"]:
+                log.info("Materialized views refreshed", extra={"fields": {"elapsed_ms": result["elapsed_ms"]}})
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log.error("Materialized view refresh failed", extra={"fields": {"error": str(e)}})
+
+
+_task = None
+
+
+def start_scheduler():
+    global _task
+    if MViewConfig.REFRESH_INTERVAL > 0 and _task is None:
+        _task = asyncio.get_running_loop().create_task(scheduler(MViewConfig.REFRESH_INTERVAL))
+    return _task
+
+
+async def stop_scheduler():
+    global _task
+    task, _task = _task, None
+    if task is not None:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
@@ -0,0 +1,96 @@
+# Stronicowanie keyset dla /data/{table}: kursor strony koduje wartosc kolumny
+# sortowania i klucz glowny ostatniego wiersza, a kolejna strona jest pobierana
+# predykatem "za tym wierszem" + FETCH FIRST zamiast OFFSET lub pelnego SELECT *.
+import base64
+import json
+from datetime import datetime
+from typing import Optional
+
+import sqlbuilder
+from schema import TableInfo, DATE_TYPES
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+CURSOR_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class PaginationError(ValueError):
+    pass
+
+
+def parse_order_by(table: TableInfo, order_by: Optional[str]) -> tuple[str, bool]:
+    if not order_by:
+        return table.pk, False
+    descending = order_by.startswith("-")
+    column = order_by.lstrip("-+").lower()
+    if not table.has_column(column):
+        raise PaginationError(f"Nieprawidlowa kolumna sortowania: {column}")
+    return column, descending
+
+
+def parse_fields(table: TableInfo, fields: Optional[str], required: list) -> list:
+    # Kolejnosc kolumn jak w definicji tabeli - jeden tekst SQL na zbior kolumn
+    if not fields:
+        return list(table.columns)
+    columns = [f.strip().lower() for f in fields.split(",") if f.strip()]
+    invalid = [col for col in columns if not table.has_column(col)]
+    if invalid:
+        raise PaginationError(f"Nieprawidlowe kolumny: {', '.join(invalid)}")
+    return list(sqlbuilder.canonical_columns(table, columns + list(required)))
+
+
+def parse_limit(limit: Optional[int]) -> int:
+    if limit is None:
+        return DEFAULT_PAGE_SIZE
+    if limit < 1:
+        raise PaginationError("Parametr limit musi byc dodatni")
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def encode_cursor(value, pk_value) -> str:
+    if isinstance(value, datetime):
+        value = value.strftime(CURSOR_DATE_FORMAT)
+    raw = json.dumps([value, pk_value], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(table: TableInfo, column: str, token: str) -> tuple:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        value, pk_value = json.loads(raw)
+        if value is not None and table.column_type(column) in DATE_TYPES:
+            value = datetime.strptime(value, CURSOR_DATE_FORMAT)
+    except (ValueError, TypeError) as e:
+        raise PaginationError("Nieprawidlowy kursor strony") from e
+    return value, pk_value
+
+
+# Oracle sortuje NULL na koncu przy ASC i na poczatku przy DESC - predykat
+# musi to uwzglednic, zeby wiersze z NULL nie zostaly pominiete ani powtorzone
+def keyset_clause(column: str, pk: str, descending: bool, value) -> str:
+    op = "<" if descending else ">"
+    if column == pk:
+        return f"{pk} {op} :after_pk"
+    if value is None:
+        if descending:
+            return f"(({column} IS NULL AND {pk} {op} :after_pk) OR {column} IS NOT NULL)"
+        return f"({column} IS NULL AND {pk} {op} :after_pk)"
+    clause = f"{column} {op} :after_value OR ({column} = :after_value AND {pk} {op} :after_pk)"
+    if not descending:
+        clause += f" OR {column} IS NULL"
+    return f"({clause})"
+
+
+def build_page_query(table: TableInfo, columns: list, order_column: str, descending: bool, after, limit: int) -> tuple[str, dict]:
+    params = {"limit_rows": limit + 1}
+    where = None
+    if after is not None:
+        value, pk_value = after
+        where = keyset_clause(order_column, table.pk, descending, value)
+        params["after_pk"] = pk_value
+        if order_column != table.pk and value is not None:
+            params["after_value"] = value
+    order = [(order_column, descending)]
+    if order_column != table.pk:
+        order.append((table.pk, descending))
+    return sqlbuilder.select(table, columns, order, where, fetch_first=True), params
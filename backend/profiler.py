@@ -0,0 +1,101 @@
+# Profiler probkujacy na zadanie: ?profile=1 albo naglowek X-Profile: 1 zamienia
+# odpowiedz na stosy w formacie "collapsed" (ramka;ramka;ramka liczba) - wejscie
+# flamegraph.pl, speedscope i inferno. Watek profilera co PROFILE_INTERVAL_MS
+# odczytuje sys._current_frames() dla watku petli zdarzen i watkow puli db, ktore
+# w danej chwili wykonuja prace tego zadania (run_db -> attach). Probki petli
+# zdarzen moga obejmowac tez rownolegle zadania. Bez parametru profilowania koszt
+# to odczyt ContextVar w run_db. PROFILING_ENABLED=0 wylacza funkcje.
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+
+ENABLED = os.getenv("PROFILING_ENABLED", "1") not in ("0", "false", "no")
+INTERVAL = float(os.getenv("PROFILE_INTERVAL_MS", "5")) / 1000
+MAX_DEPTH = 128
+HEADER = "x-profile"
+
+current = ContextVar("profile_session", default=None)
+_idle = nullcontext()
+
+
+def requested(request) -> bool:
+    return ENABLED and (request.query_params.get("profile") == "1" or request.headers.get(HEADER) == "1")
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+
+
+def collapse(frame, root: str) -> str:
+    names = []
+    while frame is not None and len(names) < MAX_DEPTH:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    names.append(root)
+    return ";".join(reversed(names))
+
+
+class ProfileSession:
+    def __init__(self, interval: float = INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._threads = {threading.get_ident(): "event-loop"}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self.started = self.elapsed = None
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._sampler.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._sampler.join()
+        self.elapsed = time.perf_counter() - self.started
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            with self._lock:
+                threads = list(self._threads.items())
+            for ident, name in threads:
+                frame = frames.get(ident)
+                if frame is not None:
+                    self.stacks[collapse(frame, name)] += 1
+            self.samples += 1
+
+    @contextmanager
+    def _attached(self):
+        ident = threading.get_ident()
+        with self._lock:
+            self._threads[ident] = threading.current_thread().name
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._threads.pop(ident, None)
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def headers(self, status: int) -> dict:
+        return {
+            "X-Profile-Samples": str(self.samples),
+            "X-Profile-Interval-Ms": str(round(self.interval * 1000, 2)),
+            "X-Profile-Elapsed-Ms": str(round(self.elapsed * 1000, 1)),
+            "X-Profile-Status": str(status),
+        }
+
+
+def attach():
+    # Wywolywane w watku puli db: probkuj ten watek, jesli zadanie jest profilowane
+    session = current.get()
+    return session._attached() if session is not None else _idle
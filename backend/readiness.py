@@ -0,0 +1,204 @@
+# Start bez blokowania: aplikacja od razu obsluguje /health (proces zyje), a
+# rozgrzewka w tle laczy sie z baza z wykladniczo rosnacym odstepem prob
+# (DB_WARMUP_BACKOFF .. DB_WARMUP_MAX_BACKOFF), czeka na schemat z INIT_DB.sql,
+# laduje rejestr schematu i stan widokow MV, otwiera sesje puli i parsuje na nich
+# czeste zapytania (cache instrukcji sterownika i shared pool). Do konca rozgrzewki
+# endpointy bazy odpowiadaja 503 z Retry-After; /ready zwraca 200 dopiero, gdy baza
+# faktycznie odpowiada. Czasy startu (od uruchomienia procesu) sa w /ready, w logu
+# i w /metrics.
+import asyncio
+import os
+import time
+from datetime import datetime
+
+import db
+import metrics
+from logconfig import get_logger
+from serialization import format_date
+
+log = get_logger("readiness")
+
+
+class ReadinessConfig:
+    BACKOFF = float(os.getenv("DB_WARMUP_BACKOFF", "0.5"))           # s; pierwsza przerwa miedzy probami
+    MAX_BACKOFF = float(os.getenv("DB_WARMUP_MAX_BACKOFF", "30"))    # s; gorna granica przerwy
+    CHECK_TIMEOUT = float(os.getenv("DB_READY_TIMEOUT", "2"))        # s; limit zapytania kontrolnego /ready
+    RETRY_AFTER = 5                                                  # s; naglowek Retry-After odpowiedzi 503
+
+
+# Dostepne przed gotowoscia bazy (sonda zycia, gotowosci, metryki, dokumentacja API)
+EXEMPT_PATHS = ("/health", "/ready", "/metrics", "/docs", "/redoc", "/openapi.json")
+SCHEMA_CHECK_SQL = "SELECT COUNT(*) FROM user_tables WHERE table_name = 'BUDYNEK'"
+PING_SQL = "SELECT 1 FROM DUAL"
+
+
+def _process_start() -> float:
+    # Czas uruchomienia procesu (Linux: /proc/self/stat), inaczej moment importu
+    try:
+        with open("/proc/self/stat") as f:
+            ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return time.time() - uptime + ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return time.time()
+
+
+PROCESS_START = _process_start()
+
+
+class SchemaNotReady(Exception):
+    pass
+
+
+class ReadinessState:
+    def __init__(self):
+        self.ready = False
+        self.attempts = 0
+        self.last_error = None
+        self.serving_s = None       # od startu procesu do obslugi zadan
+        self.ready_s = None         # od startu procesu do gotowosci bazy
+        self.steps = {}             # krok rozgrzewki -> ms (ostatnia udana proba)
+        self.sessions = 0
+        self.statements = 0
+
+    def elapsed(self) -> float:
+        return round(time.time() - PROCESS_START, 3)
+
+    def snapshot(self) -> dict:
+        return {
+            "status": "ready" if self.ready else "starting",
+            "started_at": format_date(datetime.fromtimestamp(PROCESS_START)),
+            "uptime_s": self.elapsed(),
+            "serving_s": self.serving_s,
+            "ready_s": self.ready_s,
+            "attempts": self.attempts,
+            "last_error": self.last_error,
+            "warmup_ms": dict(self.steps),
+            "sessions_warmed": self.sessions,
+            "statements_primed": self.statements,
+        }
+
+
+state = ReadinessState()
+
+
+def check_schema(cursor, conn=None):
+    cursor.execute(SCHEMA_CHECK_SQL)
+    if cursor.fetchone()[0] == 0:
+        raise SchemaNotReady("Brak tabeli BUDYNEK - schemat bazy nie jest jeszcze zainicjalizowany")
+
+
+def ping(cursor, conn=None):
+    cursor.execute(PING_SQL)
+    cursor.fetchone()
+
+
+def backoff(attempt: int) -> float:
+    return min(ReadinessConfig.BACKOFF * 2 ** (attempt - 1), ReadinessConfig.MAX_BACKOFF)
+
+
+async def _step(name: str, func, *args):
+    start = time.perf_counter()
+    result = await func(*args)
+    state.steps[name] = round((time.perf_counter() - start) * 1000, 1)
+    return result
+
+
+async def _in_thread(func, *args):
+    return await asyncio.get_running_loop().run_in_executor(db.get_executor(), func, *args)
+
+
+async def warm_up(load_metadata, prime_statements, on_ready=None):
+    # load_metadata: korutyna ladujaca rejestr schematu i stan MV (bledy nie blokuja
+    # gotowosci - aplikacja ma metadane statyczne); prime_statements: -> lista SQL
+    while True:
+        state.attempts += 1
+        try:
+            await _step("pool", _in_thread, db.create_pool)
+            await _step("schema_check", db.run_db, check_schema)
+            break
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            state.last_error = str(e)
+            delay = backoff(state.attempts)
+            log.warning("Database not ready", extra={"fields": {
+                "attempt": state.attempts, "retry_in_s": delay, "error": state.last_error}})
+            await asyncio.sleep(delay)
+    state.last_error = None
+    await _step("metadata", load_metadata)
+    try:
+        state.sessions, state.statements = await _step("sessions", _in_thread, db.warm_pool, prime_statements())
+    except Exception as e:
+        # Sesje otworza sie przy pierwszych zadaniach - gotowosc nie zalezy od rozgrzewki
+        log.warning("Pool warm-up incomplete", extra={"fields": {"error": str(e)}})
+    state.ready = True
+    state.ready_s = state.elapsed()
+    log.info("Database ready", extra={"fields": {
+        "ready_s": state.ready_s, "attempts": state.attempts, "warmup_ms": state.steps}})
+    if on_ready is not None:
+        on_ready()
+
+
+_task = None
+
+
+def start(load_metadata, prime_statements, on_ready=None):
+    global _task
+    if _task is None:
+        _task = asyncio.get_running_loop().create_task(warm_up(load_metadata, prime_statements, on_ready))
+    state.serving_s = state.elapsed()
+    log.info("Application serving", extra={"fields": {"serving_s": state.serving_s}})
+    return _task
+
+
+async def stop():
+    global _task
+    task, _task = _task, None
+    if task is not None and not task.done():
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+
+async def probe() -> dict:
+    # Gotowosc "na teraz": po rozgrzewce dodatkowo zapytanie kontrolne z limitem czasu
+    result = state.snapshot()
+    if not state.ready:
+        return result
+    start = time.perf_counter()
+    try:
+        await asyncio.wait_for(db.run_db(ping), ReadinessConfig.CHECK_TIMEOUT)
+    except Exception as e:
+        result["status"] = "unavailable"
+        result["last_error"] = str(e) or type(e).__name__
+        return result
+    result["db_ping_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return result
+
+
+def wait_ready(timeout: float = 30) -> bool:
+    # Dla skryptow i benchmarkow z TestClient: rozgrzewka trwa w watku petli klienta
+    deadline = time.monotonic() + timeout
+    while not state.ready and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return state.ready
+
+
+def exempt(path: str) -> bool:
+    return path.startswith(EXEMPT_PATHS)
+
+
+@metrics.registry.collector
+def readiness_metrics():
+    samples = [("app_db_ready", "gauge", "Rozgrzewka bazy zakonczona (1) lub w toku (0)", [({}, int(state.ready))])]
+    if state.serving_s is not None:
+        samples.append(("app_startup_seconds", "gauge", "Czas od startu procesu do obslugi zadan",
+                        [({}, state.serving_s)]))
+    if state.ready_s is not None:
+        samples.append(("app_ready_seconds", "gauge", "Czas od startu procesu do gotowosci bazy",
+                        [({}, state.ready_s)]))
+    return samples
@@ -0,0 +1,72 @@
+# Migawka Portalu Mieszkanca: oplaty, naprawy i umowy pobierane jednym blokiem
+# PL/SQL, ktory zwraca kursory jako wyniki niejawne (DBMS_SQL.RETURN_RESULT) -
+# jeden round-trip zamiast kilku zapytan. Nadchodzace spotkania dokleja endpoint
+# ze wspolnego cache (meetings.py).
+# Suma oplat (jak coop_pkg.suma_oplat_mieszkania) i zuzycie per usluga (jak
+# /resident/consumption) liczone sa z juz pobranych wierszy oplat.
+from serialization import rowfactories
+
+DEFAULT_MEETINGS = 20
+MAX_MEETINGS = 100
+RESULTS = ("oplaty", "naprawy", "umowy")
+
+SNAPSHOT_BLOCK = """
+DECLARE
+    c_oplaty SYS_REFCURSOR;
+    c_naprawy SYS_REFCURSOR;
+    c_umowy SYS_REFCURSOR;
+BEGIN
+    OPEN c_oplaty FOR
+        SELECT o.id_oplaty, o.id_mieszkania, o.id_uslugi, u.nazwa_uslugi, o.kwota, o.zuzycie,
+               u.jednostka_miary, o.data_naliczenia, o.status_oplaty
+        FROM oplata o JOIN uslugi u ON o.id_uslugi = u.id_uslugi
+        WHERE o.id_mieszkania = :apt_id
+        ORDER BY o.data_naliczenia DESC;
+    DBMS_SQL.RETURN_RESULT(c_oplaty);
+
+    OPEN c_naprawy FOR
+        SELECT n.id_naprawy, n.id_mieszkania, n.id_pracownika, n.opis, n.data_zgloszenia,
+               n.data_wykonania, n.status, p.imie || ' ' || p.nazwisko AS pracownik
+        FROM naprawa n LEFT JOIN pracownik p ON n.id_pracownika = p.id_pracownika
+        WHERE n.id_mieszkania = :apt_id
+        ORDER BY n.data_zgloszenia DESC;
+    DBMS_SQL.RETURN_RESULT(c_naprawy);
+
+    OPEN c_umowy FOR
+        SELECT id_umowy, id_mieszkania, id_czlonka, data_zawarcia, data_wygasniecia, typ_umowy
+        FROM umowa WHERE id_mieszkania = :apt_id;
+    DBMS_SQL.RETURN_RESULT(c_umowy);
+END;
+"""
+
+
+def consumption(oplaty: list) -> list:
+    # GROUP BY nazwa_uslugi, jednostka_miary z SUM jak w SQL (NULL, gdy brak wartosci)
+    groups = {}
+    for row in oplaty:
+        key = (row.get("nazwa_uslugi"), row.get("jednostka_miary"))
+        group = groups.setdefault(key, {"nazwa_uslugi": key[0], "zuzycie": None, "jednostka_miary": key[1], "suma_kwot": None})
+        for source, target in (("zuzycie", "zuzycie"), ("kwota", "suma_kwot")):
+            value = row.get(source)
+            if value is not None:
+                group[target] = value if group[target] is None else group[target] + value
+    for group in groups.values():
+        for name in ("zuzycie", "suma_kwot"):
+            if isinstance(group[name], float):
+                group[name] = round(group[name], 3)
+    return sorted(groups.values(), key=lambda g: g["suma_kwot"] if g["suma_kwot"] is not None else float("-inf"),
+                  reverse=True)
+
+
+def fetch_snapshot(cursor, conn, apt_id: int) -> dict:
+    cursor.execute(SNAPSHOT_BLOCK, {"apt_id": apt_id})
+    snapshot = {}
+    for name, result in zip(RESULTS, cursor.getimplicitresults()):
+        result.rowfactory = rowfactories.get(f"resident.snapshot.{name}", result.description)
+        snapshot[name] = result.fetchall()
+    oplaty = snapshot.get("oplaty", [])
+    snapshot["zuzycie"] = consumption(oplaty)
+    snapshot["suma_oplat"] = round(sum(row.get("kwota") or 0 for row in oplaty), 2)
+    snapshot["zaleglosci"] = round(sum(row.get("kwota") or 0 for row in oplaty
+                                       if row.get("status_oplaty") == "nieoplacone"), 2)
+    return snapshot
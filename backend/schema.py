@@ -0,0 +1,260 @@
+# Rejestr metadanych tabel udostepnianych przez /data/{table} - kolumny, typy,
+# klucze glowne i obce. Przy starcie (i na zadanie przez refresh()) rejestr jest
+# ladowany ze slownika danych (user_tab_columns, user_constraints); statyczne
+# definicje ponizej, zgodne z INIT_DB.sql (lacznie z kolumnami dodanymi przez
+# ALTER TABLE), sluza jako rezerwa, gdy baza jest niedostepna.
+# TableInfo udostepnia tez teksty INSERT/UPDATE/DELETE (kanoniczne, z sqlbuilder.py)
+# i konwertery wartosci dla kolumn z payloadu.
+from datetime import datetime
+from threading import Lock
+
+import sqlbuilder
+
+NUMBER = "NUMBER"
+VARCHAR2 = "VARCHAR2"
+DATE = "DATE"
+TIMESTAMP = "TIMESTAMP"
+
+DATE_TYPES = (DATE, TIMESTAMP)
+TEXT_TYPES = (VARCHAR2, "NVARCHAR2", "CHAR", "NCHAR", "CLOB")
+
+
+class SchemaError(ValueError):
+    pass
+
+
+def _convert_date(value):
+    if isinstance(value, str):
+        return datetime.fromisoformat(value.strip()).replace(tzinfo=None)
+    return value
+
+
+def _convert_plain(value):
+    return value
+
+
+class TableInfo:
+    def __init__(self, name: str, pk: str, columns: dict, fks: dict = None):
+        self.name = name
+        self.pk = pk
+        self.columns = columns
+        self.fks = fks or {}   # kolumna -> (tabela, kolumna) wskazywana przez FK
+        self.converters = {
+            col: _convert_date if typ in DATE_TYPES else _convert_plain for col, typ in columns.items()
+        }
+
+    def has_column(self, column: str) -> bool:
+        return column in self.columns
+
+    def column_type(self, column: str) -> str:
+        return self.columns[column]
+
+    @property
+    def text_columns(self) -> list:
+        return [col for col, typ in self.columns.items() if typ in TEXT_TYPES]
+
+    @property
+    def date_columns(self) -> list:
+        return [col for col, typ in self.columns.items() if typ in DATE_TYPES]
+
+    def check_columns(self, columns):
+        invalid = [col for col in columns if col not in self.columns]
+        if invalid:
+            raise SchemaError(f"Nieprawidlowe kolumny: {', '.join(invalid)}")
+
+    def check_id_field(self, id_field: str):
+        if id_field != self.pk:
+            raise SchemaError(f"Nieprawidlowe pole identyfikatora: {id_field}")
+
+    def convert_key(self, value):
+        # Klucz glowny z URL lub JSON zadania - liczbowe PK jako int ("12", "12.0", 12.0), inne bez zmian
+        if value is None or value == "":
+            raise SchemaError(f"Brak klucza {self.pk}")
+        if self.columns.get(self.pk) != NUMBER:
+            return value
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+        if isinstance(value, str):
+            try:
+                return int(value.strip())
+            except ValueError:
+                try:
+                    number = float(value)
+                except ValueError:
+                    number = None
+                if number is not None and number.is_integer():
+                    return int(number)
+        raise SchemaError(f"Nieprawidlowa wartosc klucza {self.pk}: {value}")
+
+    def convert_record(self, data: dict, exclude=()) -> dict:
+        # Puste wartosci -> NULL; puste daty sa pomijane (zostaje wartosc domyslna/dotychczasowa)
+        self.check_columns(data)
+        result = {}
+        for col, value in data.items():
+            if col in exclude:
+                continue
+            if value == "":
+                value = None
+            if value is None:
+                if col not in self.date_columns:
+                    result[col] = None
+                continue
+            try:
+                result[col] = self.converters[col](value)
+            except ValueError as e:
+                raise SchemaError(f"Nieprawidlowa wartosc kolumny {col}: {value}") from e
+        return result
+
+    # Instrukcje DML w postaci kanonicznej (sqlbuilder.py)
+    def insert_sql(self, columns, returning: bool = True) -> str:
+        return sqlbuilder.insert(self, columns, returning)
+
+    def update_sql(self, columns) -> str:
+        return sqlbuilder.update(self, columns)
+
+    def delete_sql(self) -> str:
+        return sqlbuilder.delete(self)
+
+    @staticmethod
+    def binds(data: dict) -> dict:
+        return sqlbuilder.binds(data)
+
+
+STATIC_TABLES = {table.name: table for table in [
+    TableInfo("budynek", "id_budynku", {
+        "id_budynku": NUMBER, "adres": VARCHAR2, "liczba_pieter": NUMBER, "rok_budowy": NUMBER,
+        "liczba_mieszkan": NUMBER, "typ_budynku": VARCHAR2,
+    }),
+    TableInfo("mieszkanie", "id_mieszkania", {
+        "id_mieszkania": NUMBER, "id_budynku": NUMBER, "numer": VARCHAR2, "metraz": NUMBER, "liczba_pokoi": NUMBER,
+    }, {"id_budynku": ("budynek", "id_budynku")}),
+    TableInfo("czlonek", "id_czlonka", {
+        "id_czlonka": NUMBER, "id_mieszkania": NUMBER, "imie": VARCHAR2, "nazwisko": VARCHAR2, "pesel": VARCHAR2,
+        "telefon": VARCHAR2, "email": VARCHAR2, "data_przystapienia": DATE,
+    }, {"id_mieszkania": ("mieszkanie", "id_mieszkania")}),
+    TableInfo("pracownik", "id_pracownika", {
+        "id_pracownika": NUMBER, "imie": VARCHAR2, "nazwisko": VARCHAR2, "stanowisko": VARCHAR2,
+        "telefon": VARCHAR2, "email": VARCHAR2, "data_zatrudnienia": DATE,
+    }),
+    TableInfo("naprawa", "id_naprawy", {
+        "id_naprawy": NUMBER, "id_mieszkania": NUMBER, "id_pracownika": NUMBER, "opis": VARCHAR2,
+        "data_zgloszenia": DATE, "data_wykonania": DATE, "status": VARCHAR2, "uwagi": VARCHAR2, "priorytet": VARCHAR2,
+    }, {"id_mieszkania": ("mieszkanie", "id_mieszkania"), "id_pracownika": ("pracownik", "id_pracownika")}),
+    TableInfo("uslugi", "id_uslugi", {
+        "id_uslugi": NUMBER, "nazwa_uslugi": VARCHAR2, "cena_za_jednostke": NUMBER, "jednostka_miary": VARCHAR2,
+    }),
+    TableInfo("oplata", "id_oplaty", {
+        "id_oplaty": NUMBER, "id_mieszkania": NUMBER, "id_uslugi": NUMBER, "kwota": NUMBER,
+        "data_naliczenia": DATE, "status_oplaty": VARCHAR2, "zuzycie": NUMBER,
+    }, {"id_mieszkania": ("mieszkanie", "id_mieszkania"), "id_uslugi": ("uslugi", "id_uslugi")}),
+    TableInfo("umowa", "id_umowy", {
+        "id_umowy": NUMBER, "id_mieszkania": NUMBER, "id_czlonka": NUMBER, "data_zawarcia": DATE,
+        "data_wygasniecia": DATE, "typ_umowy": VARCHAR2,
+    }, {"id_mieszkania": ("mieszkanie", "id_mieszkania"), "id_czlonka": ("czlonek", "id_czlonka")}),
+    TableInfo("konto_spoldzielni", "id_konta", {
+        "id_konta": NUMBER, "nazwa_konta": VARCHAR2, "numer_konta": VARCHAR2, "id_uslugi": NUMBER, "saldo": NUMBER,
+    }, {"id_uslugi": ("uslugi", "id_uslugi")}),
+    TableInfo("spotkanie_mieszkancow", "id_spotkania", {
+        "id_spotkania": NUMBER, "temat": VARCHAR2, "miejsce": VARCHAR2, "data_spotkania": DATE,
+    }),
+]}
+
+
+TABLES = dict(STATIC_TABLES)
+SOURCE = "static"
+_refresh_lock = Lock()
+
+COLUMNS_SQL = """
+    SELECT LOWER(table_name), LOWER(column_name), data_type
+    FROM user_tab_columns
+    ORDER BY table_name, column_id
+"""
+
+KEYS_SQL = """
+    SELECT LOWER(c.table_name), c.constraint_type, LOWER(cc.column_name),
+           LOWER(r.table_name), LOWER(rc.column_name)
+    FROM user_constraints c
+    JOIN user_cons_columns cc ON cc.constraint_name = c.constraint_name
+    LEFT JOIN user_constraints r ON r.constraint_name = c.r_constraint_name
+    LEFT JOIN user_cons_columns rc ON rc.constraint_name = r.constraint_name AND rc.position = cc.position
+    WHERE c.constraint_type IN ('P', 'R')
+"""
+
+
+def _normalize_type(data_type: str) -> str:
+    # TIMESTAMP(6), TIMESTAMP(6) WITH TIME ZONE -> TIMESTAMP
+    return TIMESTAMP if data_type.startswith(TIMESTAMP) else data_type
+
+
+def load_from_db(cursor, tables) -> dict:
+    wanted = set(tables)
+    columns = {}
+    cursor.execute(COLUMNS_SQL)
+    for table, column, data_type in cursor.fetchall():
+        if table in wanted:
+            columns.setdefault(table, {})[column] = _normalize_type(data_type)
+    pks, fks = {}, {}
+    cursor.execute(KEYS_SQL)
+    for table, constraint_type, column, ref_table, ref_column in cursor.fetchall():
+        if table not in wanted:
+            continue
+        if constraint_type == "P":
+            pks.setdefault(table, column)
+        else:
+            fks.setdefault(table, {})[column] = (ref_table, ref_column)
+    loaded = {}
+    for table in tables:
+        if table not in columns:
+            continue
+        pk = pks.get(table) or (STATIC_TABLES[table].pk if table in STATIC_TABLES else None)
+        if pk is None:
+            continue
+        loaded[table] = TableInfo(table, pk, columns[table], fks.get(table, {}))
+    return loaded
+
+
+def refresh(cursor, tables) -> dict:
+    # Przeladowanie rejestru ze slownika danych; tabele, ktorych nie ma w bazie,
+    # zachowuja definicje statyczne
+    global TABLES, SOURCE
+    loaded = load_from_db(cursor, tables)
+    with _refresh_lock:
+        TABLES = {**STATIC_TABLES, **loaded}
+        SOURCE = "database" if loaded else "static"
+    return describe()
+
+
+def describe() -> dict:
+    return {
+        "source": SOURCE,
+        "tables": {
+            name: {
+                "pk": info.pk,
+                "columns": info.columns,
+                "foreign_keys": {col: f"{ref[0]}.{ref[1]}" for col, ref in info.fks.items()},
+                "text_columns": info.text_columns,
+                "date_columns": info.date_columns,
+            }
+            for name, info in TABLES.items()
+        },
+    }
+
+
+def get_table(table: str) -> TableInfo:
+    return TABLES[table]
+
+
+def dependents(table: str) -> list:
+    # Tabele powiazane kluczem obcym (bezposrednio lub posrednio) z podana -
+    # FK w INIT_DB.sql maja ON DELETE CASCADE, wiec DELETE zmienia tez je
+    found = []
+    queue = [table]
+    while queue:
+        parent = queue.pop()
+        for name, info in TABLES.items():
+            if name not in found and name != table and any(ref[0] == parent for ref in info.fks.values()):
+                found.append(name)
+                queue.append(name)
+    return found
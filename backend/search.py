@@ -0,0 +1,226 @@
+# Wyszukiwanie pelnotekstowe dla /data/{table}/search: odwrocony indeks w pamieci
+# procesu nad kolumnami tekstowymi tabeli (metadane z schema.py, bez sondowania
+# bazy). Indeks budowany jest leniwie jednym SELECT-em kolumn tekstowych, a zapisy
+# oznaczaja zmienione klucze (mark_changed) lub cala tabele (mark_stale) - przed
+# kolejnym wyszukiwaniem zmienione wiersze sa doczytywane jednym zapytaniem po PK.
+# Wyniki to klucze glowne uszeregowane wg trafnosci; wiersze sa pobierane po PK.
+import math
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from collections import Counter
+from threading import Lock
+
+from schema import NUMBER, get_table
+from serialization import fetch_dicts
+
+_TOKEN_RE = re.compile(r"\w+")
+_FOLD = str.maketrans({"ł": "l", "Ł": "l"})
+# Rozmiary list IN dla pobierania po PK - stala liczba bindow daje powtarzalny
+# tekst SQL i trafienia w cache instrukcji (Oracle dopuszcza do 1000 elementow)
+IN_LIST_SIZES = (10, 100, 1000)
+
+
+def normalize(text: str) -> str:
+    text = unicodedata.normalize("NFKD", str(text).translate(_FOLD).lower())
+    return "".join(ch for ch in text if not unicodedata.combining(ch))
+
+
+def tokenize(text) -> list:
+    if text is None:
+        return []
+    return _TOKEN_RE.findall(normalize(text))
+
+
+class TableIndex:
+    def __init__(self, table: str):
+        info = get_table(table)
+        self.table = table
+        self.pk = info.pk
+        self.numeric_pk = info.column_type(info.pk) == NUMBER
+        self.columns = info.text_columns
+        self.lock = Lock()
+        self.built = False
+        self.pending = set()
+        self.appended = False
+        self._max_pk = None
+        self._postings = {}   # token -> {pk: liczba wystapien}
+        self._terms = []      # posortowane tokeny (wyszukiwanie prefiksowe przez bisect)
+        self._docs = {}       # pk -> Counter tokenow (do usuwania przy aktualizacji)
+
+    @property
+    def size(self) -> int:
+        return len(self._docs)
+
+    def key(self, value):
+        # Klucze z URL przychodza jako tekst, a z bazy jako liczby
+        if self.numeric_pk and isinstance(value, str):
+            try:
+                return int(value)
+            except ValueError:
+                return int(float(value))
+        return value
+
+    def _add(self, pk, row: dict):
+        counts = Counter()
+        for column in self.columns:
+            counts.update(tokenize(row.get(column)))
+        self._docs[pk] = counts
+        if self.numeric_pk and (self._max_pk is None or pk > self._max_pk):
+            self._max_pk = pk
+        for token, count in counts.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                insort(self._terms, token)
+            postings[pk] = count
+
+    def _remove(self, pk):
+        counts = self._docs.pop(pk, None)
+        if not counts:
+            return
+        for token in counts:
+            postings = self._postings[token]
+            postings.pop(pk, None)
+            if not postings:
+                del self._postings[token]
+                del self._terms[bisect_left(self._terms, token)]
+
+    def _select_sql(self) -> str:
+        return f"SELECT {', '.join([self.pk] + self.columns)} FROM {self.table}"
+
+    def rebuild(self, cursor):
+        self._postings, self._terms, self._docs, self._max_pk = {}, [], {}, None
+        for row in fetch_dicts(cursor, self._select_sql()):
+            self._add(row[self.pk], row)
+        self.pending.clear()
+        self.appended = False
+        self.built = True
+
+    def refresh_appended(self, cursor):
+        # Nowe wiersze z kluczem z sekwencji/IDENTITY - wieksze od najwiekszego w indeksie
+        self.appended = False
+        if self._max_pk is None:
+            return self.rebuild(cursor)
+        for row in fetch_dicts(cursor, f"{self._select_sql()} WHERE {self.pk} > :max_pk", {"max_pk": self._max_pk}):
+            self._remove(row[self.pk])
+            self._add(row[self.pk], row)
+
+    def refresh_pending(self, cursor):
+        pending = list(self.pending)
+        self.pending.clear()
+        found = {row[self.pk]: row for row in fetch_by_pk(cursor, self._select_sql(), self.pk, pending)}
+        for pk in pending:
+            self._remove(pk)
+            if pk in found:
+                self._add(pk, found[pk])
+
+    def ensure_fresh(self, cursor):
+        if not self.built:
+            self.rebuild(cursor)
+            return
+        if self.appended:
+            self.refresh_appended(cursor)
+        if self.pending:
+            self.refresh_pending(cursor)
+
+    def _matches(self, term: str) -> dict:
+        # Wszystkie tokeny zaczynajace sie od term: {pk: wynik}. Dokladne
+        # trafienie wazy podwojnie, rzadkie tokeny wyzej (idf).
+        scores = {}
+        total = len(self._docs) or 1
+        start = bisect_left(self._terms, term)
+        for token in self._terms[start:]:
+            if not token.startswith(term):
+                break
+            postings = self._postings[token]
+            weight = math.log(1 + total / len(postings)) * (2.0 if token == term else 1.0)
+            for pk, count in postings.items():
+                scores[pk] = scores.get(pk, 0.0) + weight * (1 + math.log(count))
+        return scores
+
+    def search(self, query: str) -> list:
+        # Wszystkie slowa zapytania musza wystapic (jako prefiks tokenu w wierszu)
+        terms = tokenize(query)
+        if not terms:
+            return []
+        scores = None
+        for term in dict.fromkeys(terms):
+            matches = self._matches(term)
+            if scores is None:
+                scores = matches
+            else:
+                scores = {pk: score + matches[pk] for pk, score in scores.items() if pk in matches}
+            if not scores:
+                return []
+        return sorted(scores, key=lambda pk: (-scores[pk], pk))
+
+
+def fetch_by_pk(cursor, select_sql: str, pk: str, keys: list) -> list:
+    rows = []
+    limit = IN_LIST_SIZES[-1]
+    for start in range(0, len(keys), limit):
+        chunk = keys[start:start + limit]
+        size = next(n for n in IN_LIST_SIZES if n >= len(chunk))
+        binds = {f"k{i}": chunk[min(i, len(chunk) - 1)] for i in range(size)}
+        sql = f"{select_sql} WHERE {pk} IN ({', '.join(':' + name for name in binds)})"
+        rows.extend(fetch_dicts(cursor, sql, binds))
+    return rows
+
+
+_indexes = {}
+_indexes_lock = Lock()
+
+
+def get_index(table: str) -> TableIndex:
+    with _indexes_lock:
+        index = _indexes.get(table)
+        if index is None:
+            index = _indexes[table] = TableIndex(table)
+        return index
+
+
+def reset():
+    # Po przeladowaniu rejestru schematu - indeksy zostana zbudowane od nowa
+    with _indexes_lock:
+        _indexes.clear()
+
+
+def mark_changed(table: str, *pks):
+    # Po INSERT/UPDATE/DELETE ze znanym kluczem - wiersz zostanie doczytany przed
+    # nastepnym wyszukiwaniem
+    index = get_index(table)
+    with index.lock:
+        if index.built:
+            index.pending.update(index.key(pk) for pk in pks if pk is not None)
+
+
+def mark_appended(table: str):
+    # Po INSERT, ktory nie zwraca klucza (np. funkcja PL/SQL) - doczytanie wierszy
+    # z kluczem wiekszym niz dotychczas zaindeksowane
+    index = get_index(table)
+    with index.lock:
+        if index.numeric_pk:
+            index.appended = True
+        else:
+            index.built = False
+
+
+def mark_stale(table: str):
+    # Gdy zmienionych kluczy nie da sie ustalic - pelna przebudowa przy nastepnym wyszukiwaniu
+    index = get_index(table)
+    with index.lock:
+        index.built = False
+
+
+def search(cursor, table: str, query: str, limit=None, offset: int = 0) -> tuple[list, int]:
+    index = get_index(table)
+    with index.lock:
+        index.ensure_fresh(cursor)
+        ranked = index.search(query)
+    total = len(ranked)
+    page = ranked[offset:offset + limit] if limit is not None else ranked[offset:]
+    if not page:
+        return [], total
+    rows = {row[index.pk]: row for row in fetch_by_pk(cursor, f"SELECT * FROM {table}", index.pk, page)}
+    return [rows[pk] for pk in page if pk in rows], total
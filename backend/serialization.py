@@ -0,0 +1,136 @@
+# Serializacja wynikow zapytan: konwerter wiersza jest kompilowany raz na dany
+# cursor.description (nazwy kolumn + typy) i trzymany w cache wedlug tresci
+# zapytania, a nastepnie podpinany jako cursor.rowfactory - sterownik zwraca od
+# razu slowniki, bez petli isinstance() po kazdej wartosci. Konwersji wymagaja
+# tylko kolumny DATE/TIMESTAMP; NUMBER sterownik zwraca jako int/float.
+# Gotowe listy sa kodowane do bajtow JSON (orjson, jesli jest zainstalowany)
+# w watku bazy danych i zwracane przez JSONBytesResponse z pominieciem
+# jsonable_encoder.
+import json
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+from threading import Lock
+
+from fastapi.responses import Response
+
+from storage import DATE_DB_TYPES
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - zalezy od srodowiska
+    orjson = None
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+ROWFACTORY_CACHE_SIZE = 256
+
+
+def format_date(value: datetime) -> str:
+    # Rownowazne strftime(DATE_FORMAT), ale kilkukrotnie szybsze
+    return value.isoformat(" ", "seconds")
+
+
+def compile_rowfactory(description):
+    columns = tuple(col[0].lower() for col in description)
+    date_indexes = tuple(i for i, col in enumerate(description) if col[1] in DATE_DB_TYPES)
+    if not date_indexes:
+        def rowfactory(*row):
+            return dict(zip(columns, row))
+        return rowfactory
+    if len(date_indexes) == 1:
+        (index,) = date_indexes
+        name = columns[index]
+        def rowfactory(*row):
+            result = dict(zip(columns, row))
+            value = row[index]
+            if value is not None:
+                result[name] = value.isoformat(" ", "seconds")
+            return result
+        return rowfactory
+    date_columns = tuple((i, columns[i]) for i in date_indexes)
+    def rowfactory(*row):
+        result = dict(zip(columns, row))
+        for index, name in date_columns:
+            value = row[index]
+            if value is not None:
+                result[name] = value.isoformat(" ", "seconds")
+        return result
+    return rowfactory
+
+
+class RowFactoryCache:
+    # LRU: zapytanie -> (sygnatura description, skompilowany konwerter). Sygnatura
+    # chroni przed nieaktualnym konwerterem, gdy SELECT * zmieni ksztalt po ALTER TABLE.
+    def __init__(self, maxsize: int = ROWFACTORY_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, statement: str, description):
+        signature = tuple((col[0], col[1]) for col in description)
+        with self._lock:
+            entry = self._entries.get(statement)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(statement)
+                return entry[1]
+        rowfactory = compile_rowfactory(description)
+        with self._lock:
+            self._entries[statement] = (signature, rowfactory)
+            self._entries.move_to_end(statement)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return rowfactory
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+rowfactories = RowFactoryCache()
+
+
+def execute_dicts(cursor, sql: str, params=None):
+    # Wykonuje zapytanie i ustawia rowfactory - kolejne fetch* zwracaja slowniki
+    cursor.execute(sql, params)
+    cursor.rowfactory = rowfactories.get(sql, cursor.description)
+    return cursor
+
+
+def fetch_dicts(cursor, sql: str, params=None) -> list:
+    return execute_dicts(cursor, sql, params).fetchall()
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, datetime):
+        return format_date(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return value.decode(errors="replace")
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+if orjson is not None:
+    def dumps(obj) -> bytes:
+        return orjson.dumps(obj, default=_json_default)
+else:
+    _encoder = json.JSONEncoder(ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=_json_default)
+
+    def dumps(obj) -> bytes:
+        return _encoder.encode(obj).encode("utf-8")
+
+
+def fetch_json(cursor, conn, sql: str, params=None) -> bytes:
+    return dumps(fetch_dicts(cursor, sql, params))
+
+
+class JSONBytesResponse(Response):
+    # Przyjmuje gotowe bajty JSON (np. z fetch_json) albo obiekt do zakodowania
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
@@ -0,0 +1,92 @@
+# Dziennik wolnych zapytan: instrukcje, ktorych czas (execute + pobranie wierszy)
+# przekroczyl SLOW_QUERY_MS, trafiaja do bufora cyklicznego o rozmiarze
+# SLOW_QUERY_LOG_SIZE (GET /system/slow-queries). Zapisywany jest tekst SQL,
+# zamaskowane wartosci bindow (typ i dlugosc zamiast tresci - PESEL, hasla),
+# liczba wierszy i zadanie HTTP, w ramach ktorego wykonano instrukcje.
+# Pomiar wykonuje kursor z metrics.py; przy czasie ponizej progu koszt to jedno porownanie.
+import os
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime
+from threading import Lock
+
+from logconfig import get_logger
+from serialization import format_date
+
+THRESHOLD_MS = float(os.getenv("SLOW_QUERY_MS", "250"))   # < 0 wylacza dziennik
+LOG_SIZE = int(os.getenv("SLOW_QUERY_LOG_SIZE", "200"))
+MAX_SQL_LENGTH = 4000
+
+# "GET /reports/summary" - ustawiane przez middleware, przekazywane do watkow run_db
+current_request = ContextVar("current_request", default=None)
+log = get_logger("slowlog")
+
+
+def redact(params):
+    # Tylko ksztalt bindow: nazwy/pozycje i typ wartosci, bez samych wartosci
+    if params is None:
+        return None
+    if isinstance(params, dict):
+        return {name: _redact_value(value) for name, value in params.items()}
+    if isinstance(params, (list, tuple)):
+        return [_redact_value(value) for value in params]
+    return _redact_value(params)
+
+
+def _redact_value(value):
+    if value is None:
+        return None
+    if isinstance(value, (str, bytes)):
+        return f"<{type(value).__name__}:{len(value)}>"
+    return f"<{type(value).__name__}>"   # liczby, daty, zmienne kursora (cursor.var)
+
+
+class SlowQueryLog:
+    def __init__(self, threshold_ms: float = THRESHOLD_MS, size: int = LOG_SIZE):
+        self.threshold = threshold_ms / 1000 if threshold_ms >= 0 else None
+        self._entries = deque(maxlen=size)
+        self._lock = Lock()
+        self.recorded = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold is not None
+
+    def record(self, statement: str, sql: str, params, elapsed: float, rows: int):
+        entry = {
+            "ts": format_date(datetime.now()),
+            "statement": statement,
+            "elapsed_ms": round(elapsed * 1000, 1),
+            "rows": rows,
+            "request": current_request.get(),
+            "sql": " ".join(sql.split())[:MAX_SQL_LENGTH],
+            "binds": redact(params),
+        }
+        with self._lock:
+            self._entries.append(entry)
+            self.recorded += 1
+        log.warning("Slow query", extra={"fields": {"statement": statement, "elapsed_ms": entry["elapsed_ms"],
+                                                    "rows": rows, "request": entry["request"]}})
+
+    def entries(self, limit: int = None, min_ms: float = 0) -> list:
+        # Najnowsze najpierw
+        with self._lock:
+            entries = [entry for entry in reversed(self._entries) if entry["elapsed_ms"] >= min_ms]
+        return entries[:limit] if limit else entries
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            held = len(self._entries)
+        return {
+            "threshold_ms": round(self.threshold * 1000, 1) if self.enabled else None,
+            "size": self._entries.maxlen,
+            "held": held,
+            "recorded": self.recorded,
+        }
+
+
+slow_queries = SlowQueryLog()
@@ -0,0 +1,113 @@
+# Budowanie instrukcji SQL w postaci kanonicznej: kolumny w kolejnosci z
+# definicji tabeli (lub posortowane), stale nazwy bindow (:v_<kolumna>,
+# :id_value, :after_value, :after_pk, :limit_rows) i jednolite formatowanie.
+# Ta sama operacja na tym samym zbiorze kolumn daje zawsze identyczny tekst,
+# wiec trafia w cache instrukcji sterownika (stmtcachesize w db.py) i w shared
+# pool Oracle (soft parse zamiast hard parse). Gotowe teksty trzyma LRU
+# `statements` ze statystyka trafien (GET /system/statement-cache).
+import os
+from collections import OrderedDict
+from threading import Lock
+
+STATEMENT_CACHE_SIZE = int(os.getenv("SQL_BUILDER_CACHE_SIZE", "512"))
+
+
+class StatementCache:
+    def __init__(self, maxsize: int = STATEMENT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, build) -> str:
+        with self._lock:
+            sql = self._entries.get(key)
+            if sql is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return sql
+            self.misses += 1
+        sql = build()
+        with self._lock:
+            self._entries[key] = sql
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return sql
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            by_kind = {}
+            for key in self._entries:
+                by_kind[key[0]] = by_kind.get(key[0], 0) + 1
+            return {
+                "max_size": self.maxsize,
+                "statements": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+                "by_kind": by_kind,
+            }
+
+
+statements = StatementCache()
+
+
+def canonical_columns(table, columns=None) -> tuple:
+    # Kolumny w kolejnosci z definicji tabeli, bez powtorzen - niezaleznie od
+    # kolejnosci w zadaniu (?fields=b,a i ?fields=a,b daja ten sam tekst);
+    # None -> SELECT * (wszystkie kolumny, rowniez spoza rejestru schematu)
+    if columns is None:
+        return ("*",)
+    wanted = set(columns)
+    return tuple(col for col in table.columns if col in wanted)
+
+
+def bind_name(column: str) -> str:
+    return f"v_{column}"
+
+
+def binds(data: dict) -> dict:
+    return {bind_name(col): value for col, value in data.items()}
+
+
+def select(table, columns=None, order=(), where: str = None, fetch_first: bool = False) -> str:
+    # order: ((kolumna, malejaco), ...); where: gotowy predykat z bindami o stalych nazwach
+    columns = canonical_columns(table, columns)
+    order = tuple(order)
+    return statements.get(("select", table.name, columns, order, where, fetch_first), lambda: (
+        f"SELECT {', '.join(columns)} FROM {table.name}"
+        + (f" WHERE {where}" if where else "")
+        + (f" ORDER BY {', '.join(f'{col} DESC' if desc else f'{col} ASC' for col, desc in order)}" if order else "")
+        + (" FETCH FIRST :limit_rows ROWS ONLY" if fetch_first else "")
+    ))
+
+
+def insert(table, columns, returning: bool = True) -> str:
+    columns = tuple(sorted(columns))
+    return statements.get(("insert", table.name, columns, returning), lambda: (
+        f"INSERT INTO {table.name} ({', '.join(columns)}) "
+        f"VALUES ({', '.join(':' + bind_name(col) for col in columns)})"
+        + (f" RETURNING {table.pk} INTO :new_id" if returning else "")
+    ))
+
+
+def update(table, columns) -> str:
+    columns = tuple(sorted(columns))
+    return statements.get(("update", table.name, columns), lambda: (
+        f"UPDATE {table.name} SET {', '.join(f'{col} = :{bind_name(col)}' for col in columns)} "
+        f"WHERE {table.pk} = :id_value"
+    ))
+
+
+def delete(table) -> str:
+    return statements.get(("delete", table.name), lambda: f"DELETE FROM {table.name} WHERE {table.pk} = :id_value")
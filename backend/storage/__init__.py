@@ -0,0 +1,28 @@
+# Wybor silnika bazy danych (DB_BACKEND). Aplikacja korzysta z API sterownika
+# oracledb (pula sesji, kursory, cursor.var, callfunc, executemany z batcherrors,
+# wyniki niejawne), wiec backend to modul o tym samym interfejsie:
+#  - oracle (domyslnie) - sterownik oracledb i baza z INIT_DB.sql,
+#  - sqlite - wbudowana baza w pliku (storage/sqlite.py): WAL, mmap, schemat,
+#    widoki i triggery z storage/sqlite_schema.sql, procedury i pakiety PL/SQL
+#    przeniesione do Pythona (storage/plsql.py). Start bez kontenera Oracle,
+#    szybki cel dla testow i benchmarkow, male wdrozenia.
+# DB_DSN oznacza dla sqlite sciezke pliku bazy (domyslnie coop.db).
+import os
+
+BACKENDS = ("oracle", "sqlite")
+BACKEND = os.getenv("DB_BACKEND", "oracle").strip().lower()
+DEFAULT_DSN = {"oracle": "localhost:1521/XEPDB1", "sqlite": "coop.db"}
+
+
+def load_driver(name: str):
+    if name == "oracle":
+        import oracledb
+        return oracledb
+    if name == "sqlite":
+        from storage import sqlite
+        return sqlite
+    raise ValueError(f"Nieznany DB_BACKEND: {name} (dostepne: {', '.join(BACKENDS)})")
+
+
+driver = load_driver(BACKEND)
+DATE_DB_TYPES = (driver.DB_TYPE_DATE, driver.DB_TYPE_TIMESTAMP)
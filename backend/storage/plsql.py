@@ -0,0 +1,282 @@
+# Procedury, funkcje i pakiety PL/SQL z INIT_DB.sql przeniesione do Pythona dla
+# backendu sqlite. storage/sqlite.py wywoluje je zamiast blokow
+# "BEGIN [:wynik :=] nazwa(:1, ...); END;" i cursor.callfunc(...) - endpointy
+# w main.py dzialaja bez zmian. Argumenty IN przychodza jako wartosci, OUT jako
+# zmienne kursora (cursor.var) ustawiane przez setvalue; wartosc zwracana trafia
+# do zmiennej po lewej stronie ":=". Semantyka jak w PL/SQL: COMMIT wewnatrz
+# procedur, RAISE_APPLICATION_ERROR -> DatabaseError z kodem ORA-200xx, obsluga
+# NO_DATA_FOUND / WHEN OTHERS jak w oryginale.
+import re
+
+ROUTINES = {}
+
+
+class ApplicationError(Exception):
+    # RAISE_APPLICATION_ERROR(kod, komunikat); sqlite.py zamienia na DatabaseError
+    def __init__(self, code: int, message: str):
+        super().__init__(f"ORA-{abs(code)}: {message}")
+
+
+class NoDataFound(Exception):
+    def __init__(self):
+        super().__init__("ORA-01403: no data found")
+
+
+def routine(name: str):
+    def register(func):
+        ROUTINES[name.lower()] = func
+        return func
+    return register
+
+
+def get(name: str):
+    return ROUTINES.get(name.lower())
+
+
+def _sqlerrm(error) -> str:
+    # SQLERRM: komunikat bledu w formacie Oracle (ORA-xxxxx), jak z execute
+    from storage.sqlite import error_message
+    return error_message(error)
+
+
+def _select_into(db, sql: str, params):
+    # SELECT ... INTO: brak wiersza -> NO_DATA_FOUND
+    row = db.execute(sql, params).fetchone()
+    if row is None:
+        raise NoDataFound()
+    return row[0]
+
+
+# ------------------------------------------------------------------ LAB 11: procedury
+
+@routine("dodaj_czlonka")
+def dodaj_czlonka(db, id_mieszkania, imie, nazwisko, pesel=None, telefon=None, email=None, out_id=None):
+    try:
+        cursor = db.execute(
+            "INSERT INTO czlonek (id_mieszkania, imie, nazwisko, pesel, telefon, email) VALUES (?, ?, ?, ?, ?, ?)",
+            (id_mieszkania, imie, nazwisko, pesel, telefon, email))
+        out_id.setvalue(0, cursor.lastrowid)
+        db.commit()
+    except Exception as e:
+        if "UNIQUE" in str(e):
+            raise ApplicationError(-20002, "Czlonek o takim identyfikatorze juz istnieje") from e
+        raise ApplicationError(-20003, f"Blad podczas dodawania czlonka: {_sqlerrm(e)}") from e
+
+
+@routine("aktualizuj_czlonka")
+def aktualizuj_czlonka(db, id_czlonka, imie=None, nazwisko=None, telefon=None, email=None, out_rows=None):
+    try:
+        cursor = db.execute("""
+            UPDATE czlonek
+            SET imie = COALESCE(?, imie), nazwisko = COALESCE(?, nazwisko),
+                telefon = COALESCE(?, telefon), email = COALESCE(?, email)
+            WHERE id_czlonka = ?
+        """, (imie, nazwisko, telefon, email, id_czlonka))
+        out_rows.setvalue(0, cursor.rowcount)
+        if cursor.rowcount == 0:
+            raise ApplicationError(-20004, f"Nie znaleziono czlonka o ID: {id_czlonka}")
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+
+@routine("usun_czlonka")
+def usun_czlonka(db, id_czlonka, out_rows=None):
+    try:
+        cursor = db.execute("DELETE FROM czlonek WHERE id_czlonka = ?", (id_czlonka,))
+        out_rows.setvalue(0, cursor.rowcount)
+        if cursor.rowcount == 0:
+            raise ApplicationError(-20005, f"Nie znaleziono czlonka o ID: {id_czlonka}")
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+
+def _zwieksz_ceny(db, procent):
+    # cena_za_jednostke to NUMBER(10,2) - Oracle zaokragla przy zapisie
+    db.execute("UPDATE uslugi SET cena_za_jednostke = ROUND(cena_za_jednostke * (1 + ? / 100.0), 2)", (procent,))
+    db.commit()
+
+
+@routine("zwieksz_oplaty")
+def zwieksz_oplaty(db, procent=10):
+    _zwieksz_ceny(db, procent)
+
+
+@routine("zglos_naprawe")
+def zglos_naprawe(db, id_mieszkania, opis, out_id=None):
+    try:
+        cursor = db.execute("INSERT INTO naprawa (id_mieszkania, opis, status) VALUES (?, ?, 'zgloszona')",
+                            (id_mieszkania, opis))
+        out_id.setvalue(0, cursor.lastrowid)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise ApplicationError(-20020, f"Blad podczas zglaszania naprawy: {_sqlerrm(e)}") from e
+
+
+# ------------------------------------------------------------------ LAB 11: funkcje
+
+@routine("pobierz_czlonkow_budynku")
+def pobierz_czlonkow_budynku(db, id_budynku):
+    rows = db.execute("""
+        SELECT c.imie, c.nazwisko
+        FROM czlonek c
+        JOIN mieszkanie m ON c.id_mieszkania = m.id_mieszkania
+        WHERE m.id_budynku = ?
+    """, (id_budynku,))
+    # Pusty VARCHAR2 to w Oracle NULL
+    return "".join(f"{imie} {nazwisko}; " for imie, nazwisko in rows) or None
+
+
+@routine("dodaj_spotkanie")
+def dodaj_spotkanie(db, temat, miejsce, data=None):
+    try:
+        if data is None:
+            cursor = db.execute("INSERT INTO spotkanie_mieszkancow (temat, miejsce) VALUES (?, ?)", (temat, miejsce))
+        else:
+            cursor = db.execute("INSERT INTO spotkanie_mieszkancow (temat, miejsce, data_spotkania) VALUES (?, ?, ?)",
+                                (temat, miejsce, data))
+        db.commit()
+        return cursor.lastrowid
+    except Exception:
+        db.rollback()
+        return -1
+
+
+@routine("dodaj_oplate_fn")
+def dodaj_oplate_fn(db, id_mieszkania, id_uslugi, zuzycie):
+    cena = _select_into(db, "SELECT cena_za_jednostke FROM uslugi WHERE id_uslugi = ?", (id_uslugi,))
+    kwota = cena * zuzycie
+    db.execute("INSERT INTO oplata (id_mieszkania, id_uslugi, kwota, zuzycie) VALUES (?, ?, ROUND(?, 2), ?)",
+               (id_mieszkania, id_uslugi, kwota, zuzycie))
+    db.commit()
+    return kwota
+
+
+@routine("aktualizuj_saldo_konta")
+def aktualizuj_saldo_konta(db, id_konta, nowe_saldo):
+    try:
+        rows = db.execute("UPDATE konto_spoldzielni SET saldo = ? WHERE id_konta = ?", (nowe_saldo, id_konta)).rowcount
+        db.commit()
+        return rows
+    except Exception:
+        db.rollback()
+        return -1
+
+
+# ------------------------------------------------------------------ LAB 12: coop_pkg
+
+@routine("coop_pkg.zwieksz_oplaty_pkg")
+def zwieksz_oplaty_pkg(db, procent=10):
+    _zwieksz_ceny(db, procent)
+
+
+@routine("coop_pkg.policz_naprawy_pracownika")
+def policz_naprawy_pracownika(db, id_pracownika):
+    return _select_into(db, "SELECT COUNT(*) FROM naprawa WHERE id_pracownika = ?", (id_pracownika,))
+
+
+@routine("coop_pkg.suma_oplat_mieszkania")
+def suma_oplat_mieszkania(db, id_mieszkania):
+    return _select_into(db, "SELECT COALESCE(SUM(kwota), 0) FROM oplata WHERE id_mieszkania = ?", (id_mieszkania,))
+
+
+# ------------------------------------------------------------------ LAB 12: coop_crud_pkg
+
+@routine("coop_crud_pkg.insert_budynek")
+def insert_budynek(db, adres, liczba_pieter, rok_budowy, out_id=None):
+    try:
+        cursor = db.execute("INSERT INTO budynek (adres, liczba_pieter, rok_budowy) VALUES (?, ?, ?)",
+                            (adres, liczba_pieter, rok_budowy))
+    except Exception as e:
+        if "UNIQUE" not in str(e):
+            raise
+        out_id.setvalue(0, -1)
+        raise ApplicationError(-20010, "Budynek o tym adresie juz istnieje") from e
+    out_id.setvalue(0, cursor.lastrowid)
+    db.commit()
+
+
+@routine("coop_crud_pkg.update_budynek")
+def update_budynek(db, id_budynku, adres, liczba_pieter):
+    cursor = db.execute("UPDATE budynek SET adres = ?, liczba_pieter = ? WHERE id_budynku = ?",
+                        (adres, liczba_pieter, id_budynku))
+    if cursor.rowcount == 0:
+        raise ApplicationError(-20011, f"Nie znaleziono budynku o ID: {id_budynku}")
+    db.commit()
+
+
+@routine("coop_crud_pkg.delete_budynek")
+def delete_budynek(db, id_budynku, out_deleted=None):
+    try:
+        out_deleted.setvalue(0, db.execute("DELETE FROM budynek WHERE id_budynku = ?", (id_budynku,)).rowcount)
+        db.commit()
+    except Exception:
+        out_deleted.setvalue(0, 0)
+        db.rollback()
+
+
+@routine("coop_crud_pkg.pobierz_nazwisko_czlonka")
+def pobierz_nazwisko_czlonka(db, id_czlonka):
+    rows = db.execute("SELECT nazwisko FROM czlonek WHERE id_czlonka = ?", (id_czlonka,)).fetchmany(2)
+    if not rows:
+        return "Nie znaleziono"
+    if len(rows) > 1:
+        return "Wiele wynikow"
+    return rows[0][0]
+
+
+@routine("coop_crud_pkg.pobierz_adres_budynku")
+def pobierz_adres_budynku(db, id_budynku):
+    row = db.execute("SELECT adres FROM budynek WHERE id_budynku = ?", (id_budynku,)).fetchone()
+    return row[0] if row is not None else "Nie znaleziono"
+
+
+@routine("coop_crud_pkg.statystyki_budynku")
+def statystyki_budynku(db, id_budynku):
+    try:
+        mieszkan = _select_into(db, "SELECT COUNT(*) FROM mieszkanie WHERE id_budynku = ?", (id_budynku,))
+        czlonkow = _select_into(db, """
+            SELECT COUNT(*) FROM czlonek c JOIN mieszkanie m ON c.id_mieszkania = m.id_mieszkania
+            WHERE m.id_budynku = ?
+        """, (id_budynku,))
+        napraw = _select_into(db, """
+            SELECT COUNT(*) FROM naprawa n JOIN mieszkanie m ON n.id_mieszkania = m.id_mieszkania
+            WHERE m.id_budynku = ?
+        """, (id_budynku,))
+    except Exception as e:
+        return f"Blad: {_sqlerrm(e)}"
+    return f"Mieszkan: {mieszkan}, Czlonkow: {czlonkow}, Napraw: {napraw}"
+
+
+# ------------------------------------------------------------------ LAB 13: dynamiczny SQL
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_]\w*$")
+
+
+@routine("policz_rekordy")
+def policz_rekordy(db, nazwa_tabeli):
+    # EXECUTE IMMEDIATE 'SELECT COUNT(*) FROM ' || p_nazwa_tabeli; kazdy blad -> -1.
+    # Nazwa musi byc istniejaca tabela lub widokiem - bez doklejania dowolnego tekstu do SQL
+    name = str(nazwa_tabeli or "").strip()
+    if not _IDENTIFIER.match(name):
+        return -1
+    exists = db.execute("SELECT 1 FROM sqlite_master WHERE type IN ('table', 'view') AND name = ? COLLATE NOCASE",
+                        (name,)).fetchone()
+    if exists is None:
+        return -1
+    try:
+        return db.execute(f'SELECT COUNT(*) FROM "{name}"').fetchone()[0]
+    except Exception:
+        return -1
+
+
+# ------------------------------------------------------------------ LAB 9: widoki zmaterializowane
+
+@routine("dbms_mview.refresh")
+def mview_refresh(db, names, methods=None):
+    # Widoki mv_* sa w SQLite zwyklymi widokami - zawsze aktualne
+    return None
@@ -0,0 +1,637 @@
+# Backend sqlite (DB_BACKEND=sqlite): wbudowana baza w pliku DB_DSN z interfejsem
+# sterownika oracledb uzywanym przez aplikacje - pula sesji (create_pool/acquire),
+# kursory z description/rowfactory/arraysize, cursor.var, callfunc/callproc,
+# executemany z batcherrors i arraydmlrowcounts, wyniki niejawne bloku DECLARE
+# (getimplicitresults) oraz bledy z kodami ORA-xxxxx (translate_oracle_error
+# w main.py dziala bez zmian).
+# Baza: WAL (czytelnicy nie blokuja pisarza), I/O mapowane w pamieci
+# (SQLITE_MMAP_SIZE), klucze obce wlaczone, transakcje zapisu BEGIN IMMEDIATE
+# (oczekiwanie do SQLITE_BUSY_TIMEOUT zamiast bledu przy rownoleglych zapisach).
+# Pusty plik dostaje schemat z sqlite_schema.sql przy pierwszym polaczeniu.
+# Tekst SQL w dialekcie Oracle jest tlumaczony raz na tekst (cache): binds :1 ->
+# ?1, FETCH FIRST n ROWS ONLY -> LIMIT, NVL -> COALESCE, SYSDATE, FOR UPDATE,
+# RETURNING ... INTO :zmienna oraz kolejnosc NULL jak w Oracle (ASC NULLS LAST,
+# DESC NULLS FIRST - stronicowanie keyset w pagination.py na tym polega).
+# Bloki "BEGIN [:x :=] nazwa(...); END;" i callfunc wywoluja procedury z plsql.py.
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import date, datetime
+from decimal import Decimal
+
+from logconfig import get_logger
+from storage import plsql
+
+POOL_GETMODE_WAIT = 0
+POOL_GETMODE_NOWAIT = 1
+POOL_GETMODE_FORCEGET = 2
+POOL_GETMODE_TIMEDWAIT = 3
+
+DB_TYPE_NUMBER = "DB_TYPE_NUMBER"
+DB_TYPE_VARCHAR = "DB_TYPE_VARCHAR"
+DB_TYPE_DATE = "DB_TYPE_DATE"
+DB_TYPE_TIMESTAMP = "DB_TYPE_TIMESTAMP"
+DB_TYPE_RAW = "DB_TYPE_RAW"
+
+SCHEMA_FILE = os.path.join(os.path.dirname(__file__), "sqlite_schema.sql")
+TRANSLATION_CACHE_SIZE = 2048
+
+log = get_logger("storage")
+
+
+class SQLiteConfig:
+    MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))   # bajty; 0 wylacza mmap
+    SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL").upper()          # NORMAL jest bezpieczne w trybie WAL
+    BUSY_TIMEOUT = int(os.getenv("SQLITE_BUSY_TIMEOUT", "5000"))             # ms oczekiwania na blokade zapisu
+
+
+class Error(Exception):
+    pass
+
+
+class DatabaseError(Error):
+    pass
+
+
+class IntegrityError(DatabaseError):
+    pass
+
+
+class BatchError:
+    # Element getbatcherrors(): pozycja wiersza w partii i komunikat ORA
+    def __init__(self, offset: int, message: str):
+        self.offset = offset
+        self.message = message
+        self.code = int(message[4:9]) if message.startswith("ORA-") and message[4:9].isdigit() else 0
+
+    def __repr__(self):
+        return f"BatchError(offset={self.offset}, message={self.message!r})"
+
+
+# ------------------------------------------------------------------ typy
+
+def _adapt_datetime(value: datetime) -> str:
+    return value.isoformat(" ", "seconds") if not value.microsecond else value.isoformat(" ")
+
+
+def _adapt_date(value: date) -> str:
+    return f"{value.isoformat()} 00:00:00"
+
+
+def _convert_datetime(value: bytes):
+    text = value.decode()
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        return text
+
+
+sqlite3.register_adapter(datetime, _adapt_datetime)
+sqlite3.register_adapter(date, _adapt_date)
+sqlite3.register_adapter(Decimal, float)
+sqlite3.register_converter("DATE", _convert_datetime)
+sqlite3.register_converter("TIMESTAMP", _convert_datetime)
+
+
+def _db_type(value) -> str:
+    if isinstance(value, datetime):
+        return DB_TYPE_DATE
+    if isinstance(value, (int, float)):
+        return DB_TYPE_NUMBER
+    if isinstance(value, bytes):
+        return DB_TYPE_RAW
+    return DB_TYPE_VARCHAR
+
+
+# ------------------------------------------------------------------ bledy
+
+_ERROR_PATTERNS = (
+    (re.compile(r"UNIQUE constraint failed: (.+)"), "ORA-00001: unique constraint ({0}) violated"),
+    (re.compile(r"NOT NULL constraint failed: (.+)"), "ORA-01400: cannot insert NULL into ({0})"),
+    (re.compile(r"no such table: (.+)"), "ORA-00942: table or view does not exist ({0})"),
+    (re.compile(r"no such column: (.+)"), "ORA-00904: {0}: invalid identifier"),
+    (re.compile(r"(database is locked)"), "ORA-00054: resource busy ({0})"),
+)
+
+
+def error_message(error, sql: str = None) -> str:
+    # Komunikat SQLite -> komunikat w formacie Oracle (kody rozpoznaje translate_oracle_error)
+    message = str(error)
+    if message.startswith("ORA-"):
+        return message
+    if "FOREIGN KEY constraint failed" in message:
+        if sql is not None and sql.lstrip()[:6].upper() == "DELETE":
+            return "ORA-02292: integrity constraint violated - child record found"
+        return "ORA-02291: integrity constraint violated - parent key not found"
+    for pattern, template in _ERROR_PATTERNS:
+        match = pattern.search(message)
+        if match is not None:
+            return template.format(match.group(1))
+    return message
+
+
+def _database_error(error, sql: str = None) -> DatabaseError:
+    kind = IntegrityError if isinstance(error, sqlite3.IntegrityError) else DatabaseError
+    return kind(error_message(error, sql))
+
+
+# ------------------------------------------------------------------ dialekt
+
+_LITERAL = re.compile(r"('(?:[^']|'')*')")
+_FETCH_FIRST = re.compile(r"\bFETCH\s+FIRST\s+(:\w+|\d+)\s+ROWS?\s+ONLY\b", re.I)
+_NVL = re.compile(r"\bNVL\s*\(", re.I)
+_SYSDATE = re.compile(r"\bSYSDATE\b", re.I)
+_SYSTIMESTAMP = re.compile(r"\bSYSTIMESTAMP\b", re.I)
+_FOR_UPDATE = re.compile(r"\s+FOR\s+UPDATE\b(?:\s+OF\s+[\w.,\s]+?)?(?:\s+(?:NOWAIT|SKIP\s+LOCKED))?\s*$", re.I)
+_NULLS_ORDER = re.compile(r"\b(ASC|DESC)\b(?!\s+NULLS\b)", re.I)
+_POSITIONAL = re.compile(r"(?<![\w:]):(\d+)\b")
+_RETURNING = re.compile(r"\s+RETURNING\s+(.+?)\s+INTO\s+(:\w+(?:\s*,\s*:\w+)*)\s*$", re.I | re.S)
+_SELECT_STAR = re.compile(r"^\s*SELECT\s+\*", re.I)
+# Widok -> wersja z kolumnami INVISIBLE (tylko dla zapytan z jawna lista kolumn)
+INVISIBLE_VIEWS = {"v_czlonek_bezpieczny": "v_czlonek_bezpieczny_pelny"}
+_INVISIBLE = {view: re.compile(rf"\b{view}\b", re.I) for view in INVISIBLE_VIEWS}
+
+_translations = {}
+_translations_lock = threading.Lock()
+
+
+class Translation:
+    __slots__ = ("sql", "returning", "lock")
+
+    def __init__(self, sql: str, returning: tuple, lock: bool):
+        self.sql = sql
+        self.returning = returning   # nazwy bindow RETURNING ... INTO
+        self.lock = lock             # SELECT ... FOR UPDATE -> transakcja zapisu
+
+
+def _translate_code(code: str) -> str:
+    code = _FETCH_FIRST.sub(r"LIMIT \1", code)
+    code = _NVL.sub("COALESCE(", code)
+    code = _SYSDATE.sub("datetime('now', 'localtime')", code)
+    code = _SYSTIMESTAMP.sub("strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime')", code)
+    code = _NULLS_ORDER.sub(lambda m: f"{m.group(1)} NULLS {'LAST' if m.group(1).upper() == 'ASC' else 'FIRST'}", code)
+    return _POSITIONAL.sub(r"?\1", code)
+
+
+def translate(statement: str) -> Translation:
+    translation = _translations.get(statement)
+    if translation is not None:
+        return translation
+    sql = statement.strip().rstrip(";")
+    returning = ()
+    match = _RETURNING.search(sql)
+    if match is not None:
+        returning = tuple(name.strip().lstrip(":") for name in match.group(2).split(","))
+        sql = f"{sql[:match.start()]} RETURNING {match.group(1)}"
+    lock = False
+    match = _FOR_UPDATE.search(sql)
+    if match is not None:
+        sql, lock = sql[:match.start()], True
+    if not _SELECT_STAR.match(sql):
+        for view, pattern in _INVISIBLE.items():
+            sql = pattern.sub(INVISIBLE_VIEWS[view], sql)
+    parts = _LITERAL.split(sql)
+    parts[::2] = [_translate_code(part) for part in parts[::2]]
+    translation = Translation("".join(parts), returning, lock)
+    with _translations_lock:
+        if len(_translations) >= TRANSLATION_CACHE_SIZE:
+            _translations.clear()
+        _translations[statement] = translation
+    return translation
+
+
+# ------------------------------------------------------------------ PL/SQL
+
+_CALL = re.compile(r"^\s*BEGIN\s+(?::(\w+)\s*:=\s*)?([\w.$]+)\s*(?:\((.*)\))?\s*;\s*END\s*;?\s*$", re.I | re.S)
+_OPEN_FOR = re.compile(r"\bOPEN\s+\w+\s+FOR\s+(.*?);", re.I | re.S)
+_ALTER_TRIGGER = re.compile(r"^\s*ALTER\s+TRIGGER\s+(\w+)\s+(ENABLE|DISABLE)\s*;?\s*$", re.I)
+_ALTER_IDENTITY = re.compile(r"^\s*ALTER\s+TABLE\s+\w+\s+MODIFY\b.*\bIDENTITY\b", re.I | re.S)
+_NUMBER = re.compile(r"^-?\d+(?:\.\d+)?$")
+
+
+def _bind(parameters, name: str):
+    if isinstance(parameters, dict):
+        return parameters[name]
+    return parameters[int(name) - 1]
+
+
+def _argument(parameters, text: str):
+    # Argument wywolania: bind (:1, :nazwa) albo prosty literal
+    text = text.strip()
+    if text.startswith(":"):
+        return _bind(parameters, text[1:])
+    if text.upper() == "NULL":
+        return None
+    if text.startswith("'") and text.endswith("'"):
+        return text[1:-1].replace("''", "'")
+    if _NUMBER.match(text):
+        return float(text) if "." in text else int(text)
+    raise DatabaseError(f"ORA-06550: nieobslugiwany argument wywolania: {text}")
+
+
+def _split_arguments(text: str) -> list:
+    if not text or not text.strip():
+        return []
+    return [part for part in re.split(r",(?=(?:[^']*'[^']*')*[^']*$)", text)]
+
+
+# ------------------------------------------------------------------ kursor
+
+class Var:
+    def __init__(self, typ=None, *args, **kwargs):
+        self.type = typ
+        self.value = None
+
+    def getvalue(self, pos=0):
+        return self.value
+
+    def setvalue(self, pos, value):
+        if value is not None and self.type in (int, float, str):
+            value = self.type(value)
+        self.value = value
+
+
+class Cursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.arraysize = 100
+        self.prefetchrows = 2
+        self.rowfactory = None
+        self.description = None
+        self.rowcount = 0
+        self._cursor = connection._db.cursor()
+        self._buffer = []
+        self._position = 0
+        self._implicit = []
+        self._batch_errors = []
+        self._dml_counts = []
+
+    # --- wykonanie
+
+    def _run(self, sql: str, binds, statement: str):
+        try:
+            self._cursor.execute(sql, binds)
+        except sqlite3.Error as e:
+            raise _database_error(e, statement) from e
+
+    def _begin_rows(self):
+        self._buffer, self._position = [], 0
+        description = self._cursor.description
+        if description is None:
+            self.description = None
+            self.rowcount = max(self._cursor.rowcount, 0)
+            return
+        # Typy kolumn z pierwszej partii wierszy (SQLite nie ma typow wyniku);
+        # DATE/TIMESTAMP z tabel wracaja jako datetime (PARSE_DECLTYPES)
+        self._buffer = self._cursor.fetchmany(max(self.arraysize, 1))
+        types = []
+        for index in range(len(description)):
+            value = next((row[index] for row in self._buffer if row[index] is not None), None)
+            types.append(_db_type(value))
+        self.description = [(col[0], typ, None, None, None, None, True) for col, typ in zip(description, types)]
+        self.rowcount = 0
+
+    def execute(self, statement, parameters=None, **kwargs):
+        parameters = parameters if parameters is not None else (kwargs or ())
+        self._implicit = []
+        head = statement.lstrip()[:8].upper()
+        if head.startswith(("BEGIN", "DECLARE")):
+            self._plsql(statement, parameters)
+            return None
+        if head.startswith("ALTER"):
+            self._alter(statement)
+            return None
+        translation = translate(statement)
+        binds = tuple(parameters) if isinstance(parameters, (list, tuple)) else parameters
+        db = self.connection._db
+        if translation.lock and not db.in_transaction:
+            db.execute("BEGIN IMMEDIATE")
+        self._run(translation.sql, binds, statement)
+        if translation.returning:
+            row = self._cursor.fetchone()
+            for name, value in zip(translation.returning, row or ()):
+                _bind(parameters, name).setvalue(0, value)
+            self._cursor.fetchall()
+        self._begin_rows()
+        return self if self.description else None
+
+    def executemany(self, statement, parameters, batcherrors=False, arraydmlrowcounts=False, **kwargs):
+        translation = translate(statement)
+        if isinstance(parameters, int):
+            parameters = [()] * parameters
+        rows = [tuple(binds) if isinstance(binds, (list, tuple)) else binds for binds in parameters]
+        self._batch_errors, self._dml_counts = [], []
+        self._implicit, self.description = [], None
+        if not batcherrors and not arraydmlrowcounts:
+            # Bez raportu per wiersz - petla w C (sqlite3.executemany)
+            try:
+                self._cursor.executemany(translation.sql, rows)
+            except sqlite3.Error as e:
+                raise _database_error(e, statement) from e
+            self.rowcount = max(self._cursor.rowcount, 0)
+            return
+        total = 0
+        for offset, binds in enumerate(rows):
+            try:
+                self._cursor.execute(translation.sql, binds)
+            except sqlite3.Error as e:
+                if not batcherrors:
+                    raise _database_error(e, statement) from e
+                self._batch_errors.append(BatchError(offset, error_message(e, statement)))
+                self._dml_counts.append(0)
+                continue
+            count = max(self._cursor.rowcount, 0)
+            self._dml_counts.append(count)
+            total += count
+        self.rowcount = total
+
+    def _plsql(self, statement: str, parameters):
+        selects = _OPEN_FOR.findall(statement)
+        if selects:
+            # Kursory "OPEN c FOR SELECT ..." zwracane przez DBMS_SQL.RETURN_RESULT
+            for select in selects:
+                child = Cursor(self.connection)
+                child.execute(select, parameters)
+                self._implicit.append(child)
+            self.description = None
+            return
+        match = _CALL.match(statement)
+        if match is None:
+            raise DatabaseError("ORA-06550: blok PL/SQL nieobslugiwany przez backend sqlite")
+        target, name, arguments = match.groups()
+        args = [_argument(parameters, text) for text in _split_arguments(arguments)]
+        result = self._call(name, args)
+        if target is not None:
+            _bind(parameters, target).setvalue(0, result)
+        self.description = None
+
+    def _call(self, name: str, args: list):
+        routine = plsql.get(name)
+        if routine is None:
+            raise DatabaseError(f"ORA-06550: PLS-00201: identifier '{name.upper()}' must be declared")
+        try:
+            return routine(self.connection._db, *args)
+        except (plsql.ApplicationError, plsql.NoDataFound) as e:
+            raise DatabaseError(str(e)) from e
+        except sqlite3.Error as e:
+            raise _database_error(e) from e
+
+    def _alter(self, statement: str):
+        # ALTER TRIGGER ... DISABLE/ENABLE (tools/datagen.py --disable-triggers) - trigger
+        # Oracle to kilka triggerow SQLite (nazwa_ins/_upd/_del); definicje wylaczonych
+        # czekaja w tabeli disabled_triggers. Wyrownanie IDENTITY nie jest potrzebne
+        # (AUTOINCREMENT kontynuuje od najwiekszego klucza).
+        if _ALTER_IDENTITY.match(statement):
+            return
+        match = _ALTER_TRIGGER.match(statement)
+        if match is None:
+            raise DatabaseError("ORA-00940: instrukcja ALTER nieobslugiwana przez backend sqlite")
+        name, action = match.group(1).lower(), match.group(2).upper()
+        db = self.connection._db
+        pattern = (name, name.replace("_", r"\_") + r"\_%")
+        try:
+            if action == "DISABLE":
+                triggers = db.execute("SELECT name, sql FROM sqlite_master WHERE type = 'trigger' "
+                                      "AND (name = ? OR name LIKE ? ESCAPE '\\')", pattern).fetchall()
+                for trigger, definition in triggers:
+                    db.execute("INSERT OR REPLACE INTO disabled_triggers (name, definition) VALUES (?, ?)",
+                               (trigger, definition))
+                    db.execute(f'DROP TRIGGER "{trigger}"')
+            else:
+                triggers = db.execute("SELECT name, definition FROM disabled_triggers "
+                                      "WHERE name = ? OR name LIKE ? ESCAPE '\\'", pattern).fetchall()
+                for trigger, definition in triggers:
+                    db.execute(definition)
+                    db.execute("DELETE FROM disabled_triggers WHERE name = ?", (trigger,))
+            db.commit()
+        except sqlite3.Error as e:
+            db.rollback()
+            raise _database_error(e, statement) from e
+
+    def callfunc(self, name, return_type, parameters=None, keyword_parameters=None):
+        result = self._call(name, list(parameters or []))
+        if result is not None and return_type in (int, float, str):
+            result = return_type(result)
+        return result
+
+    def callproc(self, name, parameters=None, keyword_parameters=None):
+        self._call(name, list(parameters or []))
+        return list(parameters or [])
+
+    def var(self, typ, *args, **kwargs):
+        return Var(typ)
+
+    def getimplicitresults(self):
+        return list(self._implicit)
+
+    def getbatcherrors(self):
+        return list(self._batch_errors)
+
+    def getarraydmlrowcounts(self):
+        return list(self._dml_counts)
+
+    # --- pobieranie wierszy
+
+    def _take(self, size=None) -> list:
+        buffered = self._buffer[self._position:] if size is None else self._buffer[self._position:self._position + size]
+        self._position += len(buffered)
+        rows = buffered
+        remaining = None if size is None else size - len(buffered)
+        if remaining is None:
+            rows = rows + self._cursor.fetchall() if self.description else rows
+        elif remaining > 0 and self.description:
+            rows = rows + self._cursor.fetchmany(remaining)
+        self.rowcount += len(rows)
+        if self.rowfactory is not None:
+            rowfactory = self.rowfactory
+            return [rowfactory(*row) for row in rows]
+        return rows
+
+    def fetchone(self):
+        rows = self._take(1)
+        return rows[0] if rows else None
+
+    def fetchmany(self, size=None):
+        return self._take(size or self.arraysize)
+
+    def fetchall(self):
+        return self._take()
+
+    def __iter__(self):
+        while True:
+            rows = self._take(self.arraysize)
+            if not rows:
+                return
+            yield from rows
+
+    def close(self):
+        for child in self._implicit:
+            child.close()
+        self._implicit = []
+        self._buffer = []
+        self._cursor.close()
+
+
+# ------------------------------------------------------------------ polaczenia i pula
+
+_initialized = set()
+_init_lock = threading.Lock()
+
+
+def _statements(script: str):
+    # Podzial skryptu na instrukcje (triggery zawieraja ";" wewnatrz BEGIN ... END)
+    buffer = ""
+    for line in script.splitlines(keepends=True):
+        if not buffer and (not line.strip() or line.lstrip().startswith("--")):
+            continue
+        buffer += line
+        if sqlite3.complete_statement(buffer):
+            yield buffer
+            buffer = ""
+
+
+def _ensure_schema(db, path: str):
+    with _init_lock:
+        if path in _initialized:
+            return
+        db.execute("PRAGMA journal_mode = WAL")
+        db.execute("BEGIN IMMEDIATE")   # rownolegle procesy (workery uvicorn) czekaja na pierwszy
+        try:
+            exists = db.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'budynek'").fetchone()
+            if exists is None:
+                start = time.perf_counter()
+                with open(SCHEMA_FILE, encoding="utf-8") as f:
+                    for statement in _statements(f.read()):
+                        db.execute(statement)
+                log.info("SQLite schema created", extra={"fields": {
+                    "path": path, "elapsed_ms": round((time.perf_counter() - start) * 1000, 1)}})
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        _initialized.add(path)
+
+
+def _open(dsn: str, stmtcachesize: int = None):
+    path = dsn or "coop.db"
+    try:
+        db = sqlite3.connect(path, timeout=SQLiteConfig.BUSY_TIMEOUT / 1000, detect_types=sqlite3.PARSE_DECLTYPES,
+                             isolation_level="IMMEDIATE", check_same_thread=False,
+                             cached_statements=stmtcachesize or 128)
+        db.execute(f"PRAGMA mmap_size = {SQLiteConfig.MMAP_SIZE}")
+        db.execute(f"PRAGMA synchronous = {SQLiteConfig.SYNCHRONOUS}")
+        db.execute("PRAGMA foreign_keys = ON")
+        _ensure_schema(db, os.path.abspath(path))
+    except sqlite3.Error as e:
+        raise _database_error(e) from e
+    return db
+
+
+class Connection:
+    def __init__(self, db, pool=None, stmtcachesize: int = None):
+        self._db = db
+        self._pool = pool
+        self.stmtcachesize = stmtcachesize
+
+    def cursor(self):
+        return Cursor(self)
+
+    def commit(self):
+        try:
+            self._db.commit()
+        except sqlite3.Error as e:
+            raise _database_error(e) from e
+
+    def rollback(self):
+        self._db.rollback()
+
+    def ping(self):
+        self._db.execute("SELECT 1")
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.release(self)
+        else:
+            self._db.close()
+
+
+def connect(user=None, password=None, dsn=None, stmtcachesize=None, **kwargs):
+    return Connection(_open(dsn, stmtcachesize), stmtcachesize=stmtcachesize)
+
+
+class ConnectionPool:
+    # Pula polaczen SQLite o semantyce puli oracledb (min/max, timedwait, DPY-4005)
+    def __init__(self, dsn=None, min=1, max=2, increment=1, wait_timeout=0, getmode=POOL_GETMODE_WAIT,
+                 stmtcachesize=None, **kwargs):
+        self.dsn = dsn
+        self.min = min
+        self.max = max
+        self.wait_timeout = wait_timeout
+        self.getmode = getmode
+        self.stmtcachesize = stmtcachesize
+        self._idle = [self._new() for _ in range(min)]
+        self._busy = 0
+        self._opening = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def _new(self):
+        return Connection(_open(self.dsn, self.stmtcachesize), stmtcachesize=self.stmtcachesize)
+
+    @property
+    def opened(self):
+        return len(self._idle) + self._busy
+
+    @property
+    def busy(self):
+        return self._busy
+
+    def acquire(self):
+        with self._cond:
+            deadline = time.monotonic() + self.wait_timeout / 1000 if self.wait_timeout else None
+            while not self._idle and self.opened + self._opening >= self.max:
+                if self.getmode == POOL_GETMODE_NOWAIT:
+                    raise DatabaseError("DPY-4005: timed out waiting for the connection pool to return a connection")
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise DatabaseError("DPY-4005: timed out waiting for the connection pool to return a connection")
+                self._cond.wait(remaining)
+            if self._idle:
+                conn = self._idle.pop()
+                self._busy += 1
+                conn._pool = self
+                return conn
+            self._opening += 1
+        try:
+            conn = self._new()
+        finally:
+            with self._cond:
+                self._opening -= 1
+        with self._cond:
+            self._busy += 1
+        conn._pool = self
+        return conn
+
+    def release(self, connection):
+        connection._db.rollback()   # niezatwierdzone zmiany nie przechodza do nastepnego zadania
+        with self._cond:
+            connection._pool = None
+            self._busy -= 1
+            if self._closed:
+                connection._db.close()
+            else:
+                self._idle.append(connection)
+            self._cond.notify()
+
+    def close(self, force=False):
+        with self._cond:
+            self._closed = True
+            for connection in self._idle:
+                connection._db.close()
+            self._idle = []
+
+
+def create_pool(user=None, password=None, dsn=None, **kwargs):
+    return ConnectionPool(dsn=dsn, **kwargs)
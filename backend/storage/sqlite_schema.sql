@@ -0,0 +1,464 @@
+-- ==============================================================================
+-- Schemat bazy SQLite (DB_BACKEND=sqlite) - odpowiednik INIT_DB.sql
+-- Wykonywany przez storage/sqlite.py przy pierwszym polaczeniu z pustym plikiem
+-- bazy. Tabele, indeksy, widoki, triggery i dane testowe jak w INIT_DB.sql;
+-- procedury, funkcje i pakiety PL/SQL sa przeniesione do storage/plsql.py.
+-- Roznice wzgledem Oracle:
+--  - IDENTITY -> INTEGER PRIMARY KEY AUTOINCREMENT (identyfikatory nie sa uzywane ponownie),
+--  - DATE/TIMESTAMP przechowywane jako tekst 'RRRR-MM-DD GG:MM:SS' (sortowanie = chronologia),
+--  - widoki zmaterializowane sa zwyklymi widokami (zawsze aktualne, REFRESH nic nie robi),
+--  - kolumny INVISIBLE v_czlonek_bezpieczny emuluje widok v_czlonek_bezpieczny_pelny
+--    (storage/sqlite.py kieruje do niego zapytania z jawna lista kolumn),
+--  - slownik danych (user_tables, user_tab_columns, user_constraints, user_cons_columns,
+--    user_mviews) i DUAL to widoki na sqlite_master / pragma_* - schema.py i mviews.py
+--    dzialaja bez zmian.
+-- ==============================================================================
+
+
+-- ==============================================================================
+-- Tabele (LAB 7)
+-- ==============================================================================
+
+CREATE TABLE budynek (
+    id_budynku INTEGER PRIMARY KEY AUTOINCREMENT,
+    adres VARCHAR2(200) NOT NULL,
+    liczba_pieter NUMBER NOT NULL,
+    rok_budowy NUMBER(4),
+    liczba_mieszkan NUMBER,
+    typ_budynku VARCHAR2(50) DEFAULT 'blok'
+);
+
+CREATE TABLE mieszkanie (
+    id_mieszkania INTEGER PRIMARY KEY AUTOINCREMENT,
+    id_budynku NUMBER NOT NULL,
+    numer VARCHAR2(20) NOT NULL,
+    metraz NUMBER(10,2),
+    liczba_pokoi NUMBER,
+    CONSTRAINT fk_mieszkanie_budynek FOREIGN KEY (id_budynku) REFERENCES budynek(id_budynku) ON DELETE CASCADE
+);
+
+CREATE TABLE czlonek (
+    id_czlonka INTEGER PRIMARY KEY AUTOINCREMENT,
+    id_mieszkania NUMBER NOT NULL,
+    imie VARCHAR2(100) NOT NULL,
+    nazwisko VARCHAR2(100) NOT NULL,
+    pesel VARCHAR2(11),
+    telefon VARCHAR2(20),
+    email VARCHAR2(100),
+    data_przystapienia DATE DEFAULT (datetime('now', 'localtime')),
+    CONSTRAINT fk_czlonek_mieszkanie FOREIGN KEY (id_mieszkania) REFERENCES mieszkanie(id_mieszkania) ON DELETE CASCADE
+);
+
+CREATE TABLE pracownik (
+    id_pracownika INTEGER PRIMARY KEY AUTOINCREMENT,
+    imie VARCHAR2(100) NOT NULL,
+    nazwisko VARCHAR2(100) NOT NULL,
+    stanowisko VARCHAR2(100),
+    telefon VARCHAR2(20),
+    email VARCHAR2(100),
+    data_zatrudnienia DATE DEFAULT (datetime('now', 'localtime'))
+);
+
+CREATE TABLE uslugi (
+    id_uslugi INTEGER PRIMARY KEY AUTOINCREMENT,
+    nazwa_uslugi VARCHAR2(200) NOT NULL,
+    cena_za_jednostke NUMBER(10,2) NOT NULL,
+    jednostka_miary VARCHAR2(50)
+);
+
+CREATE TABLE naprawa (
+    id_naprawy INTEGER PRIMARY KEY AUTOINCREMENT,
+    id_mieszkania NUMBER NOT NULL,
+    id_pracownika NUMBER,
+    opis VARCHAR2(500),
+    data_zgloszenia DATE DEFAULT (datetime('now', 'localtime')),
+    data_wykonania DATE,
+    status VARCHAR2(50) DEFAULT 'zgloszona',
+    uwagi VARCHAR2(500),
+    priorytet VARCHAR2(20) DEFAULT 'sredni',
+    CONSTRAINT fk_naprawa_mieszkanie FOREIGN KEY (id_mieszkania) REFERENCES mieszkanie(id_mieszkania) ON DELETE CASCADE,
+    CONSTRAINT fk_naprawa_pracownik FOREIGN KEY (id_pracownika) REFERENCES pracownik(id_pracownika) ON DELETE CASCADE
+);
+
+CREATE TABLE oplata (
+    id_oplaty INTEGER PRIMARY KEY AUTOINCREMENT,
+    id_mieszkania NUMBER NOT NULL,
+    id_uslugi NUMBER NOT NULL,
+    kwota NUMBER(10,2) NOT NULL,
+    data_naliczenia DATE DEFAULT (datetime('now', 'localtime')),
+    status_oplaty VARCHAR2(50) DEFAULT 'nieoplacone',
+    zuzycie NUMBER(10,3),
+    CONSTRAINT fk_oplata_mieszkanie FOREIGN KEY (id_mieszkania) REFERENCES mieszkanie(id_mieszkania) ON DELETE CASCADE,
+    CONSTRAINT fk_oplata_uslugi FOREIGN KEY (id_uslugi) REFERENCES uslugi(id_uslugi) ON DELETE CASCADE
+);
+
+CREATE TABLE uzytkownicy (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    login VARCHAR2(100) NOT NULL UNIQUE,
+    haslo VARCHAR2(255) NOT NULL
+);
+
+CREATE TABLE spotkanie_mieszkancow (
+    id_spotkania INTEGER PRIMARY KEY AUTOINCREMENT,
+    temat VARCHAR2(200) NOT NULL,
+    miejsce VARCHAR2(100),
+    data_spotkania DATE DEFAULT (datetime('now', 'localtime'))
+);
+
+CREATE TABLE umowa (
+    id_umowy INTEGER PRIMARY KEY AUTOINCREMENT,
+    id_mieszkania NUMBER NOT NULL,
+    id_czlonka NUMBER NOT NULL,
+    data_zawarcia DATE DEFAULT (datetime('now', 'localtime')),
+    data_wygasniecia DATE,
+    typ_umowy VARCHAR2(50) DEFAULT 'najem',
+    CONSTRAINT fk_umowa_mieszkanie FOREIGN KEY (id_mieszkania) REFERENCES mieszkanie(id_mieszkania) ON DELETE CASCADE,
+    CONSTRAINT fk_umowa_czlonek FOREIGN KEY (id_czlonka) REFERENCES czlonek(id_czlonka) ON DELETE CASCADE
+);
+
+CREATE TABLE konto_spoldzielni (
+    id_konta INTEGER PRIMARY KEY AUTOINCREMENT,
+    nazwa_konta VARCHAR2(100) NOT NULL,
+    numer_konta VARCHAR2(30) NOT NULL,
+    id_uslugi NUMBER,
+    saldo NUMBER(12,2) DEFAULT 0,
+    CONSTRAINT fk_konto_usluga FOREIGN KEY (id_uslugi) REFERENCES uslugi(id_uslugi) ON DELETE CASCADE
+);
+
+-- data_zmiany z milisekundami - kolejnosc wpisow w ramach jednej sekundy
+CREATE TABLE log_zmian_czlonka (
+    id_logu INTEGER PRIMARY KEY AUTOINCREMENT,
+    id_czlonka NUMBER,
+    operacja VARCHAR2(50),
+    stare_dane VARCHAR2(1000),
+    nowe_dane VARCHAR2(1000),
+    data_zmiany TIMESTAMP DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime'))
+);
+
+-- Definicje triggerow wylaczonych przez ALTER TRIGGER ... DISABLE (storage/sqlite.py)
+CREATE TABLE disabled_triggers (
+    name TEXT PRIMARY KEY,
+    definition TEXT NOT NULL
+);
+
+
+-- ==============================================================================
+-- Indeksy na kluczach obcych i kolumnach filtrow (jak w INIT_DB.sql)
+-- ==============================================================================
+
+CREATE INDEX idx_mieszkanie_budynek ON mieszkanie (id_budynku);
+CREATE INDEX idx_czlonek_mieszkanie ON czlonek (id_mieszkania);
+CREATE INDEX idx_czlonek_email_lower ON czlonek (LOWER(email));
+CREATE INDEX idx_naprawa_mieszkanie ON naprawa (id_mieszkania, data_zgloszenia);
+CREATE INDEX idx_naprawa_pracownik ON naprawa (id_pracownika);
+CREATE INDEX idx_oplata_mieszkanie_data ON oplata (id_mieszkania, data_naliczenia);
+CREATE INDEX idx_oplata_uslugi ON oplata (id_uslugi);
+CREATE INDEX idx_oplata_status ON oplata (status_oplaty);
+CREATE INDEX idx_umowa_mieszkanie ON umowa (id_mieszkania);
+CREATE INDEX idx_umowa_czlonek ON umowa (id_czlonka);
+CREATE INDEX idx_konto_usluga ON konto_spoldzielni (id_uslugi);
+CREATE INDEX idx_spotkanie_data ON spotkanie_mieszkancow (data_spotkania);
+CREATE INDEX idx_log_zmian_data ON log_zmian_czlonka (data_zmiany);
+CREATE INDEX idx_log_zmian_czlonek ON log_zmian_czlonka (id_czlonka, id_logu);
+
+
+-- ==============================================================================
+-- Widoki (LAB 9, LAB 10)
+-- ==============================================================================
+
+CREATE VIEW v_mieszkania_info AS
+SELECT m.id_mieszkania, m.numer, m.metraz, m.liczba_pokoi, b.adres
+FROM mieszkanie m
+JOIN budynek b ON m.id_budynku = b.id_budynku;
+
+CREATE VIEW v_oplaty_summary AS
+SELECT
+    m.id_mieszkania,
+    m.numer,
+    COUNT(o.id_oplaty) AS liczba_oplat,
+    COALESCE(SUM(o.kwota), 0) AS suma_oplat,
+    COALESCE(SUM(CASE WHEN o.status_oplaty = 'nieoplacone' THEN o.kwota ELSE 0 END), 0) AS zaleglosci
+FROM mieszkanie m
+LEFT JOIN oplata o ON m.id_mieszkania = o.id_mieszkania
+GROUP BY m.id_mieszkania, m.numer;
+
+CREATE VIEW v_naprawy_status AS
+SELECT
+    n.id_naprawy,
+    n.opis,
+    n.status,
+    CASE
+        WHEN n.status = 'zgloszona' THEN 'Oczekuje na realizacje'
+        WHEN n.status = 'w trakcie' THEN 'W trakcie realizacji'
+        WHEN n.status = 'wykonana' THEN 'Zakonczona'
+        ELSE 'Nieznany status'
+    END AS opis_statusu,
+    p.imie || ' ' || p.nazwisko AS pracownik
+FROM naprawa n
+LEFT JOIN pracownik p ON n.id_pracownika = p.id_pracownika;
+
+CREATE VIEW v_moje_oplaty AS
+SELECT
+    o.id_oplaty,
+    o.id_mieszkania,
+    u.nazwa_uslugi,
+    o.kwota,
+    o.zuzycie,
+    u.jednostka_miary,
+    o.data_naliczenia,
+    o.status_oplaty
+FROM oplata o
+JOIN uslugi u ON o.id_uslugi = u.id_uslugi;
+
+-- Odpowiedniki widokow zmaterializowanych - agregaty liczone przy odczycie
+CREATE VIEW mv_oplata_status_agg AS
+SELECT
+    status_oplaty,
+    COUNT(*) AS liczba,
+    COUNT(kwota) AS liczba_kwot,
+    SUM(kwota) AS suma_kwot
+FROM oplata
+GROUP BY status_oplaty;
+
+CREATE VIEW mv_naprawa_status_agg AS
+SELECT
+    status,
+    COUNT(*) AS liczba
+FROM naprawa
+GROUP BY status;
+
+CREATE VIEW mv_dashboard_stats AS
+SELECT
+    (SELECT COUNT(*) FROM budynek) AS liczba_budynkow,
+    (SELECT COUNT(*) FROM mieszkanie) AS liczba_mieszkan,
+    (SELECT COUNT(*) FROM czlonek) AS liczba_czlonkow,
+    (SELECT COUNT(*) FROM pracownik) AS liczba_pracownikow,
+    (SELECT COUNT(*) FROM naprawa WHERE status = 'zgloszona') AS naprawy_oczekujace,
+    (SELECT COUNT(*) FROM naprawa WHERE status = 'wykonana') AS naprawy_wykonane,
+    (SELECT COALESCE(SUM(kwota), 0) FROM oplata WHERE status_oplaty = 'oplacone') AS suma_oplaconych,
+    (SELECT COALESCE(SUM(kwota), 0) FROM oplata WHERE status_oplaty = 'nieoplacone') AS suma_zaleglosci;
+
+CREATE VIEW mv_zuzycie_mediow AS
+SELECT
+    m.id_budynku,
+    u.nazwa_uslugi,
+    COUNT(*) AS liczba_oplat,
+    COUNT(o.zuzycie) AS liczba_odczytow,
+    SUM(o.zuzycie) AS suma_zuzycia,
+    COUNT(o.kwota) AS liczba_kwot,
+    SUM(o.kwota) AS suma_kwot
+FROM oplata o
+JOIN mieszkanie m ON o.id_mieszkania = m.id_mieszkania
+JOIN uslugi u ON o.id_uslugi = u.id_uslugi
+GROUP BY m.id_budynku, u.nazwa_uslugi;
+
+-- SELECT * widzi tylko kolumny "widoczne"; pesel i telefon sa w wersji pelnej
+CREATE VIEW v_czlonek_bezpieczny AS
+SELECT id_czlonka, imie, nazwisko, email, data_przystapienia
+FROM czlonek;
+
+CREATE VIEW v_czlonek_bezpieczny_pelny AS
+SELECT id_czlonka, imie, nazwisko, email, data_przystapienia, pesel, telefon
+FROM czlonek;
+
+CREATE VIEW v_pracownicy_naprawy AS
+SELECT
+    p.id_pracownika,
+    p.imie || ' ' || p.nazwisko AS pracownik,
+    p.stanowisko,
+    n.id_naprawy,
+    n.status AS status_naprawy
+FROM naprawa n
+RIGHT JOIN pracownik p ON n.id_pracownika = p.id_pracownika;
+
+CREATE VIEW v_oplaty_uslugi_full AS
+SELECT
+    o.id_oplaty,
+    o.kwota,
+    o.status_oplaty,
+    u.id_uslugi,
+    u.nazwa_uslugi,
+    u.cena_za_jednostke
+FROM oplata o
+FULL OUTER JOIN uslugi u ON o.id_uslugi = u.id_uslugi;
+
+CREATE VIEW v_budynki_uslugi_cross AS
+SELECT
+    b.id_budynku,
+    b.adres,
+    u.id_uslugi,
+    u.nazwa_uslugi
+FROM budynek b
+CROSS JOIN uslugi u;
+
+CREATE VIEW v_pracownicy_koledzy AS
+SELECT
+    p1.id_pracownika AS pracownik_id,
+    p1.imie || ' ' || p1.nazwisko AS pracownik,
+    p2.id_pracownika AS kolega_id,
+    p2.imie || ' ' || p2.nazwisko AS kolega,
+    p1.stanowisko
+FROM pracownik p1
+JOIN pracownik p2 ON p1.stanowisko = p2.stanowisko
+WHERE p1.id_pracownika < p2.id_pracownika;
+
+CREATE VIEW v_czlonkowie_pelne_info AS
+SELECT
+    c.id_czlonka,
+    c.imie,
+    c.nazwisko,
+    c.telefon,
+    m.numer AS numer_mieszkania,
+    m.metraz,
+    b.adres AS adres_budynku,
+    b.liczba_pieter
+FROM czlonek c
+INNER JOIN mieszkanie m ON c.id_mieszkania = m.id_mieszkania
+INNER JOIN budynek b ON m.id_budynku = b.id_budynku;
+
+
+-- ==============================================================================
+-- Triggery (LAB 13) - jeden trigger Oracle na operacje = trzy triggery SQLite
+-- ==============================================================================
+
+CREATE TRIGGER trg_audit_czlonek_ins AFTER INSERT ON czlonek
+BEGIN
+    INSERT INTO log_zmian_czlonka (id_czlonka, operacja, nowe_dane)
+    VALUES (NEW.id_czlonka, 'INSERT', NEW.imie || ' ' || NEW.nazwisko);
+END;
+
+CREATE TRIGGER trg_audit_czlonek_upd AFTER UPDATE ON czlonek
+BEGIN
+    INSERT INTO log_zmian_czlonka (id_czlonka, operacja, stare_dane, nowe_dane)
+    VALUES (OLD.id_czlonka, 'UPDATE', OLD.imie || ' ' || OLD.nazwisko, NEW.imie || ' ' || NEW.nazwisko);
+END;
+
+CREATE TRIGGER trg_audit_czlonek_del AFTER DELETE ON czlonek
+BEGIN
+    INSERT INTO log_zmian_czlonka (id_czlonka, operacja, stare_dane)
+    VALUES (OLD.id_czlonka, 'DELETE', OLD.imie || ' ' || OLD.nazwisko);
+END;
+
+-- Komunikat w formacie ORA-20001, jak RAISE_APPLICATION_ERROR w INIT_DB.sql
+CREATE TRIGGER trg_walidacja_oplaty_ins BEFORE INSERT ON oplata
+WHEN NEW.kwota < 0
+BEGIN
+    SELECT RAISE(ABORT, 'ORA-20001: Kwota oplaty nie moze byc ujemna');
+END;
+
+CREATE TRIGGER trg_walidacja_oplaty_upd BEFORE UPDATE OF kwota ON oplata
+WHEN NEW.kwota < 0
+BEGIN
+    SELECT RAISE(ABORT, 'ORA-20001: Kwota oplaty nie moze byc ujemna');
+END;
+
+
+-- ==============================================================================
+-- Slownik danych w ksztalcie Oracle (schema.py, mviews.py, init_database)
+-- ==============================================================================
+
+CREATE VIEW dual AS SELECT 'X' AS dummy;
+
+CREATE VIEW user_tables AS
+SELECT UPPER(name) AS table_name
+FROM sqlite_master
+WHERE type = 'table' AND name NOT LIKE 'sqlite%';
+
+CREATE VIEW user_tab_columns AS
+SELECT
+    UPPER(t.name) AS table_name,
+    UPPER(c.name) AS column_name,
+    CASE
+        WHEN c.type = 'INTEGER' THEN 'NUMBER'
+        WHEN instr(c.type, '(') > 0 THEN substr(c.type, 1, instr(c.type, '(') - 1)
+        ELSE c.type
+    END AS data_type,
+    c.cid + 1 AS column_id
+FROM sqlite_master t
+JOIN pragma_table_info(t.name) c
+WHERE t.type IN ('table', 'view') AND t.name NOT LIKE 'sqlite%';
+
+CREATE VIEW user_constraints AS
+SELECT 'PK_' || UPPER(t.name) AS constraint_name, UPPER(t.name) AS table_name,
+       'P' AS constraint_type, NULL AS r_constraint_name
+FROM sqlite_master t
+WHERE t.type = 'table' AND EXISTS (SELECT 1 FROM pragma_table_info(t.name) c WHERE c.pk > 0)
+UNION ALL
+SELECT DISTINCT 'FK_' || UPPER(t.name) || '_' || f.id, UPPER(t.name), 'R', 'PK_' || UPPER(f."table")
+FROM sqlite_master t
+JOIN pragma_foreign_key_list(t.name) f
+WHERE t.type = 'table';
+
+CREATE VIEW user_cons_columns AS
+SELECT 'PK_' || UPPER(t.name) AS constraint_name, UPPER(t.name) AS table_name,
+       UPPER(c.name) AS column_name, c.pk AS position
+FROM sqlite_master t
+JOIN pragma_table_info(t.name) c
+WHERE t.type = 'table' AND c.pk > 0
+UNION ALL
+SELECT 'FK_' || UPPER(t.name) || '_' || f.id, UPPER(t.name), UPPER(f."from"), f.seq + 1
+FROM sqlite_master t
+JOIN pragma_foreign_key_list(t.name) f
+WHERE t.type = 'table';
+
+CREATE VIEW user_mviews AS
+SELECT UPPER(name) AS mview_name, 'FRESH' AS staleness, 'COMPLETE' AS last_refresh_type,
+       NULL AS last_refresh_date
+FROM sqlite_master
+WHERE type = 'view' AND name LIKE 'mv\_%' ESCAPE '\';
+
+
+-- ==============================================================================
+-- Dane testowe (jak w INIT_DB.sql)
+-- ==============================================================================
+
+INSERT INTO uzytkownicy (login, haslo) VALUES ('admin', 'admin123');
+
+INSERT INTO budynek (adres, liczba_pieter, rok_budowy, liczba_mieszkan) VALUES ('ul. Kwiatowa 15', 5, 2005, 20);
+INSERT INTO budynek (adres, liczba_pieter, rok_budowy, liczba_mieszkan) VALUES ('ul. Sloneczna 8', 4, 2010, 16);
+INSERT INTO budynek (adres, liczba_pieter, rok_budowy, liczba_mieszkan) VALUES ('ul. Parkowa 22', 6, 2015, 24);
+
+INSERT INTO mieszkanie (id_budynku, numer, metraz, liczba_pokoi) VALUES (1, '1A', 45.5, 2);
+INSERT INTO mieszkanie (id_budynku, numer, metraz, liczba_pokoi) VALUES (1, '2B', 65.0, 3);
+INSERT INTO mieszkanie (id_budynku, numer, metraz, liczba_pokoi) VALUES (2, '3C', 55.0, 2);
+INSERT INTO mieszkanie (id_budynku, numer, metraz, liczba_pokoi) VALUES (3, '4D', 80.0, 4);
+
+INSERT INTO czlonek (id_mieszkania, imie, nazwisko, pesel, telefon, email) VALUES (1, 'Jan', 'Kowalski', '85010112345', '501123456', 'jan.kowalski@email.pl');
+INSERT INTO czlonek (id_mieszkania, imie, nazwisko, pesel, telefon, email) VALUES (2, 'Anna', 'Nowak', '90020298765', '502234567', 'anna.nowak@email.pl');
+INSERT INTO czlonek (id_mieszkania, imie, nazwisko, pesel, telefon, email) VALUES (3, 'Piotr', 'Wisniewski', '78030367890', '503345678', 'piotr.wisniewski@email.pl');
+INSERT INTO czlonek (id_mieszkania, imie, nazwisko, pesel, telefon, email) VALUES (4, 'Maria', 'Dabrowska', '82040445678', '504456789', 'maria.dabrowska@email.pl');
+
+INSERT INTO pracownik (imie, nazwisko, stanowisko, telefon, email) VALUES ('Tomasz', 'Maj', 'Konserwator', '600111222', 'tomasz.maj@spoldzielnia.pl');
+INSERT INTO pracownik (imie, nazwisko, stanowisko, telefon, email) VALUES ('Ewa', 'Lewandowska', 'Administrator', '600222333', 'ewa.lewandowska@spoldzielnia.pl');
+
+INSERT INTO uslugi (nazwa_uslugi, cena_za_jednostke, jednostka_miary) VALUES ('Woda zimna', 5.50, 'm3');
+INSERT INTO uslugi (nazwa_uslugi, cena_za_jednostke, jednostka_miary) VALUES ('Woda ciepla', 12.80, 'm3');
+INSERT INTO uslugi (nazwa_uslugi, cena_za_jednostke, jednostka_miary) VALUES ('Ogrzewanie', 4.20, 'm2');
+INSERT INTO uslugi (nazwa_uslugi, cena_za_jednostke, jednostka_miary) VALUES ('Wywoz smieci', 25.00, 'szt');
+INSERT INTO uslugi (nazwa_uslugi, cena_za_jednostke, jednostka_miary) VALUES ('Czynsz', 8.50, 'm2');
+
+INSERT INTO oplata (id_mieszkania, id_uslugi, kwota, zuzycie, status_oplaty) VALUES (1, 1, 55.00, 10, 'oplacone');
+INSERT INTO oplata (id_mieszkania, id_uslugi, kwota, zuzycie, status_oplaty) VALUES (1, 3, 191.10, 45.5, 'nieoplacone');
+INSERT INTO oplata (id_mieszkania, id_uslugi, kwota, zuzycie, status_oplaty) VALUES (2, 1, 66.00, 12, 'oplacone');
+INSERT INTO oplata (id_mieszkania, id_uslugi, kwota, zuzycie, status_oplaty) VALUES (2, 5, 552.50, 65, 'nieoplacone');
+INSERT INTO oplata (id_mieszkania, id_uslugi, kwota, zuzycie, status_oplaty) VALUES (3, 2, 128.00, 10, 'oplacone');
+INSERT INTO oplata (id_mieszkania, id_uslugi, kwota, zuzycie, status_oplaty) VALUES (4, 4, 25.00, 1, 'nieoplacone');
+
+INSERT INTO naprawa (id_mieszkania, id_pracownika, opis, status) VALUES (1, 1, 'Naprawa cieknacego kranu w lazience', 'wykonana');
+INSERT INTO naprawa (id_mieszkania, id_pracownika, opis, status) VALUES (2, 1, 'Wymiana zamka w drzwiach wejsciowych', 'w trakcie');
+INSERT INTO naprawa (id_mieszkania, opis, status) VALUES (3, 'Awaria ogrzewania - brak cieplej wody', 'zgloszona');
+
+INSERT INTO spotkanie_mieszkancow (temat, miejsce, data_spotkania) VALUES ('Zebranie roczne', 'Sala konferencyjna', datetime('now', 'localtime', '-30 days'));
+INSERT INTO spotkanie_mieszkancow (temat, miejsce, data_spotkania) VALUES ('Sprawy biezace', 'Portiernia', datetime('now', 'localtime', '-7 days'));
+INSERT INTO spotkanie_mieszkancow (temat, miejsce, data_spotkania) VALUES ('Plan remontow 2026', 'Sala konferencyjna', datetime('now', 'localtime', '+14 days'));
+
+INSERT INTO umowa (id_mieszkania, id_czlonka, data_zawarcia, data_wygasniecia, typ_umowy) VALUES (1, 1, '2023-01-15 00:00:00', '2026-01-15 00:00:00', 'najem');
+INSERT INTO umowa (id_mieszkania, id_czlonka, data_zawarcia, data_wygasniecia, typ_umowy) VALUES (2, 2, '2022-06-01 00:00:00', '2025-06-01 00:00:00', 'wlasnosc');
+INSERT INTO umowa (id_mieszkania, id_czlonka, data_zawarcia, data_wygasniecia, typ_umowy) VALUES (3, 3, '2024-03-01 00:00:00', '2027-03-01 00:00:00', 'najem');
+INSERT INTO umowa (id_mieszkania, id_czlonka, data_zawarcia, data_wygasniecia, typ_umowy) VALUES (4, 4, '2021-09-01 00:00:00', NULL, 'wlasnosc');
+
+INSERT INTO konto_spoldzielni (nazwa_konta, numer_konta, id_uslugi, saldo) VALUES ('Konto woda zimna', 'PL61109010140000071219812874', 1, 15420.00);
+INSERT INTO konto_spoldzielni (nazwa_konta, numer_konta, id_uslugi, saldo) VALUES ('Konto woda ciepla', 'PL49102028922276300500000000', 2, 8750.50);
+INSERT INTO konto_spoldzielni (nazwa_konta, numer_konta, id_uslugi, saldo) VALUES ('Konto ogrzewanie', 'PL32105010251000009080000000', 3, 42300.00);
+INSERT INTO konto_spoldzielni (nazwa_konta, numer_konta, id_uslugi, saldo) VALUES ('Konto wywoz smieci', 'PL83101010230000261395100000', 4, 3200.00);
+INSERT INTO konto_spoldzielni (nazwa_konta, numer_konta, id_uslugi, saldo) VALUES ('Konto czynszowe', 'PL27114020040000300201355387', 5, 125000.00);
@@ -0,0 +1,371 @@
+# Generator danych syntetycznych do testow wydajnosci: spojne referencyjnie
+# budynek -> mieszkanie -> czlonek/umowa/naprawa/oplata (plus slowniki uslugi i
+# pracownik) w skali produkcyjnej, z regulowana licznoscia i skosem rozkladow:
+#  - mieszkania na budynek i naprawy na mieszkanie z rozkladu log-normalnego
+#    (--skew 0 = rowno, 1 = kilka bardzo duzych budynkow / "goracych" mieszkan),
+#  - zaleglosci skupione u czesci mieszkan (--debtors),
+#  - oplaty miesieczne za kazda usluge przez --months miesiecy wstecz od --end.
+# Ten sam --seed daje te same dane. Wyjscie:
+#   --load       executemany partiami (--batch-size) do bazy z DB_USER/DB_PASSWORD/DB_DSN;
+#                identyfikatory sa przesuwane za MAX(pk) istniejacych wierszy
+#   --csv KATALOG  pliki CSV + pliki sterujace SQL*Loader (.ctl, DIRECT=TRUE)
+#   feed_fake()  dane dla bench/fake_oracledb.py (load_table) - benchmarki na
+#                realistycznych licznosciach, np. python -m bench.run --dataset small
+# Uruchomienie z katalogu backend:
+#   python -m tools.datagen --buildings 300 --apartments 40 --months 24 --csv /tmp/coop
+#   python -m tools.datagen --preset small --load --disable-triggers
+import argparse
+import csv
+import math
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+# (tabela, kolumny) w kolejnosci ladowania (rodzice przed dziecmi)
+TABLES = [
+    ("budynek", ("id_budynku", "adres", "liczba_pieter", "rok_budowy", "liczba_mieszkan", "typ_budynku")),
+    ("uslugi", ("id_uslugi", "nazwa_uslugi", "cena_za_jednostke", "jednostka_miary")),
+    ("pracownik", ("id_pracownika", "imie", "nazwisko", "stanowisko", "telefon", "email", "data_zatrudnienia")),
+    ("mieszkanie", ("id_mieszkania", "id_budynku", "numer", "metraz", "liczba_pokoi")),
+    ("czlonek", ("id_czlonka", "id_mieszkania", "imie", "nazwisko", "pesel", "telefon", "email",
+                 "data_przystapienia")),
+    ("umowa", ("id_umowy", "id_mieszkania", "id_czlonka", "data_zawarcia", "data_wygasniecia", "typ_umowy")),
+    ("naprawa", ("id_naprawy", "id_mieszkania", "id_pracownika", "opis", "data_zgloszenia", "data_wykonania",
+                 "status", "uwagi", "priorytet")),
+    ("oplata", ("id_oplaty", "id_mieszkania", "id_uslugi", "kwota", "data_naliczenia", "status_oplaty", "zuzycie")),
+]
+PRIMARY_KEYS = {table: columns[0] for table, columns in TABLES}
+AUDIT_TRIGGERS = ("trg_audit_czlonek", "trg_walidacja_oplaty")
+
+# Uslugi jak w INIT_DB.sql: (nazwa, cena, jednostka); zuzycie liczone od jednostki
+SERVICES = [
+    ("Woda zimna", 5.50, "m3"),
+    ("Woda ciepla", 12.80, "m3"),
+    ("Ogrzewanie", 4.20, "m2"),
+    ("Wywoz smieci", 25.00, "szt"),
+    ("Czynsz", 8.50, "m2"),
+]
+FIRST_NAMES = ["Jan", "Anna", "Piotr", "Maria", "Tomasz", "Katarzyna", "Pawel", "Agnieszka", "Marek", "Ewa",
+               "Krzysztof", "Magdalena", "Michal", "Joanna", "Andrzej", "Barbara", "Adam", "Zofia"]
+LAST_NAMES = ["Nowak", "Kowalski", "Wisniewski", "Wojcik", "Kowalczyk", "Kaminski", "Lewandowski", "Zielinski",
+              "Szymanski", "Wozniak", "Dabrowski", "Kozlowski", "Jankowski", "Mazur", "Kwiatkowski", "Krawczyk"]
+STREETS = ["Kwiatowa", "Sloneczna", "Parkowa", "Lesna", "Polna", "Ogrodowa", "Lipowa", "Brzozowa", "Szkolna",
+           "Klonowa", "Dluga", "Krotka", "Mickiewicza", "Kosciuszki", "Sienkiewicza", "Zielona"]
+REPAIRS = ["Naprawa cieknacego kranu", "Wymiana zamka w drzwiach", "Awaria ogrzewania", "Wymiana zarowek na klatce",
+           "Udroznienie odplywu", "Naprawa domofonu", "Wymiana uszczelek w oknach", "Naprawa instalacji elektrycznej"]
+POSITIONS = ["Konserwator", "Hydraulik", "Elektryk", "Administrator", "Dozorca"]
+
+PRESETS = {
+    # budynki, srednio mieszkan na budynek, miesiace oplat
+    "tiny": {"buildings": 5, "apartments": 8, "months": 6, "workers": 3},
+    "small": {"buildings": 50, "apartments": 30, "months": 12, "workers": 10},
+    "medium": {"buildings": 300, "apartments": 40, "months": 24, "workers": 40},
+    "large": {"buildings": 1000, "apartments": 60, "months": 36, "workers": 120},
+}
+
+
+class DatagenConfig:
+    def __init__(self, buildings=50, apartments=30, members=2.2, repairs=1.5, months=12, workers=10,
+                 skew=0.6, debtors=0.08, seed=42, end="2025-12-01"):
+        self.buildings = buildings          # liczba budynkow
+        self.apartments = apartments        # srednia liczba mieszkan w budynku
+        self.members = members              # srednia liczba czlonkow na mieszkanie
+        self.repairs = repairs              # srednia liczba napraw na mieszkanie
+        self.months = months                # miesiace oplat wstecz od `end`
+        self.workers = workers
+        self.skew = skew                    # sigma rozkladu log-normalnego (0 = bez skosu)
+        self.debtors = debtors              # odsetek mieszkan z zaleglosciami
+        self.seed = seed
+        self.end = datetime.fromisoformat(end)
+
+
+def _lognormal(rng, mean, skew):
+    # Srednia `mean` niezaleznie od skosu: mu = ln(mean) - sigma^2 / 2
+    if skew <= 0:
+        return mean
+    return rng.lognormvariate(math.log(max(mean, 1e-9)) - skew * skew / 2, skew)
+
+
+def _count(rng, mean, skew, minimum=0, maximum=None):
+    value = _lognormal(rng, mean, skew)
+    value = int(value) + (rng.random() < value - int(value))   # zaokraglenie losowe zachowuje srednia
+    value = max(value, minimum)
+    return min(value, maximum) if maximum is not None else value
+
+
+def _month(end, back):
+    year, month = divmod(end.year * 12 + end.month - 1 - back, 12)
+    return datetime(year, month + 1, 1)
+
+
+class Generator:
+    # Wiersze generowane strumieniowo tabela po tabeli (miliony oplat bez trzymania
+    # ich w pamieci); z tabel nadrzednych pamietane sa tylko atrybuty potrzebne
+    # dzieciom (metraz, pokoje, czlonkowie mieszkania)
+    def __init__(self, config: DatagenConfig, offsets: dict = None):
+        self.config = config
+        self.offsets = offsets or {}
+        self.counts = {}
+        self._apartments = []   # (id_mieszkania, id_budynku, numer, metraz, liczba_pokoi, dluznik)
+        self._members = {}      # id_mieszkania -> [id_czlonka]
+        self._services = []     # (id_uslugi, cena, jednostka)
+        self._workers = []
+
+    def _rng(self, table):
+        return random.Random(f"{self.config.seed}:{table}")
+
+    def _id(self, table, n):
+        return self.offsets.get(table, 0) + n
+
+    def rows(self, table):
+        return getattr(self, f"_{table}")()
+
+    def _budynek(self):
+        rng, config = self._rng("budynek"), self.config
+        apartment_id = 0
+        for n in range(1, config.buildings + 1):
+            floors = rng.choice((3, 4, 5, 8, 10, 11))
+            size = _count(rng, config.apartments, config.skew, minimum=2, maximum=config.apartments * 20)
+            building_id = self._id("budynek", n)
+            for number in range(1, size + 1):
+                apartment_id += 1
+                area = round(rng.uniform(25, 95), 2)
+                rooms = max(1, min(5, int(area // 20)))
+                debtor = rng.random() < config.debtors
+                self._apartments.append((self._id("mieszkanie", apartment_id), building_id, str(number), area, rooms,
+                                         debtor))
+            yield (building_id, f"ul. {rng.choice(STREETS)} {rng.randint(1, 120)}", floors,
+                   rng.randint(1960, 2024), size, "wiezowiec" if floors >= 10 else "blok")
+
+    def _uslugi(self):
+        for n, (name, price, unit) in enumerate(SERVICES, start=1):
+            service_id = self._id("uslugi", n)
+            self._services.append((service_id, price, unit))
+            yield service_id, name, price, unit
+
+    def _pracownik(self):
+        rng = self._rng("pracownik")
+        for n in range(1, self.config.workers + 1):
+            worker_id = self._id("pracownik", n)
+            self._workers.append(worker_id)
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            yield (worker_id, first, last, rng.choice(POSITIONS), f"5{rng.randint(10000000, 99999999)}",
+                   f"{first}.{last}{n}@spoldzielnia.pl".lower(), self.config.end - timedelta(days=rng.randint(30, 5000)))
+
+    def _mieszkanie(self):
+        for apartment_id, building_id, number, area, rooms, _ in self._apartments:
+            yield apartment_id, building_id, number, area, rooms
+
+    def _czlonek(self):
+        rng, config = self._rng("czlonek"), self.config
+        member_id = 0
+        for apartment_id, *_ in self._apartments:
+            ids = self._members[apartment_id] = []
+            for _ in range(_count(rng, config.members, config.skew / 2, minimum=1, maximum=8)):
+                member_id += 1
+                ids.append(self._id("czlonek", member_id))
+                first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+                yield (ids[-1], apartment_id, first, last, f"{rng.randint(40, 99):02d}{rng.randint(0, 999999999):09d}",
+                       f"6{rng.randint(10000000, 99999999)}", f"{first}.{last}.{ids[-1]}@example.pl".lower(),
+                       config.end - timedelta(days=rng.randint(0, 7000)))
+
+    def _umowa(self):
+        rng = self._rng("umowa")
+        n = 0
+        for apartment_id, *_ in self._apartments:
+            n += 1
+            signed = self.config.end - timedelta(days=rng.randint(0, 6000))
+            kind = rng.choice(("wlasnosc", "najem", "najem"))
+            expires = signed + timedelta(days=365 * rng.choice((1, 3, 5))) if kind == "najem" else None
+            yield self._id("umowa", n), apartment_id, self._members[apartment_id][0], signed, expires, kind
+
+    def _naprawa(self):
+        rng, config = self._rng("naprawa"), self.config
+        n = 0
+        horizon = config.months * 30 or 365
+        for apartment_id, *_ in self._apartments:
+            for _ in range(_count(rng, config.repairs, config.skew * 1.5, maximum=200)):
+                n += 1
+                reported = config.end - timedelta(days=rng.randint(0, horizon), hours=rng.randint(0, 23))
+                status = rng.choices(("wykonana", "w trakcie", "zgloszona"), (70, 15, 15))[0]
+                worker = rng.choice(self._workers) if self._workers and status != "zgloszona" else None
+                done = reported + timedelta(days=rng.randint(1, 30)) if status == "wykonana" else None
+                yield (self._id("naprawa", n), apartment_id, worker, rng.choice(REPAIRS), reported, done, status,
+                       None, rng.choices(("niski", "sredni", "wysoki"), (30, 55, 15))[0])
+
+    def _oplata(self):
+        rng, config = self._rng("oplata"), self.config
+        n = 0
+        for back in range(config.months - 1, -1, -1):
+            charged = _month(config.end, back)
+            for apartment_id, _, _, area, rooms, debtor in self._apartments:
+                for service_id, price, unit in self._services:
+                    if unit == "m3":
+                        usage = round(rng.uniform(1.5, 4.5) * rooms, 3)
+                    elif unit == "m2":
+                        usage = area
+                    else:
+                        usage = 1
+                    if back == 0:
+                        status = "nieoplacone"
+                    elif debtor and rng.random() < 0.6:
+                        status = "zaleglosc"
+                    else:
+                        status = "oplacone" if rng.random() < 0.97 else "nieoplacone"
+                    n += 1
+                    yield self._id("oplata", n), apartment_id, service_id, round(usage * price, 2), charged, status, usage
+
+    def tables(self):
+        # -> [(tabela, kolumny, iterator wierszy)] w kolejnosci ladowania; iteratory
+        # trzeba konsumowac po kolei (dzieci korzystaja ze stanu rodzicow)
+        for table, columns in TABLES:
+            yield table, columns, self._counted(table, self.rows(table))
+
+    def _counted(self, table, rows):
+        count = 0
+        for row in rows:
+            count += 1
+            yield row
+        self.counts[table] = count
+
+
+# ------------------------------------------------------------------ wyjscia
+
+def feed_fake(fake_oracledb, config: DatagenConfig) -> dict:
+    # Materializuje dane i podstawia je zastepczemu sterownikowi (load_table)
+    generator = Generator(config)
+    for table, columns, rows in generator.tables():
+        fake_oracledb.load_table(table, columns, list(rows))
+    return dict(generator.counts)
+
+
+def _format(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    return value
+
+
+def control_file(table, columns, data_file) -> str:
+    fields = ",\n  ".join(f'{col} DATE "YYYY-MM-DD HH24:MI:SS"' if col.startswith("data_") else col
+                          for col in columns)
+    return (f"OPTIONS (SKIP=1, DIRECT=TRUE)\nLOAD DATA\nCHARACTERSET UTF8\nINFILE '{data_file}'\n"
+            f"APPEND INTO TABLE {table}\nFIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"'\n"
+            f"TRAILING NULLCOLS\n(\n  {fields}\n)\n")
+
+
+def write_csv(config: DatagenConfig, directory: str, report=print) -> dict:
+    os.makedirs(directory, exist_ok=True)
+    generator = Generator(config)
+    for table, columns, rows in generator.tables():
+        start = time.perf_counter()
+        data_file = f"{table}.csv"
+        with open(os.path.join(directory, data_file), "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            writer.writerows([_format(value) for value in row] for row in rows)
+        with open(os.path.join(directory, f"{table}.ctl"), "w", encoding="utf-8") as f:
+            f.write(control_file(table, columns, data_file))
+        report(f"{table:<12}{generator.counts[table]:>12} rows  {time.perf_counter() - start:8.2f} s")
+    report("SQL*Loader, in this order: " + " ".join(f"sqlldr control={table}.ctl" for table, _ in TABLES))
+    report("Then realign identity columns: python -m tools.datagen --sync-identity")
+    return dict(generator.counts)
+
+
+def insert_sql(table, columns) -> str:
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(f':{i}' for i in range(1, len(columns) + 1))})"
+
+
+def identity_sync_sql(table) -> str:
+    # Po wstawieniu jawnych identyfikatorow: kolejna wartosc IDENTITY za MAX(pk)
+    return f"ALTER TABLE {table} MODIFY {PRIMARY_KEYS[table]} GENERATED BY DEFAULT AS IDENTITY (START WITH LIMIT VALUE)"
+
+
+def current_offsets(cursor) -> dict:
+    offsets = {}
+    for table, pk in PRIMARY_KEYS.items():
+        cursor.execute(f"SELECT NVL(MAX({pk}), 0) FROM {table}")
+        offsets[table] = int(cursor.fetchone()[0])
+    return offsets
+
+
+def load(config: DatagenConfig, cursor, conn, batch_size=5000, disable_triggers=False, report=print) -> dict:
+    # Ladowanie partiami executemany (array binding) - jeden round-trip na partie,
+    # commit po kazdej tabeli; slowniki (uslugi) sa dopisywane jak reszta
+    generator = Generator(config, current_offsets(cursor))
+    if disable_triggers:
+        for trigger in AUDIT_TRIGGERS:
+            cursor.execute(f"ALTER TRIGGER {trigger} DISABLE")
+    try:
+        for table, columns, rows in generator.tables():
+            start = time.perf_counter()
+            sql = insert_sql(table, columns)
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    cursor.executemany(sql, batch)
+                    batch = []
+            if batch:
+                cursor.executemany(sql, batch)
+            conn.commit()
+            cursor.execute(identity_sync_sql(table))
+            elapsed = time.perf_counter() - start
+            count = generator.counts[table]
+            report(f"{table:<12}{count:>12} rows  {elapsed:8.2f} s  {count / elapsed if elapsed else 0:>10.0f} rows/s")
+    finally:
+        if disable_triggers:
+            for trigger in AUDIT_TRIGGERS:
+                cursor.execute(f"ALTER TRIGGER {trigger} ENABLE")
+    return dict(generator.counts)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Generator danych syntetycznych spoldzielni")
+    parser.add_argument("--preset", choices=sorted(PRESETS), help="gotowe licznosci (nadpisywane opcjami)")
+    parser.add_argument("--buildings", type=int)
+    parser.add_argument("--apartments", type=float, help="srednia liczba mieszkan w budynku")
+    parser.add_argument("--members", type=float, default=2.2, help="srednia liczba czlonkow na mieszkanie")
+    parser.add_argument("--repairs", type=float, default=1.5, help="srednia liczba napraw na mieszkanie")
+    parser.add_argument("--months", type=int, help="miesiace naliczen oplat")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--skew", type=float, default=0.6, help="0 = rozklady rowne, 1 = silny skos")
+    parser.add_argument("--debtors", type=float, default=0.08, help="odsetek mieszkan z zaleglosciami")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--end", default="2025-12-01", help="miesiac ostatniego naliczenia (YYYY-MM-DD)")
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument("--load", action="store_true", help="executemany do bazy (zmienne DB_*)")
+    output.add_argument("--csv", metavar="DIR", help="pliki CSV + .ctl dla SQL*Loader")
+    output.add_argument("--sync-identity", action="store_true",
+                        help="tylko wyrownaj kolumny IDENTITY po zaladowaniu SQL*Loaderem")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--disable-triggers", action="store_true", help="wylacz triggery audytu na czas ladowania")
+    args = parser.parse_args(argv)
+
+    sizes = dict(PRESETS.get(args.preset or "small"))
+    for name in ("buildings", "apartments", "months", "workers"):
+        if getattr(args, name) is not None:
+            sizes[name] = getattr(args, name)
+    config = DatagenConfig(members=args.members, repairs=args.repairs, skew=args.skew, debtors=args.debtors,
+                           seed=args.seed, end=args.end, **sizes)
+    if args.csv:
+        write_csv(config, args.csv)
+        return 0
+
+    from db import get_cursor   # dopiero tutaj: tryb --csv nie wymaga sterownika oracledb
+
+    with get_cursor() as (cursor, conn):
+        if args.sync_identity:
+            for table, _ in TABLES:
+                cursor.execute(identity_sync_sql(table))
+            return 0
+        counts = load(config, cursor, conn, args.batch_size, args.disable_triggers)
+    print(f"{sum(counts.values())} rows loaded")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
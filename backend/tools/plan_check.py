@@ -0,0 +1,295 @@
+# Kontrola planow zapytan: wyciaga instrukcje SQL ze wszystkich modulow backendu
+# (AST, bez importu aplikacji; takze zapytania kursorow z blokow PL/SQL) i sprawdza, czy duze tabele nie sa skanowane w calosci tam, gdzie
+# zapytanie je filtruje.
+#   online  - EXPLAIN PLAN dla kazdej instrukcji; blad, gdy TABLE ACCESS FULL
+#             duzej tabeli ma predykat filtra (skan, ktory indeks moglby zastapic)
+#   offline - bez bazy: kolumny z WHERE/ON kazdej instrukcji porownywane z
+#             indeksami zadeklarowanymi w INIT_DB.sql (PK, UNIQUE, CREATE INDEX);
+#             w dynamicznym SQL sprawdzana jest czesc stala
+# Uruchomienie z katalogu backend:
+#   python -m tools.plan_check --offline [--init-sql ../INIT_DB.sql] [pliki.py...]
+#   python -m tools.plan_check [--strict]      # zmienne DB_* jak dla aplikacji
+# Kod wyjscia 1 oznacza regresje planu.
+import argparse
+import ast
+import glob
+import os
+import re
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SOURCES = sorted(glob.glob(os.path.join(BACKEND_DIR, "*.py")))
+DEFAULT_INIT_SQL = os.path.join(os.path.dirname(BACKEND_DIR), "INIT_DB.sql")
+# Tabele rosnace z czasem; slowniki (uslugi, budynek, pracownik...) skanowac wolno
+LARGE_TABLES = ("oplata", "naprawa", "umowa", "czlonek", "mieszkanie", "log_zmian_czlonka", "spotkanie_mieszkancow")
+
+SQL_START = re.compile(
+    r"^\s*(SELECT\b.*\bFROM\b|WITH\s+\w+\s+AS\b|INSERT\s+INTO\b|UPDATE\s+\S+\s+SET\b|DELETE\s+FROM\b|MERGE\s+INTO\b)",
+    re.I | re.S)
+# Instrukcje wewnatrz blokow PL/SQL (OPEN kursor FOR SELECT ..., petle, DML)
+PLSQL_BLOCK = re.compile(r"^\s*(DECLARE|BEGIN)\b", re.I)
+PLSQL_STATEMENT = re.compile(r"\b(SELECT|WITH|INSERT|UPDATE|DELETE|MERGE)\b[^;]*", re.I)
+DYNAMIC = "__dynamic__"
+# Wstawki str.format ("{where}", "{keys}") traktowane jak wstawki f-stringa
+FORMAT_FIELD = re.compile(r"\{\w*\}")
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+BIND = re.compile(r"(?<![:\w]):(\w+)")
+CLAUSE_END = r"(?=\bGROUP\s+BY\b|\bORDER\s+BY\b|\bHAVING\b|\bFETCH\b|\bUNION\b|\b(?:LEFT|RIGHT|FULL|INNER|CROSS)?\s*(?:OUTER\s+)?JOIN\b|\bWHERE\b|$)"
+PREDICATE_CLAUSE = re.compile(r"\b(WHERE|ON)\b(.*?)" + CLAUSE_END, re.I | re.S)
+TABLE_REF = re.compile(r"\b(?:FROM|JOIN|UPDATE|INTO)\s+(\w+)(?:\s+(?!ON\b|WHERE\b|JOIN\b|LEFT\b|RIGHT\b|FULL\b|INNER\b|CROSS\b|GROUP\b|ORDER\b|SET\b|VALUES\b|FETCH\b)(\w+))?", re.I)
+COMMA_TABLE = re.compile(r",\s*(\w+)(?:\s+(\w+))?(?=\s*(?:,|\bWHERE\b|$))", re.I)
+JOIN_PREDICATE = re.compile(r"(\w+)\.(\w+)\s*=\s*(\w+)\.(\w+)")
+FILTER_PREDICATE = re.compile(
+    r"(?<![:\w.])(?:(LOWER|UPPER|TRUNC)\s*\(\s*)?(?:(\w+)\.)?(\w+)\s*\)?\s*(=|<>|!=|>=|<=|>|<|\bIN\b|\bLIKE\b|\bBETWEEN\b)",
+    re.I)
+SQL_WORDS = {"and", "or", "not", "null", "sysdate", "systimestamp", "rownum", "level", "exists"}
+
+
+# ---------------------------------------------------------------- ekstrakcja SQL
+
+def _string_value(node):
+    # Stala tekstowa, f-string (wstawki zastapione znacznikiem) lub konkatenacja "+"
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    if isinstance(node, ast.JoinedStr):
+        return "".join(part.value if isinstance(part, ast.Constant) else DYNAMIC for part in node.values)
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+        left, right = _string_value(node.left), _string_value(node.right)
+        if left is not None and right is not None:
+            return left + right
+    return None
+
+
+def _unwrap(text: str) -> str:
+    # "(SELECT ... ) AS alias" -> "SELECT ..."
+    text = text.strip()
+    if not text.startswith("("):
+        return text
+    depth = 0
+    for i, ch in enumerate(text):
+        depth += ch == "("
+        depth -= ch == ")"
+        if depth == 0:
+            return text[1:i].strip()
+    return text
+
+
+def _strings(node):
+    # Najwieksze wyrazenia tekstowe - bez schodzenia w czesci konkatenacji/f-stringa
+    text = _string_value(node)
+    if text is not None:
+        yield node, text
+        return
+    for child in ast.iter_child_nodes(node):
+        yield from _strings(child)
+
+
+def _sql_texts(text: str):
+    # -> [(przesuniecie linii, sql)]; blok PL/SQL rozbijany na zawarte w nim instrukcje
+    if not PLSQL_BLOCK.match(text):
+        return [(0, _unwrap(text))]
+    return [(text[:match.start()].count("\n"), match[0]) for match in PLSQL_STATEMENT.finditer(text)]
+
+
+def extract_statements(path: str) -> list:
+    # -> [(plik:linia, sql, dynamiczny)] dla tekstow wygladajacych na instrukcje SQL
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+    found, seen = [], set()
+    for node, text in _strings(tree):
+        for offset, part in _sql_texts(text):
+            sql = FORMAT_FIELD.sub(DYNAMIC, " ".join(part.split()))
+            if not SQL_START.match(sql) or sql in seen:
+                continue
+            seen.add(sql)
+            found.append((f"{os.path.basename(path)}:{node.lineno + offset}", sql, DYNAMIC in sql))
+    return sorted(found, key=lambda item: int(item[0].rsplit(":", 1)[1]))
+
+
+# ------------------------------------------------------------ indeksy z INIT_DB
+
+def _normalize_expression(text: str) -> str:
+    return re.sub(r"\s+", "", text).lower()
+
+
+def parse_indexes(path: str) -> dict:
+    # -> {tabela: {wiodaca kolumna lub wyrazenie, np. "id_mieszkania", "lower(email)"}}
+    with open(path, encoding="utf-8") as f:
+        text = re.sub(r"--[^\n]*", "", f.read())
+    indexes = {}
+    for match in re.finditer(r"CREATE\s+TABLE\s+(\w+)\s*\((.*?)\n\);", text, re.I | re.S):
+        table = match[1].lower()
+        for line in match[2].splitlines():
+            column = re.match(r"\s*(\w+)\s+\w+.*\b(PRIMARY\s+KEY|UNIQUE)\b", line, re.I)
+            if column:
+                indexes.setdefault(table, set()).add(column[1].lower())
+            constraint = re.search(r"\b(?:PRIMARY\s+KEY|UNIQUE)\s*\(\s*(\w+)", line, re.I)
+            if constraint:
+                indexes.setdefault(table, set()).add(constraint[1].lower())
+    for match in re.finditer(r"CREATE\s+(?:UNIQUE\s+|BITMAP\s+)?INDEX\s+\w+\s+ON\s+(\w+)\s*\((.*?)\)\s*(?:\w+\s*)*;", text, re.I | re.S):
+        depth, leading = 0, ""
+        for ch in match[2]:
+            if ch == "," and depth == 0:
+                break
+            depth += (ch == "(") - (ch == ")")
+            leading += ch
+        indexes.setdefault(match[1].lower(), set()).add(_normalize_expression(leading))
+    return indexes
+
+
+# -------------------------------------------------------------- analiza offline
+
+def table_aliases(sql: str) -> dict:
+    # alias (lub nazwa) -> tabela
+    aliases = {}
+    for match in TABLE_REF.finditer(sql):
+        table = match[1].lower()
+        aliases[table] = table
+        if match[2]:
+            aliases[match[2].lower()] = table
+    from_clause = re.search(r"\bFROM\b(.*?)(?=\bWHERE\b|\bGROUP\b|\bORDER\b|\bJOIN\b|$)", sql, re.I | re.S)
+    if from_clause:
+        for match in COMMA_TABLE.finditer(from_clause[1]):
+            aliases[match[1].lower()] = match[1].lower()
+            if match[2]:
+                aliases[match[2].lower()] = match[1].lower()
+    return aliases
+
+
+def _resolve(alias, column, aliases, columns) -> str:
+    if alias:
+        return aliases.get(alias.lower())
+    owners = [table for table in set(aliases.values()) if column in columns.get(table, ())]
+    if len(owners) == 1:
+        return owners[0]
+    tables = set(aliases.values())
+    return next(iter(tables)) if len(tables) == 1 else None
+
+
+def predicates(sql: str, columns: dict) -> tuple[dict, dict]:
+    # -> (filtry {tabela: {kolumna}}, zlaczenia {tabela: {kolumna}})
+    aliases = table_aliases(sql)
+    filters, joins = {}, {}
+    text = STRING_LITERAL.sub("''", sql)
+    for clause in PREDICATE_CLAUSE.finditer(text):
+        body = clause[2]
+        for match in JOIN_PREDICATE.finditer(body):
+            for alias, column in ((match[1], match[2]), (match[3], match[4])):
+                table = aliases.get(alias.lower())
+                if table:
+                    joins.setdefault(table, set()).add(column.lower())
+        body = JOIN_PREDICATE.sub(" ", body)
+        for match in FILTER_PREDICATE.finditer(body):
+            function, alias, column = match[1], match[2], match[3].lower()
+            if column in SQL_WORDS or column.isdigit():
+                continue
+            table = _resolve(alias, column, aliases, columns)
+            if table:
+                filters.setdefault(table, set()).add(f"{function.lower()}({column})" if function else column)
+    return filters, joins
+
+
+def check_offline(statements: list, indexes: dict, columns: dict, large_tables) -> list:
+    # -> [(miejsce, tabela, komunikat)]; kazda filtrowana duza tabela musi miec
+    # indeks zaczynajacy sie od ktorejs z kolumn filtra lub zlaczenia
+    problems = []
+    for where, sql, _ in statements:
+        filters, joins = predicates(sql, columns)
+        for table in large_tables:
+            used = filters.get(table, set()) | joins.get(table, set())
+            if not used:
+                continue
+            if not used & indexes.get(table, set()):
+                problems.append((where, table, f"brak indeksu dla {', '.join(sorted(used))}"))
+    return problems
+
+
+# --------------------------------------------------------------- analiza online
+
+PLAN_SQL = """
+    SELECT id, operation, options, LOWER(object_name), filter_predicates, access_predicates
+    FROM plan_table WHERE statement_id = :statement_id ORDER BY id
+"""
+
+
+def dummy_binds(sql: str):
+    # EXPLAIN PLAN nie potrzebuje wartosci, ale sterownik wymaga bindow dla kazdego znacznika
+    names = list(dict.fromkeys(BIND.findall(STRING_LITERAL.sub("''", sql))))
+    if all(name.isdigit() for name in names):
+        return [None] * len(names)
+    return {name: None for name in names}
+
+
+def explain(cursor, sql: str, statement_id: str) -> list:
+    cursor.execute("DELETE FROM plan_table WHERE statement_id = :statement_id", {"statement_id": statement_id})
+    cursor.execute(f"EXPLAIN PLAN SET STATEMENT_ID = '{statement_id}' FOR {sql}", dummy_binds(sql))
+    cursor.execute(PLAN_SQL, {"statement_id": statement_id})
+    return cursor.fetchall()
+
+
+def check_online(cursor, statements: list, large_tables, strict: bool = False) -> tuple[list, list]:
+    problems, skipped = [], []
+    for number, (where, sql, dynamic) in enumerate(statements):
+        if dynamic:
+            skipped.append((where, "dynamiczny SQL"))
+            continue
+        try:
+            plan = explain(cursor, sql, f"plan_check_{number}")
+        except Exception as e:
+            skipped.append((where, str(e).splitlines()[0]))
+            continue
+        for _, operation, options, table, filter_predicates, _ in plan:
+            full = operation == "TABLE ACCESS" and (options or "").endswith("FULL")
+            if full and table in large_tables and (strict or filter_predicates):
+                problems.append((where, table, f"TABLE ACCESS {options}" + (f" filter: {filter_predicates}" if filter_predicates else "")))
+    cursor.connection.rollback()
+    return problems, skipped
+
+
+def static_columns() -> dict:
+    # Kolumny tabel z rejestru schema.py (rozstrzyganie kolumn bez aliasu);
+    # bez zaleznosci aplikacji dziala tylko na kolumnach z aliasem
+    try:
+        sys.path.insert(0, BACKEND_DIR)
+        import schema
+        return {name: set(info.columns) for name, info in schema.STATIC_TABLES.items()}
+    except ImportError:
+        return {}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Kontrola planow zapytan SQL z modulow backendu")
+    parser.add_argument("sources", nargs="*", default=DEFAULT_SOURCES)
+    parser.add_argument("--offline", action="store_true", help="porownanie z indeksami z INIT_DB.sql, bez bazy")
+    parser.add_argument("--init-sql", default=DEFAULT_INIT_SQL)
+    parser.add_argument("--large", default=",".join(LARGE_TABLES), help="tabele, ktorych nie wolno skanowac")
+    parser.add_argument("--strict", action="store_true", help="online: blad przy kazdym pelnym skanie duzej tabeli")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    large_tables = {table.strip().lower() for table in args.large.split(",") if table.strip()}
+    statements = [statement for path in args.sources for statement in extract_statements(path)]
+    if args.verbose:
+        for where, sql, dynamic in statements:
+            print(f"{where}{' (dynamiczny)' if dynamic else ''}: {sql}")
+
+    if args.offline:
+        problems = check_offline(statements, parse_indexes(args.init_sql), static_columns(), large_tables)
+        skipped = []
+    else:
+        sys.path.insert(0, BACKEND_DIR)
+        from db import DatabaseConfig
+        import oracledb
+        with oracledb.connect(user=DatabaseConfig.USER, password=DatabaseConfig.PASSWORD, dsn=DatabaseConfig.DSN) as conn:
+            problems, skipped = check_online(conn.cursor(), statements, large_tables, args.strict)
+
+    for where, reason in skipped:
+        print(f"SKIP {where}: {reason}")
+    for where, table, message in problems:
+        print(f"FAIL {where}: {table} - {message}")
+    print(f"{len(statements)} instrukcji, {len(problems)} problemow, {len(skipped)} pominietych")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
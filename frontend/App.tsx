@@ -46,6 +46,7 @@ const App: React.FC = () => {
     return saved || 'dashboard';
   });
   const [tableData, setTableData] = useState<DatabaseRecord[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [isLoading, setIsLoading] = useState(false);
   const [searchTerm, setSearchTerm] = useState('');
   const [debouncedSearchTerm, setDebouncedSearchTerm] = useState('');
@@ -98,6 +99,8 @@ const App: React.FC = () => {
     }
   }, [currentView, isLoggedIn]);
 
+  const serverOrderBy = sortConfig ? `${sortConfig.direction === 'desc' ? '-' : ''}${sortConfig.key}` : undefined;
+
   // LAB 8: SELECT z WHERE LIKE - wyszukiwanie przez baze danych
   const loadData = useCallback(async () => {
     const specialViews = ['dashboard', 'system', 'reports'];
@@ -105,6 +108,7 @@ const App: React.FC = () => {
     if (!userRole) return;
 
     setIsLoading(true);
+    setNextCursor(null);
     try {
       let data: DatabaseRecord[];
 
@@ -113,7 +117,10 @@ const App: React.FC = () => {
         if (debouncedSearchTerm && debouncedSearchTerm.length >= 1) {
           data = await db.searchTableData(currentView, debouncedSearchTerm);
         } else {
-          data = await db.getTableData(`${currentView}?t=${Date.now()}`);
+          // Stronicowanie keyset z sortowaniem po stronie serwera
+          const page = await db.getTablePage(currentView, { orderBy: serverOrderBy });
+          data = page.items;
+          setNextCursor(page.next_cursor);
         }
       } else {
         if (!userData?.apt_id || userData.apt_id <= 0) {
@@ -121,7 +128,7 @@ const App: React.FC = () => {
           return;
         }
         const response = await axios.get(
-          `${API_BASE_URL}/resident/my-data/${userData.apt_id}?t=${Date.now()}`
+          `${API_BASE_URL}/resident/my-data/${userData.apt_id}`
         );
         data = currentView === 'oplata' ? response.data.oplaty : response.data.naprawy;
       }
@@ -133,7 +140,21 @@ const App: React.FC = () => {
     } finally {
       setIsLoading(false);
     }
-  }, [currentView, userRole, userData, debouncedSearchTerm, showNotification]);
+  }, [currentView, userRole, userData, debouncedSearchTerm, serverOrderBy, showNotification]);
+
+  const loadMore = useCallback(async () => {
+    if (!nextCursor) return;
+    setIsLoading(true);
+    try {
+      const page = await db.getTablePage(currentView, { after: nextCursor, orderBy: serverOrderBy });
+      setTableData(prev => [...prev, ...page.items]);
+      setNextCursor(page.next_cursor);
+    } catch {
+      showNotification('Blad ladowania danych.', 'error');
+    } finally {
+      setIsLoading(false);
+    }
+  }, [currentView, nextCursor, serverOrderBy, showNotification]);
 
   const loadDropdownData = useCallback(async () => {
     if (userRole !== 'admin') return;
@@ -509,6 +530,19 @@ const App: React.FC = () => {
           sortConfig={sortConfig}
           onSort={handleSort}
         />
+
+        {userRole === 'admin' && nextCursor && (
+          <div className="flex justify-center mt-6">
+            <button
+              onClick={loadMore}
+              disabled={isLoading}
+              className="bg-white dark:bg-slate-900 border-2 border-slate-100 dark:border-slate-800 text-slate-600 dark:text-slate-300 
+                px-8 py-4 rounded-2xl font-black text-[11px] uppercase tracking-widest shadow-sm hover:border-blue-600 transition-all"
+            >
+              Wczytaj więcej
+            </button>
+          </div>
+        )}
       </div>
     );
   };
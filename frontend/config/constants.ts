@@ -4,6 +4,8 @@ export const SESSION_DURATION_MS = 60 * 60 * 1000;
 
 export const NOTIFICATION_DURATION_MS = 5000;
 
+export const TABLE_PAGE_SIZE = 100;
+
 export const STORAGE_KEYS = {
   SESSION: 'coop_session',
   THEME: 'theme',
@@ -40,16 +40,11 @@ const ResidentDashboard: React.FC<ResidentDashboardProps> = ({ user }) => {
         }
         setIsLoading(true);
         try {
-            const [paymentsData, repairsData, meetingsData, consumptionData] = await Promise.all([
-                db.getResidentPayments(user.apt_id),
-                db.getResidentRepairs(user.apt_id),
-                db.getUpcomingMeetings(),
-                db.getResidentConsumption(user.apt_id)
-            ]);
-            setPayments(paymentsData);
-            setRepairs(repairsData);
-            setMeetings(meetingsData);
-            setConsumption(consumptionData);
+            const snapshot = await db.getResidentSnapshot(user.apt_id);
+            setPayments(snapshot.oplaty);
+            setRepairs(snapshot.naprawy);
+            setMeetings(snapshot.spotkania);
+            setConsumption(snapshot.zuzycie);
         } catch (error) {
             console.error('Error loading data:', error);
             showNotification('Błąd ładowania danych', 'error');
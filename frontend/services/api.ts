@@ -1,6 +1,6 @@
 import axios from 'axios';
-import { API_BASE_URL } from '../config/constants';
-import type { DatabaseRecord, LogAudit, SummaryReport } from '../types';
+import { API_BASE_URL, TABLE_PAGE_SIZE } from '../config/constants';
+import type { DatabaseRecord, LogAudit, ResidentSnapshot, SummaryReport, TablePage, TablePageParams } from '../types';
 
 export const db = {
   // LAB 8: SELECT z WHERE LIKE - wyszukiwanie tekstowe przez baze danych
@@ -21,6 +21,19 @@ export const db = {
     return response.data;
   },
 
+  // Stronicowanie keyset - kolejne strony pobierane kursorem next_cursor
+  async getTablePage<T = DatabaseRecord>(table: string, params: TablePageParams = {}): Promise<TablePage<T>> {
+    const response = await axios.get<TablePage<T>>(`${API_BASE_URL}/data/${table}`, {
+      params: {
+        limit: params.limit ?? TABLE_PAGE_SIZE,
+        after: params.after || undefined,
+        order_by: params.orderBy || undefined,
+        fields: params.fields?.join(',') || undefined,
+      },
+    });
+    return response.data;
+  },
+
 
   async insertRecord(table: string, data: DatabaseRecord): Promise<void> {
     await axios.post(`${API_BASE_URL}/data/${table}`, { data });
@@ -41,7 +54,7 @@ export const db = {
 
   async getSummaryReport(): Promise<SummaryReport> {
     const response = await axios.get<SummaryReport>(
-      `${API_BASE_URL}/reports/summary?t=${Date.now()}`
+      `${API_BASE_URL}/reports/summary`
     );
     return response.data;
   },
@@ -256,6 +269,12 @@ export const db = {
   // PORTAL MIESZKANCA (Resident Portal)
   // ============================================
 
+  // Migawka mieszkania jednym zapytaniem: oplaty, naprawy, umowy, nadchodzace spotkania i zuzycie
+  async getResidentSnapshot(aptId: number): Promise<ResidentSnapshot> {
+    const response = await axios.get(`${API_BASE_URL}/resident/snapshot/${aptId}`);
+    return response.data;
+  },
+
   async getResidentPayments(aptId: number): Promise<DatabaseRecord[]> {
     const response = await axios.get(`${API_BASE_URL}/resident/payments/${aptId}`);
     return response.data;
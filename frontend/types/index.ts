@@ -143,6 +143,30 @@ export interface SummaryReport {
   table_stats?: Record<string, number>;
   apartments_summary?: ApartmentSummary[];
   repairs_status?: RepairStatus[];
+  timings_ms?: Record<string, number>;
 }
 
 export type DatabaseRecord = Record<string, unknown>;
+
+export interface TablePage<T = DatabaseRecord> {
+  items: T[];
+  next_cursor: string | null;
+  limit: number;
+}
+
+export interface TablePageParams {
+  limit?: number;
+  after?: string | null;
+  orderBy?: string;
+  fields?: string[];
+}
+
+export interface ResidentSnapshot {
+  oplaty: DatabaseRecord[];
+  naprawy: DatabaseRecord[];
+  umowy: DatabaseRecord[];
+  spotkania: DatabaseRecord[];
+  zuzycie: DatabaseRecord[];
+  suma_oplat: number;
+  zaleglosci: number;
+}